@@ -0,0 +1,238 @@
+"""
+Async layer for the AI service
+Runs independent LLM prompts of one request concurrently on a background
+event loop, so synchronous Flask routes wait for the slowest call instead
+of the sum of all calls
+"""
+import asyncio
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ai_service import generate_motivation, generate_plan_explanation, solve_doubt
+from llm_client import LLM_POOL_SIZE
+
+AI_ASYNC_TIMEOUT = float(os.getenv("AI_ASYNC_TIMEOUT", "90"))  # seconds a route waits for its calls
+
+# Batch doubt solving
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))  # doubts in flight per batch
+BATCH_ITEM_TIMEOUT = float(os.getenv("BATCH_ITEM_TIMEOUT", "45"))  # seconds per doubt
+BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT", "120"))  # seconds per batch, however many doubts
+
+# Dashboard AI text kept per (student, mode) in each worker process
+DASHBOARD_TEXT_MAX_ENTRIES = int(os.getenv("DASHBOARD_TEXT_MAX_ENTRIES", "10000"))
+
+
+class _LoopThread:
+    """
+    One event loop per worker process, running in a daemon thread.
+
+    Blocking work (the pooled HTTP client, SQLite reads) runs in an executor
+    sized like the HTTP connection pool. Recreated after a fork.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self.loop = None
+        self.executor = None
+
+    def get(self) -> Tuple[asyncio.AbstractEventLoop, ThreadPoolExecutor]:
+        with self._lock:
+            if self.loop is None or self._pid != os.getpid():
+                self.loop = asyncio.new_event_loop()
+                self.executor = ThreadPoolExecutor(max_workers=max(LLM_POOL_SIZE, 2),
+                                                   thread_name_prefix="ai-async")
+                self.loop.set_default_executor(self.executor)
+                threading.Thread(target=self.loop.run_forever, daemon=True, name="ai-async-loop").start()
+                self._pid = os.getpid()
+            return self.loop, self.executor
+
+
+_loop_thread = _LoopThread()
+
+
+def run_async(coro: Awaitable, timeout: float = AI_ASYNC_TIMEOUT) -> Any:
+    """Bridge for sync code: run `coro` on the background loop and wait for its result"""
+    loop, _ = _loop_thread.get()
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
+
+
+async def _in_executor(fn: Callable, *args) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+async def generate_plan_explanation_async(plan: Dict[str, Any], mode: str = "english") -> str:
+    return await _in_executor(generate_plan_explanation, plan, mode)
+
+
+async def generate_motivation_async(context: Dict[str, Any], mode: str = "english") -> str:
+    return await _in_executor(generate_motivation, context, mode)
+
+
+async def solve_doubt_async(doubt: str, mode: str = "english") -> str:
+    return await _in_executor(solve_doubt, doubt, mode)
+
+
+async def plan_and_motivation_async(plan: Dict[str, Any], load_context: Callable[[], Dict[str, Any]],
+                                    mode: str = "english") -> Tuple[str, str]:
+    """
+    Explanation and motivation for one request, concurrently.
+
+    load_context (the student's streak/progress lookup) runs alongside the
+    explanation call; only the motivation prompt has to wait for it.
+    """
+    async def motivation() -> str:
+        context = await _in_executor(load_context)
+        return await generate_motivation_async(context, mode)
+
+    explanation, message = await asyncio.gather(generate_plan_explanation_async(plan, mode), motivation())
+    return explanation, message
+
+
+# --- Dashboard text ---
+
+_dashboard_text: "OrderedDict[Tuple[str, str], Tuple[int, Optional[str], str]]" = OrderedDict()
+_dashboard_refreshing = set()
+_dashboard_lock = threading.Lock()
+
+
+async def _dashboard_refresh(load: Callable[[], Tuple[Optional[Dict[str, Any]], Dict[str, Any]]],
+                             mode: str) -> Tuple[Optional[str], str]:
+    plan, context = await _in_executor(load)
+    if plan:
+        return await plan_and_motivation_async(plan, lambda: context, mode)
+    return None, await generate_motivation_async(context, mode)
+
+
+def _store_dashboard_text(key: Tuple[str, str], version: int, future: Future):
+    error = None if future.cancelled() else future.exception()
+    with _dashboard_lock:
+        _dashboard_refreshing.discard(key)
+        current = _dashboard_text.get(key)
+        if not future.cancelled() and error is None and (current is None or current[0] <= version):
+            _dashboard_text[key] = (version, *future.result())
+            _dashboard_text.move_to_end(key)
+            while len(_dashboard_text) > DASHBOARD_TEXT_MAX_ENTRIES:
+                _dashboard_text.popitem(last=False)
+    if error:
+        print(f"[AI ASYNC] Dashboard text refresh failed: {error}")  # Old text stays; retried next load
+
+
+def dashboard_text(student_id: str, mode: str, version: int,
+                   load: Callable[[], Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]
+                   ) -> Tuple[Optional[str], Optional[str], bool]:
+    """
+    (explanation, motivation, ready) last generated for this student and
+    mode, without waiting on the LLM.
+
+    If the text was made for an older version of the student's data (or
+    never), one refresh per key starts on the background loop, and the old
+    text (or None) comes back with ready=False. load() returns today's plan
+    (None without one) and the student context; it runs in the refresh.
+    """
+    key = (student_id, mode)
+    with _dashboard_lock:
+        entry = _dashboard_text.get(key)
+        if entry is not None:
+            _dashboard_text.move_to_end(key)
+            if entry[0] == version:
+                return entry[1], entry[2], True
+        start = key not in _dashboard_refreshing
+        _dashboard_refreshing.add(key)
+    if start:
+        loop, _ = _loop_thread.get()
+        future = asyncio.run_coroutine_threadsafe(_dashboard_refresh(load, mode), loop)
+        future.add_done_callback(lambda f: _store_dashboard_text(key, version, f))
+    return (entry[1], entry[2], False) if entry else (None, None, False)
+
+
+async def _solve_batch_item(index: int, doubt: str, mode: str, semaphore: asyncio.Semaphore,
+                            timeout: float) -> Dict[str, Any]:
+    await semaphore.acquire()
+    # The slot is freed when the worker thread finishes, not when we stop
+    # waiting for it: a timed-out call can't be interrupted and still holds
+    # a pooled connection (it also still fills the response cache)
+    call = asyncio.ensure_future(solve_doubt_async(doubt, mode))
+    call.add_done_callback(lambda _: semaphore.release())
+    try:
+        answer = await asyncio.wait_for(asyncio.shield(call), timeout)
+        return {"index": index, "doubt": doubt, "status": "ok", "answer": answer}
+    except asyncio.TimeoutError:
+        return _timed_out(index, doubt)
+    except Exception as e:
+        return {"index": index, "doubt": doubt, "status": "error", "answer": None, "error": str(e)}
+
+
+def _timed_out(index: int, doubt: str) -> Dict[str, Any]:
+    return {"index": index, "doubt": doubt, "status": "timeout", "answer": None}
+
+
+async def solve_doubts_batch_async(doubts: List[str], mode: str = "english",
+                                   concurrency: int = BATCH_CONCURRENCY, timeout: float = BATCH_ITEM_TIMEOUT,
+                                   on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                   batch_timeout: float = BATCH_TIMEOUT) -> List[Dict[str, Any]]:
+    """
+    Solve many doubts with at most `concurrency` in flight, a per-doubt
+    timeout and `batch_timeout` for the whole batch (doubts not answered by
+    then come back as timeouts). Returns results in input order; on_result
+    (if given) is called with each result as soon as it is known.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    tasks = [asyncio.ensure_future(_solve_batch_item(i, doubt, mode, semaphore, timeout))
+             for i, doubt in enumerate(doubts)]
+    if on_result:
+        for task in tasks:
+            task.add_done_callback(lambda t: on_result(t.result()) if not t.cancelled() else None)
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=batch_timeout)
+    except asyncio.CancelledError:  # Caller gave up: stop starting new doubts
+        for task in tasks:
+            task.cancel()
+        raise
+
+    results = []
+    for index, task in enumerate(tasks):
+        if task in pending:
+            task.cancel()
+            result = _timed_out(index, doubts[index])
+            if on_result:
+                on_result(result)
+        else:
+            result = task.result()
+        results.append(result)
+    return results
+
+
+def _batch_wait() -> float:
+    """How long a sync bridge waits for a batch: its own deadline plus slack"""
+    return BATCH_TIMEOUT + 5
+
+
+def solve_doubts_batch(doubts: List[str], mode: str = "english") -> List[Dict[str, Any]]:
+    """Sync bridge: all results, in input order"""
+    return run_async(solve_doubts_batch_async(doubts, mode), timeout=_batch_wait())
+
+
+def iter_solve_doubts(doubts: List[str], mode: str = "english") -> Iterator[Dict[str, Any]]:
+    """Sync bridge: yields each result as soon as it finishes (completion order)"""
+    results: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+    loop, _ = _loop_thread.get()
+    future = asyncio.run_coroutine_threadsafe(
+        solve_doubts_batch_async(doubts, mode, on_result=results.put), loop
+    )
+    deadline = time.monotonic() + _batch_wait()
+    try:
+        for _ in doubts:
+            yield results.get(timeout=max(deadline - time.monotonic(), 0))
+    finally:
+        future.cancel()  # Client went away: stop starting new doubts
@@ -0,0 +1,233 @@
+"""
+Study analytics for Study Saathi
+Compacts each finished day of daily-plan tasks into task_rollups (one row per
+student, day, subject and difficulty; append-only, partitioned by day) and
+answers trend queries from there: hours per subject per day/week/month and
+completion rate by difficulty, for one student or a whole class
+"""
+import os
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import database
+
+ANALYTICS_COMPACT_INTERVAL = float(os.getenv("ANALYTICS_COMPACT_INTERVAL", "3600"))  # seconds
+ANALYTICS_MAX_STUDENTS = int(os.getenv("ANALYTICS_MAX_STUDENTS", "500"))  # per class query
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "732"))  # widest date range per query
+ANALYTICS_LATE_DAYS = int(os.getenv("ANALYTICS_LATE_DAYS", "2"))  # days re-rolled for late completions
+
+WATERMARK = "compacted_through"  # analytics_state: last day rolled up
+
+# Days in (after, today): every (student, day) with a daily plan loses its old
+# rows first, so a day regenerated with fewer subjects keeps none of the old
+# groups. Rows are replaced, never updated in place.
+CLEAR_ROLLUPS_SQL = """
+    DELETE FROM task_rollups
+    WHERE (student_id, day) IN (
+        SELECT student_id, plan_date FROM study_plans
+        WHERE plan_type='daily' AND plan_date > ? AND plan_date < ?
+    )
+"""
+
+# Breaks aren't study time, so they are left out.
+COMPACT_SQL = """
+    INSERT INTO task_rollups
+    (student_id, day, subject, difficulty, planned_tasks, completed_tasks, planned_hours, completed_hours)
+    SELECT p.student_id, p.plan_date, t.subject, COALESCE(t.difficulty, 'medium'),
+           COUNT(*),
+           COALESCE(SUM(t.completed), 0),
+           COALESCE(SUM(t.study_hours), 0),
+           COALESCE(SUM(CASE WHEN t.completed=1 THEN t.study_hours ELSE 0 END), 0)
+    FROM study_plans p
+    JOIN study_tasks t ON t.plan_id = p.id
+    WHERE p.plan_type='daily' AND p.plan_date > ? AND p.plan_date < ?
+      AND COALESCE(t.subject_id, '') != 'break'
+    GROUP BY p.student_id, p.plan_date, t.subject, COALESCE(t.difficulty, 'medium')
+"""
+
+# Start of the period a day falls in
+PERIODS = {
+    "day": "day",
+    "week": "date(day, '-6 days', 'weekday 1')",  # Monday
+    "month": "substr(day, 1, 7)",
+}
+
+SUBJECT_TRENDS_SQL = """
+    SELECT {period} AS period, subject,
+           SUM(planned_tasks) AS planned_tasks, SUM(completed_tasks) AS completed_tasks,
+           SUM(planned_hours) AS planned_hours, SUM(completed_hours) AS completed_hours
+    FROM task_rollups
+    WHERE student_id IN ({students}) AND day BETWEEN ? AND ?
+    GROUP BY period, subject
+    ORDER BY period, subject
+"""
+
+DIFFICULTY_SQL = """
+    SELECT difficulty,
+           SUM(planned_tasks) AS planned_tasks, SUM(completed_tasks) AS completed_tasks,
+           SUM(planned_hours) AS planned_hours, SUM(completed_hours) AS completed_hours
+    FROM task_rollups
+    WHERE student_id IN ({students}) AND day BETWEEN ? AND ?
+    GROUP BY difficulty
+    ORDER BY difficulty
+"""
+
+# Audited like database.HOT_QUERIES (test_analytics.py)
+ANALYTICS_QUERIES = {
+    "clear_rollups": (CLEAR_ROLLUPS_SQL, ("2024-01-01", "2024-12-01")),
+    "compact": (COMPACT_SQL, ("2024-01-01", "2024-12-01")),
+    "subject_trends": (SUBJECT_TRENDS_SQL.format(period=PERIODS["week"], students="?"),
+                       ("default", "2024-01-01", "2024-12-31")),
+    "class_subject_trends": (SUBJECT_TRENDS_SQL.format(period=PERIODS["week"], students="?, ?, ?"),
+                             ("a", "b", "c", "2024-01-01", "2024-04-30")),
+    "difficulty": (DIFFICULTY_SQL.format(students="?"), ("default", "2024-01-01", "2024-12-31")),
+}
+
+
+class AnalyticsQueryError(ValueError):
+    """Bad analytics parameters (answered with 400)"""
+
+
+def _totals(row) -> Dict[str, Any]:
+    planned, completed = row["planned_tasks"], row["completed_tasks"]
+    return {
+        "planned_tasks": planned,
+        "completed_tasks": completed,
+        "planned_hours": round(row["planned_hours"], 2),
+        "completed_hours": round(row["completed_hours"], 2),
+        "completion_rate": round(completed / planned * 100, 2) if planned else 0.0,
+    }
+
+
+def get_watermark() -> Optional[str]:
+    with database.pooled_connection() as conn:
+        row = conn.execute("SELECT value FROM analytics_state WHERE name=?", (WATERMARK,)).fetchone()
+    return row["value"] if row else None
+
+
+def compact(today: str = None) -> Dict[str, Any]:
+    """
+    Roll up every day after the watermark and before `today` (default: the
+    real today, which is still changing). The last ANALYTICS_LATE_DAYS
+    already compacted are rolled up again, so a task ticked off the morning
+    after still counts. Safe to run from several workers at once: the
+    watermark is read and moved inside one write transaction.
+    """
+    today = today or str(date.today())
+    through = str(date.fromisoformat(today) - timedelta(days=1))
+    start = time.perf_counter()
+    rows = 0
+    with database.pooled_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM analytics_state WHERE name=?", (WATERMARK,)).fetchone()
+            watermark = row["value"] if row else None
+            after = str(date.fromisoformat(watermark) - timedelta(days=ANALYTICS_LATE_DAYS)) if watermark else ""
+            if after < through:
+                conn.execute(CLEAR_ROLLUPS_SQL, (after, today))
+                rows = conn.execute(COMPACT_SQL, (after, today)).rowcount
+                conn.execute("INSERT OR REPLACE INTO analytics_state (name, value) VALUES (?, ?)",
+                             (WATERMARK, max(watermark or "", through)))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+    with _stats_lock:
+        _stats["compactions"] += 1
+        _stats["rows_written"] += rows
+        _stats["last_compaction_ms"] = elapsed_ms
+    return {"rows": rows, "through": max(watermark or "", through), "ms": elapsed_ms}
+
+
+def _date_range(start: Optional[str], end: Optional[str]) -> tuple:
+    """Validated (start, end); defaults to the year up to the last compacted day"""
+    try:
+        end_day = date.fromisoformat(end) if end else date.today() - timedelta(days=1)
+        start_day = date.fromisoformat(start) if start else end_day - timedelta(days=364)
+    except ValueError:
+        raise AnalyticsQueryError("Dates must be YYYY-MM-DD")
+    if start_day > end_day:
+        raise AnalyticsQueryError("'from' is after 'to'")
+    if (end_day - start_day).days >= ANALYTICS_MAX_DAYS:
+        raise AnalyticsQueryError(f"Date range is limited to {ANALYTICS_MAX_DAYS} days")
+    return str(start_day), str(end_day)
+
+
+def _check_students(student_ids: Sequence[str]) -> List[str]:
+    student_ids = list(dict.fromkeys(s for s in student_ids if s))
+    if not student_ids:
+        raise AnalyticsQueryError("No student_id given")
+    if len(student_ids) > ANALYTICS_MAX_STUDENTS:
+        raise AnalyticsQueryError(f"At most {ANALYTICS_MAX_STUDENTS} students per query")
+    return student_ids
+
+
+def _query(sql: str, student_ids: List[str], start: str, end: str) -> list:
+    query = sql.replace("{students}", ", ".join("?" * len(student_ids)))
+    with database.pooled_connection() as conn:
+        return conn.execute(query, (*student_ids, start, end)).fetchall()
+
+
+def subject_trends(student_ids: Sequence[str], start: str = None, end: str = None,
+                   period: str = "week") -> Dict[str, Any]:
+    """
+    Planned/completed tasks and hours per subject per period (day, week or
+    month; weeks start on Monday), summed over `student_ids`
+    """
+    if period not in PERIODS:
+        raise AnalyticsQueryError(f"period must be one of: {', '.join(PERIODS)}")
+    student_ids = _check_students(student_ids)
+    start, end = _date_range(start, end)
+    sql = SUBJECT_TRENDS_SQL.replace("{period}", PERIODS[period])
+    trends = [{"period": row["period"], "subject": row["subject"], **_totals(row)}
+              for row in _query(sql, student_ids, start, end)]
+    return {"from": start, "to": end, "period": period, "students": len(student_ids),
+            "compacted_through": get_watermark(), "trends": trends}
+
+
+def completion_by_difficulty(student_ids: Sequence[str], start: str = None, end: str = None) -> Dict[str, Any]:
+    """Completion rate per difficulty level, summed over `student_ids`"""
+    student_ids = _check_students(student_ids)
+    start, end = _date_range(start, end)
+    difficulty = {row["difficulty"]: _totals(row) for row in _query(DIFFICULTY_SQL, student_ids, start, end)}
+    return {"from": start, "to": end, "students": len(student_ids),
+            "compacted_through": get_watermark(), "difficulty": difficulty}
+
+
+# --- Background compaction ---
+
+_stats = {"compactions": 0, "rows_written": 0, "last_compaction_ms": None, "errors": 0}
+_stats_lock = threading.Lock()
+_compactor_pid = None
+
+
+def _compact_loop():
+    while True:
+        try:
+            result = compact()
+            if result["rows"]:
+                print(f"[ANALYTICS] Compacted {result['rows']} rollup rows through {result['through']} "
+                      f"in {result['ms']} ms")
+        except Exception as e:
+            with _stats_lock:
+                _stats["errors"] += 1
+            print(f"[ANALYTICS] Compaction failed: {e}")
+        time.sleep(ANALYTICS_COMPACT_INTERVAL)
+
+
+def start_analytics():
+    """Compact now and then every ANALYTICS_COMPACT_INTERVAL seconds (once per process)"""
+    global _compactor_pid
+    with _stats_lock:
+        if _compactor_pid == os.getpid():
+            return
+        _compactor_pid = os.getpid()
+    threading.Thread(target=_compact_loop, daemon=True, name="analytics-compactor").start()
+
+
+def get_analytics_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        return dict(_stats, interval=ANALYTICS_COMPACT_INTERVAL)
@@ -1,577 +1,1027 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-from planner import generate_daily_plan, generate_weekly_plan, validate_student_inputs
-from datetime import datetime
-from database import (
-    init_db, save_study_plan, get_today_plan, complete_task,
-    get_streak, get_daily_progress, create_student, get_student
-)
-from ai_service import generate_plan_explanation, generate_motivation, solve_doubt, generate_schedule_from_syllabus, generate_tutor_response
-from file_service import read_file_content
-import os
-import tempfile
-
-app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend integration
-
-# Initialize database on startup
-init_db()
-
-
-@app.route("/")
-def home():
-    return jsonify({
-        "message": "Study Saathi API is running! 🎓",
-        "endpoints": {
-            "health": "/api/health",
-            "daily_plan": "/api/plan/daily (POST)",
-            "weekly_plan": "/api/plan/weekly (POST)"
-        }
-    })
-
-
-@app.route("/api/health", methods=["GET"])
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "service": "Study Saathi API"
-    })
-
-
-@app.route("/api/plan/daily", methods=["POST"])
-def create_daily_plan():
-    """
-    Generate a daily study plan
-    
-    Expected JSON body:
-    {
-        "subjects": [
-            {
-                "name": "Mathematics",
-                "exam_date": "2024-12-15",
-                "difficulty": "hard",
-                "topics": ["Calculus", "Algebra"]
-            }
-        ],
-        "daily_hours": 6.0,
-        "free_time_slots": [
-            {"start": "09:00", "end": "11:00", "label": "Morning"},
-            {"start": "14:00", "end": "16:00", "label": "Afternoon"}
-        ],
-        "date": "2024-12-01"  # Optional, defaults to today
-    }
-    """
-    try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({"error": "Request body is required"}), 400
-        
-        # Validate inputs
-        is_valid, error_message = validate_student_inputs(data)
-        if not is_valid:
-            return jsonify({"error": error_message}), 400
-        
-        # Extract parameters
-        subjects = data["subjects"]
-        daily_hours = float(data["daily_hours"])
-        free_time_slots = data.get("free_time_slots")
-        date = data.get("date")
-        
-        # Generate daily plan
-        plan = generate_daily_plan(
-            subjects=subjects,
-            daily_hours=daily_hours,
-            free_time_slots=free_time_slots,
-            date=date
-        )
-        
-        # Save plan to database
-        student_id = data.get("student_id", "default")
-        plan_id = save_study_plan(plan, plan_type="daily", student_id=student_id)
-        
-        return jsonify({
-            "success": True,
-            "plan": plan,
-            "plan_id": plan_id,
-            "message": "Daily study plan generated and saved successfully!"
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "error": "Failed to generate plan",
-            "details": str(e)
-        }), 500
-
-
-@app.route("/api/plan/weekly", methods=["POST"])
-def create_weekly_plan():
-    """
-    Generate a weekly study plan
-    
-    Expected JSON body:
-    {
-        "subjects": [
-            {
-                "name": "Mathematics",
-                "exam_date": "2024-12-15",
-                "difficulty": "hard",
-                "topics": ["Calculus", "Algebra"]
-            }
-        ],
-        "daily_hours": 6.0,
-        "free_time_slots": [
-            {"start": "09:00", "end": "11:00", "label": "Morning"},
-            {"start": "14:00", "end": "16:00", "label": "Afternoon"}
-        ],
-        "start_date": "2024-12-01"  # Optional, defaults to today
-    }
-    """
-    try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({"error": "Request body is required"}), 400
-        
-        # Validate inputs
-        is_valid, error_message = validate_student_inputs(data)
-        if not is_valid:
-            return jsonify({"error": error_message}), 400
-        
-        # Extract parameters
-        subjects = data["subjects"]
-        daily_hours = float(data["daily_hours"])
-        free_time_slots = data.get("free_time_slots")
-        start_date = data.get("start_date")
-        
-        # Generate weekly plan
-        plan = generate_weekly_plan(
-            subjects=subjects,
-            daily_hours=daily_hours,
-            free_time_slots=free_time_slots,
-            start_date=start_date
-        )
-        
-        # Save plan to database
-        student_id = data.get("student_id", "default")
-        plan_id = save_study_plan(plan, plan_type="weekly", student_id=student_id)
-        
-        return jsonify({
-            "success": True,
-            "plan": plan,
-            "plan_id": plan_id,
-            "message": "Weekly study plan generated and saved successfully!"
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "error": "Failed to generate plan",
-            "details": str(e)
-        }), 500
-
-
-@app.route("/api/plan/test", methods=["GET"])
-def test_plan():
-    """
-    Test endpoint with sample data
-    Useful for quick testing via browser
-    """
-    sample_subjects = [
-        {
-            "name": "Mathematics",
-            "exam_date": "2024-12-20",
-            "difficulty": "hard",
-            "topics": ["Calculus", "Linear Algebra", "Probability"]
-        },
-        {
-            "name": "Physics",
-            "exam_date": "2024-12-18",
-            "difficulty": "medium",
-            "topics": ["Mechanics", "Thermodynamics"]
-        },
-        {
-            "name": "Chemistry",
-            "exam_date": "2024-12-25",
-            "difficulty": "easy",
-            "topics": ["Organic Chemistry", "Inorganic Chemistry"]
-        }
-    ]
-    
-    sample_time_slots = [
-        {"start": "06:00", "end": "08:00", "label": "Early Morning"},
-        {"start": "09:00", "end": "11:00", "label": "Morning"},
-        {"start": "14:00", "end": "16:00", "label": "Afternoon"},
-        {"start": "17:00", "end": "19:00", "label": "Evening"}
-    ]
-    
-    plan = generate_daily_plan(
-        subjects=sample_subjects,
-        daily_hours=6.0,
-        free_time_slots=sample_time_slots
-    )
-    
-    return jsonify({
-        "success": True,
-        "message": "Sample daily plan generated",
-        "plan": plan
-    }), 200
-
-
-@app.route("/api/plan/today", methods=["GET"])
-def get_today_plan_endpoint():
-    """
-    Get today's study plan from database
-    
-    Query params:
-        student_id (optional): Student identifier (default: 'default')
-    """
-    try:
-        student_id = request.args.get("student_id", "default")
-        tasks = get_today_plan(student_id)
-        
-        if not tasks:
-            return jsonify({
-                "success": True,
-                "message": "No plan found for today. Generate a plan first!",
-                "today_plan": []
-            }), 200
-        
-        return jsonify({
-            "success": True,
-            "today_plan": tasks,
-            "total_tasks": len(tasks),
-            "completed_tasks": sum(1 for task in tasks if task["completed"])
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "error": "Failed to fetch today's plan",
-            "details": str(e)
-        }), 500
-
-
-@app.route("/api/task/complete/<int:task_id>", methods=["POST"])
-def complete_task_endpoint(task_id):
-    """
-    Mark a task as completed
-    
-    Query params:
-        student_id (optional): Student identifier (default: 'default')
-    """
-    try:
-        student_id = request.args.get("student_id", "default")
-        success = complete_task(task_id, student_id)
-        
-        if not success:
-            return jsonify({
-                "error": "Task not found"
-            }), 404
-        
-        return jsonify({
-            "success": True,
-            "message": "Task marked as completed!",
-            "task_id": task_id
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "error": "Failed to complete task",
-            "details": str(e)
-        }), 500
-
-
-@app.route("/api/streak", methods=["GET"])
-def get_streak_endpoint():
-    """
-    Get current study streak
-    
-    Query params:
-        student_id (optional): Student identifier (default: 'default')
-    """
-    try:
-        student_id = request.args.get("student_id", "default")
-        streak_data = get_streak(student_id)
-        
-        return jsonify({
-            "success": True,
-            "streak": streak_data
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "error": "Failed to fetch streak",
-            "details": str(e)
-        }), 500
-
-
-@app.route("/api/progress", methods=["GET"])
-def get_progress_endpoint():
-    """
-    Get daily progress statistics
-    
-    Query params:
-        student_id (optional): Student identifier (default: 'default')
-        date (optional): Date in YYYY-MM-DD format (default: today)
-    """
-    try:
-        student_id = request.args.get("student_id", "default")
-        progress_date = request.args.get("date")
-        
-        progress = get_daily_progress(student_id, progress_date)
-        
-        return jsonify({
-            "success": True,
-            "progress": progress
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "error": "Failed to fetch progress",
-            "details": str(e)
-        }), 500
-
-
-
-
-# Helper for context
-def get_student_context(student_id):
-    """Fetch streak and progress for AI context"""
-    streak = get_streak(student_id)
-    progress = get_daily_progress(student_id)
-    student_profile = get_student(student_id)
-    name = student_profile["name"] if student_profile else None
-    
-    return {"streak": streak, "progress": progress, "name": name}
-
-
-@app.route("/api/student/profile", methods=["POST"])
-def create_profile_endpoint():
-    """Create or update student profile"""
-    try:
-        data = request.get_json()
-        if not data or "name" not in data:
-            return jsonify({"error": "Missing 'name'"}), 400
-            
-        student_id = data.get("student_id", "default")
-        name = data["name"]
-        
-        success = create_student(student_id, name)
-        
-        if success:
-            return jsonify({
-                "success": True, 
-                "message": f"Profile updated for {name}"
-            }), 200
-        else:
-            return jsonify({"error": "Failed to create profile"}), 500
-            
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route("/api/student/profile", methods=["GET"])
-def get_profile_endpoint():
-    """Get student profile"""
-    try:
-        student_id = request.args.get("student_id", "default")
-        profile = get_student(student_id)
-        
-        if profile:
-            return jsonify({"success": True, "profile": profile}), 200
-        else:
-            return jsonify({"success": False, "message": "Profile not found"}), 404
-            
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route("/api/ai/explain-plan", methods=["POST"])
-def explain_plan_endpoint():
-    """
-    Generate AI explanation for a plan
-    
-    Expected JSON body:
-    {
-        "plan": { ... plan object ... },
-        "mode": "english" | "hinglish" (optional)
-    }
-    """
-    try:
-        data = request.get_json()
-        if not data or "plan" not in data:
-            return jsonify({"error": "Missing 'plan' in body"}), 400
-            
-        plan = data["plan"]
-        mode = data.get("mode", "english")
-        
-        explanation = generate_plan_explanation(plan, mode)
-        
-        return jsonify({
-            "success": True,
-            "explanation": explanation,
-            "mode": mode
-        }), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route("/api/ai/motivation", methods=["POST"])
-def motivation_endpoint():
-    """
-    Get motivational message
-    
-    Expected JSON body:
-    {
-        "student_id": "default",
-        "mode": "english" | "hinglish" (optional)
-    }
-    """
-    try:
-        data = request.get_json() or {}
-        student_id = data.get("student_id", "default")
-        mode = data.get("mode", "english")
-        
-        # Fetch context from DB
-        context = get_student_context(student_id)
-        
-        message = generate_motivation(context, mode)
-        
-        return jsonify({
-            "success": True,
-            "message": message,
-            "mode": mode
-        }), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route("/api/ai/plan-and-motivation", methods=["POST"])
-def plan_and_motivation_endpoint():
-    """
-    Get both explanation and motivation
-    """
-    try:
-        data = request.get_json()
-        if not data or "plan" not in data:
-            return jsonify({"error": "Missing 'plan' in body"}), 400
-            
-        plan = data["plan"]
-        student_id = data.get("student_id", "default")
-        mode = data.get("mode", "english")
-        
-        explanation = generate_plan_explanation(plan, mode)
-        
-        context = get_student_context(student_id)
-        motivation = generate_motivation(context, mode)
-        
-        return jsonify({
-            "success": True,
-            "explanation": explanation,
-            "motivation": motivation,
-            "mode": mode
-        }), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-
-@app.route("/api/ai/solve-doubt", methods=["POST"])
-def solve_doubt_endpoint():
-    """
-    Solve doubt endpoint
-    """
-    try:
-        data = request.get_json()
-        if not data or "doubt" not in data:
-            return jsonify({"error": "Missing 'doubt' in body"}), 400
-            
-        doubt = data["doubt"]
-        mode = data.get("mode", "english")
-        
-        answer = solve_doubt(doubt, mode)
-        
-        return jsonify({
-            "success": True,
-            "answer": answer,
-            "mode": mode
-        }), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-
-@app.route("/api/plan/upload", methods=["POST"])
-def upload_syllabus_endpoint():
-    """Handle syllabus file upload and parsing"""
-    try:
-        if 'file' not in request.files:
-            return jsonify({"error": "No file part"}), 400
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({"error": "No selected file"}), 400
-            
-        # Save temp
-        fd, path = tempfile.mkstemp(suffix="_" + file.filename)
-        os.close(fd)
-        file.save(path)
-        
-        # Read
-        try:
-            content = read_file_content(path)
-        finally:
-            if os.path.exists(path):
-                os.remove(path)
-        
-        if not content:
-             return jsonify({"error": "Could not extract text from file"}), 400
-
-        # Parse with AI
-        schedule_data = generate_schedule_from_syllabus(content)
-        
-        return jsonify({
-            "success": True,
-            "extracted_data": schedule_data
-        }), 200
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-@app.route("/api/ai/tutor", methods=["POST"])
-def conversational_tutor_endpoint():
-    """Interactive AI Tutor endpoint"""
-    try:
-        data = request.get_json()
-        state = data.get("state", "START")
-        context = data.get("context", {})
-        user_input = data.get("user_input", "")
-        
-        response = generate_tutor_response(state, context, user_input)
-        
-        return jsonify({
-            "success": True,
-            "response": response
-        }), 200
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-
-if __name__ == "__main__":
-    print("🚀 Starting Study Saathi API...")
-    print("📍 Health check: http://localhost:5000/api/health")
-    print("📍 Test endpoint: http://localhost:5000/api/plan/test")
-    print("📍 Daily plan: POST http://localhost:5000/api/plan/daily")
-    print("📍 Weekly plan: POST http://localhost:5000/api/plan/weekly")
-    print("📍 Today's plan: GET http://localhost:5000/api/plan/today")
-    print("📍 Complete task: POST http://localhost:5000/api/task/complete/<task_id>")
-    print("📍 Get streak: GET http://localhost:5000/api/streak")
-    print("📍 Get progress: GET http://localhost:5000/api/progress")
-    print("📍 AI Explain: POST http://localhost:5000/api/ai/explain-plan")
-    print("📍 AI Motivation: POST http://localhost:5000/api/ai/motivation")
-    app.run(debug=True, host="0.0.0.0", port=5000)
+from flask import Flask, Request, Response, request, jsonify, stream_with_context
+from flask_cors import CORS
+from planner import generate_daily_plan, generate_horizon_plan, validate_student_inputs
+from datetime import datetime
+from database import (
+    init_db, save_study_plan, get_today_plan, complete_task,
+    get_daily_progress, create_student, get_student_context, get_student_version,
+    get_subject_stats, get_pool_stats
+)
+from student_cache import get_student_cache_stats
+from plan_cache import cached_daily_plan, cached_weekly_plan, get_plan_cache_stats
+from llm_cache import get_llm_cache_stats
+from llm_client import get_llm_client_stats
+from ai_async import run_async, plan_and_motivation_async, solve_doubts_batch, iter_solve_doubts, dashboard_text
+from ai_service import generate_plan_explanation, generate_motivation, solve_doubt, generate_tutor_response
+from ai_service import solve_doubt_stream, generate_tutor_response_stream, get_single_flight_stats
+from job_queue import submit_syllabus_upload, submit_syllabus_images, start_job_queue, get_job_status, get_job_queue_stats
+from syllabus_cache import get_syllabus_cache_stats
+from analytics import AnalyticsQueryError, subject_trends, completion_by_difficulty, start_analytics, get_analytics_stats
+from file_service import IMAGE_FORMATS, MAX_UPLOAD_BYTES, UPLOAD_SPOOL_BYTES, UploadTooLarge, peek_format
+from ocr_service import OCR_MAX_IMAGES
+from tempfile import SpooledTemporaryFile
+from werkzeug.exceptions import RequestEntityTooLarge
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:  # Optional: without it large responses are gzip-only
+    brotli = None
+
+BATCH_MAX_DOUBTS = int(os.getenv("BATCH_MAX_DOUBTS", "50"))
+
+# JSON responses at least this big are compressed when the client accepts gzip/br
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+# Part of every per-student ETag; bump when those responses change shape
+READ_ETAG_SALT = "1"
+
+
+class UploadRequest(Request):
+    """Keeps uploaded files in memory up to UPLOAD_SPOOL_BYTES (werkzeug's default is 500 KB)"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES, mode="rb+")
+
+
+app = Flask(__name__)
+app.request_class = UploadRequest
+# Bodies over the limit are rejected with 413 before they are read
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES + 64 * 1024  # Room for the multipart framing
+CORS(app)  # Enable CORS for frontend integration
+
+# Initialize database on startup
+init_db()
+start_job_queue()  # Resume jobs left queued or running by a previous run
+start_analytics()  # Roll finished days up into task_rollups
+
+
+# --- Conditional requests and compression ---
+
+_http_stats = {"not_modified": 0, "compressed": 0, "bytes_before": 0, "bytes_after": 0}
+_http_stats_lock = threading.Lock()
+
+
+def _count_http(**amounts):
+    with _http_stats_lock:
+        for name, amount in amounts.items():
+            _http_stats[name] += amount
+
+
+def get_http_stats():
+    with _http_stats_lock:
+        return dict(_http_stats, brotli=brotli is not None)
+
+
+def student_etag(student_id, version, *parts) -> str:
+    """
+    Strong ETag for a per-student read, built from the student's write
+    counter (get_student_version(): one primary key read, current in every
+    worker) and today's date
+    """
+    today = datetime.today().strftime("%Y-%m-%d")
+    key = "|".join([READ_ETAG_SALT, request.path, student_id, str(version), today, *map(str, parts)])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def etag_matches(etag) -> bool:
+    """If-None-Match names this ETag, as sent plain or compressed"""
+    if_none_match = request.if_none_match
+    return if_none_match.star_tag or any(
+        if_none_match.contains(candidate) for candidate in (etag, f"{etag}-gzip", f"{etag}-br")
+    )
+
+
+def not_modified(etag) -> Response:
+    _count_http(not_modified=1)
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def conditional_json(body, etag=None) -> Response:
+    """
+    JSON response with an ETag (the one given, else a hash of the content).
+    A client that sends the same ETag back in If-None-Match gets an empty
+    304 instead of the body.
+    """
+    response = jsonify(body)
+    if etag:
+        response.set_etag(etag)
+    else:
+        response.add_etag()
+        etag = response.get_etag()[0]
+    if etag_matches(etag):
+        return not_modified(etag)
+    response.headers["Cache-Control"] = "private, no-cache"  # Always revalidate, never serve stale
+    return response
+
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """brotli or gzip for large JSON responses (e.g. weekly plans), when the client accepts it"""
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or response.mimetype != "application/json" or "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+
+    accept = request.accept_encodings
+    if brotli is not None and accept["br"]:
+        encoding, compressed = "br", brotli.compress(data, quality=BROTLI_QUALITY)
+    elif accept["gzip"]:
+        encoding, compressed = "gzip", gzip.compress(data, GZIP_LEVEL, mtime=0)
+    else:
+        return response
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    # Each encoding is its own representation, so it gets its own strong ETag
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    _count_http(compressed=1, bytes_before=len(data), bytes_after=len(compressed))
+    return response
+
+
+@app.route("/")
+def home():
+    return jsonify({
+        "message": "Study Saathi API is running! 🎓",
+        "endpoints": {
+            "health": "/api/health",
+            "daily_plan": "/api/plan/daily (POST)",
+            "weekly_plan": "/api/plan/weekly (POST)",
+            "horizon_plan": "/api/plan/horizon (POST)"
+        }
+    })
+
+
+@app.route("/api/health", methods=["GET"])
+def health_check():
+    """Health check endpoint"""
+    return jsonify({
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "service": "Study Saathi API",
+        "database_pool": get_pool_stats(),
+        "plan_cache": get_plan_cache_stats(),
+        "llm_cache": get_llm_cache_stats(),
+        "llm_client": get_llm_client_stats(),
+        "llm_single_flight": get_single_flight_stats(),
+        "job_queue": get_job_queue_stats(),
+        "syllabus_cache": get_syllabus_cache_stats(),
+        "student_cache": get_student_cache_stats(),
+        "http": get_http_stats(),
+        "analytics": get_analytics_stats()
+    })
+
+
+@app.route("/api/plan/daily", methods=["POST"])
+def create_daily_plan():
+    """
+    Generate a daily study plan
+    
+    Expected JSON body:
+    {
+        "subjects": [
+            {
+                "name": "Mathematics",
+                "exam_date": "2024-12-15",
+                "difficulty": "hard",
+                "topics": ["Calculus", "Algebra"]
+            }
+        ],
+        "daily_hours": 6.0,
+        "free_time_slots": [
+            {"start": "09:00", "end": "11:00", "label": "Morning"},
+            {"start": "14:00", "end": "16:00", "label": "Afternoon"}
+        ],
+        "date": "2024-12-01",  # Optional, defaults to today
+        "student_id": "student_1",  # Optional, defaults to 'default'
+        "adaptive": true  # Optional: shift hours toward subjects this student keeps skipping
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "Request body is required"}), 400
+        
+        # Validate inputs
+        is_valid, error_message = validate_student_inputs(data)
+        if not is_valid:
+            return jsonify({"error": error_message}), 400
+        
+        # Extract parameters
+        subjects = data["subjects"]
+        daily_hours = float(data["daily_hours"])
+        free_time_slots = data.get("free_time_slots")
+        date = data.get("date")
+        student_id = data.get("student_id", "default")
+        
+        # Adaptive mode: the student's completion history per subject, minus
+        # the plan this one replaces
+        subject_stats = None
+        if data.get("adaptive"):
+            subject_stats = get_subject_stats(student_id, exclude_date=date or datetime.today().strftime("%Y-%m-%d"))
+        
+        # Generate daily plan (reused from the plan cache for identical inputs)
+        plan, plan_hash = cached_daily_plan(
+            subjects=subjects,
+            daily_hours=daily_hours,
+            free_time_slots=free_time_slots,
+            date=date,
+            subject_stats=subject_stats
+        )
+        
+        # Save plan to database (skipped if the stored plan is unchanged)
+        plan_id = save_study_plan(plan, plan_type="daily", student_id=student_id, plan_hash=plan_hash)
+        
+        return jsonify({
+            "success": True,
+            "plan": plan,
+            "plan_id": plan_id,
+            "message": "Daily study plan generated and saved successfully!"
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to generate plan",
+            "details": str(e)
+        }), 500
+
+
+@app.route("/api/plan/weekly", methods=["POST"])
+def create_weekly_plan():
+    """
+    Generate a weekly study plan
+    
+    Expected JSON body:
+    {
+        "subjects": [
+            {
+                "name": "Mathematics",
+                "exam_date": "2024-12-15",
+                "difficulty": "hard",
+                "topics": ["Calculus", "Algebra"]
+            }
+        ],
+        "daily_hours": 6.0,
+        "free_time_slots": [
+            {"start": "09:00", "end": "11:00", "label": "Morning"},
+            {"start": "14:00", "end": "16:00", "label": "Afternoon"}
+        ],
+        "start_date": "2024-12-01",  # Optional, defaults to today
+        "student_id": "student_1",  # Optional, defaults to 'default'
+        "adaptive": true  # Optional, as in /api/plan/daily
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "Request body is required"}), 400
+        
+        # Validate inputs
+        is_valid, error_message = validate_student_inputs(data)
+        if not is_valid:
+            return jsonify({"error": error_message}), 400
+        
+        # Extract parameters
+        subjects = data["subjects"]
+        daily_hours = float(data["daily_hours"])
+        free_time_slots = data.get("free_time_slots")
+        start_date = data.get("start_date")
+        student_id = data.get("student_id", "default")
+        subject_stats = get_subject_stats(student_id) if data.get("adaptive") else None
+        
+        # Generate weekly plan (reused from the plan cache for identical inputs)
+        plan, plan_hash = cached_weekly_plan(
+            subjects=subjects,
+            daily_hours=daily_hours,
+            free_time_slots=free_time_slots,
+            start_date=start_date,
+            subject_stats=subject_stats
+        )
+        
+        # Save plan to database (skipped if the stored plan is unchanged)
+        plan_id = save_study_plan(plan, plan_type="weekly", student_id=student_id, plan_hash=plan_hash)
+        
+        return jsonify({
+            "success": True,
+            "plan": plan,
+            "plan_id": plan_id,
+            "message": "Weekly study plan generated and saved successfully!"
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to generate plan",
+            "details": str(e)
+        }), 500
+
+
+@app.route("/api/plan/horizon", methods=["POST"])
+def create_horizon_plan():
+    """
+    Generate a multi-day plan for exam season (not saved to the database)
+    
+    Expected JSON body: same as /api/plan/weekly, plus
+    {
+        "days": 30  # Optional (e.g. 14/30/90), defaults to the last exam date
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "Request body is required"}), 400
+        
+        # Validate inputs
+        is_valid, error_message = validate_student_inputs(data)
+        if not is_valid:
+            return jsonify({"error": error_message}), 400
+        
+        days = data.get("days")
+        if days is not None and (not isinstance(days, int) or days <= 0):
+            return jsonify({"error": "days must be a positive integer"}), 400
+        
+        plan = generate_horizon_plan(
+            subjects=data["subjects"],
+            daily_hours=float(data["daily_hours"]),
+            free_time_slots=data.get("free_time_slots"),
+            start_date=data.get("start_date"),
+            days=days
+        )
+        
+        return jsonify({
+            "success": True,
+            "plan": plan
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to generate plan",
+            "details": str(e)
+        }), 500
+
+
+@app.route("/api/plan/test", methods=["GET"])
+def test_plan():
+    """
+    Test endpoint with sample data
+    Useful for quick testing via browser
+    """
+    sample_subjects = [
+        {
+            "name": "Mathematics",
+            "exam_date": "2024-12-20",
+            "difficulty": "hard",
+            "topics": ["Calculus", "Linear Algebra", "Probability"]
+        },
+        {
+            "name": "Physics",
+            "exam_date": "2024-12-18",
+            "difficulty": "medium",
+            "topics": ["Mechanics", "Thermodynamics"]
+        },
+        {
+            "name": "Chemistry",
+            "exam_date": "2024-12-25",
+            "difficulty": "easy",
+            "topics": ["Organic Chemistry", "Inorganic Chemistry"]
+        }
+    ]
+    
+    sample_time_slots = [
+        {"start": "06:00", "end": "08:00", "label": "Early Morning"},
+        {"start": "09:00", "end": "11:00", "label": "Morning"},
+        {"start": "14:00", "end": "16:00", "label": "Afternoon"},
+        {"start": "17:00", "end": "19:00", "label": "Evening"}
+    ]
+    
+    plan = generate_daily_plan(
+        subjects=sample_subjects,
+        daily_hours=6.0,
+        free_time_slots=sample_time_slots
+    )
+    
+    return jsonify({
+        "success": True,
+        "message": "Sample daily plan generated",
+        "plan": plan
+    }), 200
+
+
+@app.route("/api/plan/today", methods=["GET"])
+def get_today_plan_endpoint():
+    """
+    Get today's study plan from database
+    
+    Query params:
+        student_id (optional): Student identifier (default: 'default')
+    
+    Supports If-None-Match (304 until the student's data changes).
+    """
+    try:
+        student_id = request.args.get("student_id", "default")
+        etag = student_etag(student_id, get_student_version(student_id))
+        if etag_matches(etag):
+            return not_modified(etag)
+
+        tasks = get_today_plan(student_id)
+        
+        if not tasks:
+            return conditional_json({
+                "success": True,
+                "message": "No plan found for today. Generate a plan first!",
+                "today_plan": []
+            }, etag)
+        
+        return conditional_json({
+            "success": True,
+            "today_plan": tasks,
+            "total_tasks": len(tasks),
+            "completed_tasks": sum(1 for task in tasks if task["completed"])
+        }, etag)
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to fetch today's plan",
+            "details": str(e)
+        }), 500
+
+
+@app.route("/api/task/complete/<int:task_id>", methods=["POST"])
+def complete_task_endpoint(task_id):
+    """
+    Mark a task as completed
+    
+    Query params:
+        student_id (optional): Student identifier (default: 'default')
+    """
+    try:
+        student_id = request.args.get("student_id", "default")
+        success = complete_task(task_id, student_id)
+        
+        if not success:
+            return jsonify({
+                "error": "Task not found"
+            }), 404
+        
+        return jsonify({
+            "success": True,
+            "message": "Task marked as completed!",
+            "task_id": task_id
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to complete task",
+            "details": str(e)
+        }), 500
+
+
+@app.route("/api/streak", methods=["GET"])
+def get_streak_endpoint():
+    """
+    Get current study streak
+    
+    Query params:
+        student_id (optional): Student identifier (default: 'default')
+    
+    Supports If-None-Match (304 until the student's data changes).
+    """
+    try:
+        student_id = request.args.get("student_id", "default")
+        version = get_student_version(student_id)
+        etag = student_etag(student_id, version)
+        if etag_matches(etag):
+            return not_modified(etag)
+
+        streak_data = get_student_context(student_id, version)["streak"]
+        
+        return conditional_json({
+            "success": True,
+            "streak": streak_data
+        }, etag)
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to fetch streak",
+            "details": str(e)
+        }), 500
+
+
+@app.route("/api/progress", methods=["GET"])
+def get_progress_endpoint():
+    """
+    Get daily progress statistics
+    
+    Query params:
+        student_id (optional): Student identifier (default: 'default')
+        date (optional): Date in YYYY-MM-DD format (default: today)
+    """
+    try:
+        student_id = request.args.get("student_id", "default")
+        progress_date = request.args.get("date")
+        
+        # Today's progress comes from the cached read model
+        if progress_date in (None, datetime.today().strftime("%Y-%m-%d")):
+            version = get_student_version(student_id)
+            etag = student_etag(student_id, version)
+            if etag_matches(etag):
+                return not_modified(etag)
+            progress = get_student_context(student_id, version)["progress"]
+        else:
+            etag = None  # Content ETag
+            progress = get_daily_progress(student_id, progress_date)
+        
+        return conditional_json({
+            "success": True,
+            "progress": progress
+        }, etag)
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to fetch progress",
+            "details": str(e)
+        }), 500
+
+
+
+def _dashboard_plan(tasks):
+    """Today's tasks in the plan shape the explanation prompt expects (None without tasks)"""
+    if not tasks:
+        return None
+    return {
+        "date": "Today",
+        "total_study_hours": round(sum(task["study_hours"] or 0 for task in tasks
+                                       if task["subject"] != "Break"), 2),
+        "schedule": [{"activities": tasks}]
+    }
+
+
+@app.route("/api/dashboard", methods=["GET"])
+def dashboard_endpoint():
+    """
+    Everything the dashboard shows, in one round trip: profile, streak,
+    today's progress and tasks, plus the plan explanation and motivation
+    
+    Query params:
+        student_id (optional): Student identifier (default: 'default')
+        mode (optional): "english" | "hinglish" for the AI text (default: english)
+    
+    The AI text is never generated inside the request: the response has the
+    text last made for this student (null at first) and ai_pending=true
+    while a newer one is generated in the background; load again to get it.
+    Supports If-None-Match: 304 until the student's data or the AI text
+    changes.
+    """
+    try:
+        student_id = request.args.get("student_id", "default")
+        mode = request.args.get("mode", "english")
+        version = get_student_version(student_id)
+        explanation, motivation, ready = dashboard_text(
+            student_id, mode, version,
+            lambda: (_dashboard_plan(get_today_plan(student_id)), get_student_context(student_id, version))
+        )
+        etag = student_etag(student_id, version, mode, ready, motivation)
+        if etag_matches(etag):
+            return not_modified(etag)
+
+        context = get_student_context(student_id, version)
+        tasks = get_today_plan(student_id)
+
+        return conditional_json({
+            "success": True,
+            "student_id": student_id,
+            "profile": context["profile"],
+            "streak": context["streak"],
+            "progress": context["progress"],
+            "today_plan": tasks,
+            "total_tasks": len(tasks),
+            "completed_tasks": sum(1 for task in tasks if task["completed"]),
+            "explanation": explanation if tasks else None,
+            "motivation": motivation,
+            "ai_pending": not ready,
+            "mode": mode
+        }, etag)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to load dashboard",
+            "details": str(e)
+        }), 500
+
+
+@app.route("/api/student/profile", methods=["POST"])
+def create_profile_endpoint():
+    """Create or update student profile"""
+    try:
+        data = request.get_json()
+        if not data or "name" not in data:
+            return jsonify({"error": "Missing 'name'"}), 400
+            
+        student_id = data.get("student_id", "default")
+        name = data["name"]
+        
+        success = create_student(student_id, name)
+        
+        if success:
+            return jsonify({
+                "success": True, 
+                "message": f"Profile updated for {name}"
+            }), 200
+        else:
+            return jsonify({"error": "Failed to create profile"}), 500
+            
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/student/profile", methods=["GET"])
+def get_profile_endpoint():
+    """Get student profile (supports If-None-Match)"""
+    try:
+        student_id = request.args.get("student_id", "default")
+        version = get_student_version(student_id)
+        etag = student_etag(student_id, version)
+        if etag_matches(etag):
+            return not_modified(etag)
+
+        profile = get_student_context(student_id, version)["profile"]
+        
+        if profile:
+            return conditional_json({"success": True, "profile": profile}, etag)
+        else:
+            return jsonify({"success": False, "message": "Profile not found"}), 404
+            
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/ai/explain-plan", methods=["POST"])
+def explain_plan_endpoint():
+    """
+    Generate AI explanation for a plan
+    
+    Expected JSON body:
+    {
+        "plan": { ... plan object ... },
+        "mode": "english" | "hinglish" (optional)
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data or "plan" not in data:
+            return jsonify({"error": "Missing 'plan' in body"}), 400
+            
+        plan = data["plan"]
+        mode = data.get("mode", "english")
+        
+        explanation = generate_plan_explanation(plan, mode)
+        
+        return jsonify({
+            "success": True,
+            "explanation": explanation,
+            "mode": mode
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/ai/motivation", methods=["POST"])
+def motivation_endpoint():
+    """
+    Get motivational message
+    
+    Expected JSON body:
+    {
+        "student_id": "default",
+        "mode": "english" | "hinglish" (optional)
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        student_id = data.get("student_id", "default")
+        mode = data.get("mode", "english")
+        
+        # Fetch context from DB
+        context = get_student_context(student_id)
+        
+        message = generate_motivation(context, mode)
+        
+        return jsonify({
+            "success": True,
+            "message": message,
+            "mode": mode
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/ai/plan-and-motivation", methods=["POST"])
+def plan_and_motivation_endpoint():
+    """
+    Get both explanation and motivation
+    """
+    try:
+        data = request.get_json()
+        if not data or "plan" not in data:
+            return jsonify({"error": "Missing 'plan' in body"}), 400
+            
+        plan = data["plan"]
+        student_id = data.get("student_id", "default")
+        mode = data.get("mode", "english")
+        
+        # Both LLM calls run concurrently on the async layer
+        explanation, motivation = run_async(plan_and_motivation_async(
+            plan, lambda: get_student_context(student_id), mode
+        ))
+        
+        return jsonify({
+            "success": True,
+            "explanation": explanation,
+            "motivation": motivation,
+            "mode": mode
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+
+def wants_stream(data) -> bool:
+    """Stream when the body has "stream": true or the client accepts text/event-stream"""
+    return bool(data.get("stream")) or "text/event-stream" in request.headers.get("Accept", "")
+
+
+def sse_event(data, event=None) -> str:
+    """One Server-Sent Event carrying JSON"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events):
+    """Stream SSE strings to the client as they are produced"""
+    def guarded():
+        try:
+            yield from events
+        except Exception as e:
+            yield sse_event({"error": str(e)}, event="error")
+
+    return Response(stream_with_context(guarded()), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Don't let a proxy buffer the stream
+    })
+
+
+@app.route("/api/ai/solve-doubt", methods=["POST"])
+def solve_doubt_endpoint():
+    """
+    Solve doubt endpoint
+    """
+    try:
+        data = request.get_json()
+        if not data or "doubt" not in data:
+            return jsonify({"error": "Missing 'doubt' in body"}), 400
+            
+        doubt = data["doubt"]
+        mode = data.get("mode", "english")
+        
+        # Streaming mode: {"delta": ...} events, then a "done" event with the full answer
+        if wants_stream(data):
+            def events():
+                chunks = []
+                for chunk in solve_doubt_stream(doubt, mode):
+                    chunks.append(chunk)
+                    yield sse_event({"delta": chunk})
+                yield sse_event({"success": True, "answer": "".join(chunks).strip(), "mode": mode}, event="done")
+            return sse_response(events())
+        
+        answer = solve_doubt(doubt, mode)
+        
+        return jsonify({
+            "success": True,
+            "answer": answer,
+            "mode": mode
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+
+@app.route("/api/ai/solve-doubts/batch", methods=["POST"])
+def solve_doubts_batch_endpoint():
+    """
+    Solve a list of doubts (e.g. a teacher's question set) concurrently
+    
+    Expected JSON body:
+    {
+        "doubts": ["What is probability?", "What is a vector?"],
+        "mode": "english",
+        "stream": false  # true: one SSE event per doubt as it finishes
+    }
+    """
+    try:
+        data = request.get_json()
+        doubts = data.get("doubts") if data else None
+        if not isinstance(doubts, list) or not doubts:
+            return jsonify({"error": "'doubts' must be a non-empty list"}), 400
+        if len(doubts) > BATCH_MAX_DOUBTS:
+            return jsonify({"error": f"At most {BATCH_MAX_DOUBTS} doubts per batch"}), 400
+        if not all(isinstance(d, str) and d.strip() for d in doubts):
+            return jsonify({"error": "Every doubt must be a non-empty string"}), 400
+        
+        mode = data.get("mode", "english")
+        
+        # Streaming mode: a result event per doubt in completion order, then "done"
+        if wants_stream(data):
+            def events():
+                for result in iter_solve_doubts(doubts, mode):
+                    yield sse_event(result)
+                yield sse_event({"success": True, "count": len(doubts), "mode": mode}, event="done")
+            return sse_response(events())
+        
+        results = solve_doubts_batch(doubts, mode)
+        
+        return jsonify({
+            "success": True,
+            "results": results,
+            "mode": mode
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/plan/upload", methods=["POST"])
+def upload_syllabus_endpoint():
+    """
+    Queue a syllabus file for extraction and parsing
+
+    Returns 202 with a job id right away; poll GET /api/jobs/<job_id> until
+    its status is "done" (result.extracted_data) or "failed" (error).
+    A file seen before comes back as 200 with "extracted_data" already set.
+    Several "file" parts must all be JPG/PNG photos (e.g. one per syllabus
+    page); they are OCR'd as one job.
+    """
+    try:
+        if 'file' not in request.files:
+            return jsonify({"error": "No file part"}), 400
+        files = [f for f in request.files.getlist('file') if f.filename != '']
+        if not files:
+            return jsonify({"error": "No selected file"}), 400
+        student_id = request.form.get("student_id", "default")
+
+        if len(files) > 1:
+            if len(files) > OCR_MAX_IMAGES:
+                return jsonify({"error": f"At most {OCR_MAX_IMAGES} images per upload"}), 400
+            if any(peek_format(f.stream) not in IMAGE_FORMATS for f in files):
+                return jsonify({"error": "Several files can only be uploaded as JPG or PNG images"}), 400
+            job_id = submit_syllabus_images([f.stream for f in files], [f.filename for f in files], student_id)
+        else:
+            file = files[0]
+            # Formats are recognised by content, so reject anything else before queueing
+            if peek_format(file.stream) is None:
+                return jsonify({"error": "Unsupported file format: expected a PDF, DOCX, TXT, JPG or PNG file"}), 400
+            job_id = submit_syllabus_upload(file.stream, file.filename, student_id)
+        job = get_job_status(job_id)
+
+        response = {
+            "success": True,
+            "job_id": job_id,
+            "status": job["status"],
+            "status_url": f"/api/jobs/{job_id}"
+        }
+        # Re-upload of a file already in the syllabus cache: answered right away
+        if job["status"] == "done":
+            response["extracted_data"] = job["result"]["extracted_data"]
+            return jsonify(response), 200
+        return jsonify(response), 202
+
+    except RequestEntityTooLarge:
+        return jsonify({"error": f"File is over the {MAX_UPLOAD_BYTES}-byte limit"}), 413
+    except UploadTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def job_status_endpoint(job_id):
+    """Status, progress and (once done) result of a background job"""
+    job = get_job_status(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify({"success": True, "job": job}), 200
+
+
+def _analytics_students():
+    """student_ids=a,b,c (a class) or student_id (default: 'default')"""
+    if request.args.get("student_ids"):
+        return [s.strip() for s in request.args["student_ids"].split(",")]
+    return [request.args.get("student_id", "default")]
+
+
+@app.route("/api/analytics/subjects", methods=["GET"])
+def analytics_subjects_endpoint():
+    """
+    Study hours and completion per subject over time
+    
+    Query params:
+        student_id or student_ids (comma-separated, summed as a class)
+        from, to (optional): YYYY-MM-DD (default: the last 365 days up to yesterday)
+        period (optional): day, week or month (default: week)
+    
+    Served from the task_rollups table, which covers days up to
+    "compacted_through" (today is rolled up tomorrow).
+    """
+    try:
+        result = subject_trends(_analytics_students(), request.args.get("from"), request.args.get("to"),
+                                request.args.get("period", "week"))
+        return conditional_json({"success": True, **result})
+    except AnalyticsQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to fetch analytics",
+            "details": str(e)
+        }), 500
+
+
+@app.route("/api/analytics/difficulty", methods=["GET"])
+def analytics_difficulty_endpoint():
+    """
+    Completion rate by difficulty level
+    
+    Query params: student_id or student_ids, from, to (as /api/analytics/subjects)
+    """
+    try:
+        result = completion_by_difficulty(_analytics_students(), request.args.get("from"), request.args.get("to"))
+        return conditional_json({"success": True, **result})
+    except AnalyticsQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to fetch analytics",
+            "details": str(e)
+        }), 500
+
+
+@app.route("/api/ai/tutor", methods=["POST"])
+def conversational_tutor_endpoint():
+    """Interactive AI Tutor endpoint"""
+    try:
+        data = request.get_json()
+        state = data.get("state", "START")
+        context = data.get("context", {})
+        user_input = data.get("user_input", "")
+        
+        # Streaming mode: {"delta": ...} events, then a "done" event with the usual response
+        if wants_stream(data):
+            def events():
+                for item in generate_tutor_response_stream(state, context, user_input):
+                    if "delta" in item:
+                        yield sse_event(item)
+                    else:
+                        yield sse_event({"success": True, "response": item}, event="done")
+            return sse_response(events())
+        
+        response = generate_tutor_response(state, context, user_input)
+        
+        return jsonify({
+            "success": True,
+            "response": response
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+if __name__ == "__main__":
+    print("🚀 Starting Study Saathi API...")
+    print("📍 Health check: http://localhost:5000/api/health")
+    print("📍 Test endpoint: http://localhost:5000/api/plan/test")
+    print("📍 Daily plan: POST http://localhost:5000/api/plan/daily")
+    print("📍 Weekly plan: POST http://localhost:5000/api/plan/weekly")
+    print("📍 Today's plan: GET http://localhost:5000/api/plan/today")
+    print("📍 Complete task: POST http://localhost:5000/api/task/complete/<task_id>")
+    print("📍 Get streak: GET http://localhost:5000/api/streak")
+    print("📍 Get progress: GET http://localhost:5000/api/progress")
+    print("📍 AI Explain: POST http://localhost:5000/api/ai/explain-plan")
+    print("📍 AI Motivation: POST http://localhost:5000/api/ai/motivation")
+    app.run(debug=True, host="0.0.0.0", port=5000)
@@ -0,0 +1,101 @@
+"""
+Benchmark for analytics range queries
+Fills a database with a year of daily plans for one student and a term
+(120 days) for a class of 40, with about half the tasks completed, then
+times the same weekly subject-trend query two ways: aggregated from
+study_plans JOIN study_tasks at request time, and read from task_rollups
+Run with: python bench_analytics.py
+"""
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "bench_analytics.db")
+database.init_db()
+
+import analytics
+from planner import generate_daily_plan
+
+SUBJECTS = [
+    {"name": "Mathematics", "exam_date": "2030-06-01", "difficulty": "hard"},
+    {"name": "Physics", "exam_date": "2030-06-05", "difficulty": "medium"},
+    {"name": "Chemistry", "exam_date": "2030-06-09", "difficulty": "easy"},
+    {"name": "Biology", "exam_date": "2030-06-12", "difficulty": "medium"},
+    {"name": "English", "exam_date": "2030-06-15", "difficulty": "easy"},
+]
+CLASS = [f"class_{i:02d}" for i in range(40)]
+
+# What an endpoint without rollups would run
+JOIN_TRENDS_SQL = """
+    SELECT date(p.plan_date, '-6 days', 'weekday 1') AS period, t.subject,
+           COUNT(*) AS planned_tasks, SUM(t.completed) AS completed_tasks,
+           SUM(t.study_hours) AS planned_hours,
+           SUM(CASE WHEN t.completed=1 THEN t.study_hours ELSE 0 END) AS completed_hours
+    FROM study_plans p JOIN study_tasks t ON t.plan_id = p.id
+    WHERE p.student_id IN ({students}) AND p.plan_type='daily' AND p.plan_date BETWEEN ? AND ?
+      AND t.subject_id != 'break'
+    GROUP BY period, t.subject
+"""
+
+
+def fill(student_ids, days):
+    template = generate_daily_plan(SUBJECTS, 6.0)
+    today = date.today()
+    plans = []
+    for student_id in student_ids:
+        for days_ago in range(1, days + 1):
+            plans.append({"student_id": student_id, "plan": dict(template, date=str(today - timedelta(days=days_ago)))})
+    database.save_study_plans_bulk(plans)
+    with database.pooled_connection() as conn:
+        conn.execute("UPDATE study_tasks SET completed = abs(random()) % 2")
+        conn.commit()
+
+
+def best_ms(run, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def join_trends(student_ids, start, end):
+    sql = JOIN_TRENDS_SQL.format(students=", ".join("?" * len(student_ids)))
+    with database.pooled_connection() as conn:
+        return conn.execute(sql, (*student_ids, start, end)).fetchall()
+
+
+def main():
+    random.seed(7)
+    start = time.perf_counter()
+    fill(["year_student"], 365)
+    fill(CLASS, 120)
+    with database.pooled_connection() as conn:
+        tasks = conn.execute("SELECT COUNT(*) FROM study_tasks").fetchone()[0]
+    print(f"\nFilled {tasks:,} tasks in {time.perf_counter() - start:.1f} s")
+
+    result = analytics.compact()
+    print(f"Compacted into {result['rows']:,} rollup rows in {result['ms']:.0f} ms "
+          f"(incremental runs only touch the newest days)")
+
+    yesterday = date.today() - timedelta(days=1)
+    cases = {
+        "one student, 365 days": (["year_student"], str(yesterday - timedelta(days=364))),
+        "class of 40, 120 days": (CLASS, str(yesterday - timedelta(days=119))),
+    }
+    print("\n" + "=" * 50)
+    print("Weekly subject trends")
+    print("=" * 50)
+    for name, (student_ids, first_day) in cases.items():
+        scan = best_ms(lambda: join_trends(student_ids, first_day, str(yesterday)))
+        rollup = best_ms(lambda: analytics.subject_trends(student_ids, first_day, str(yesterday), "week"))
+        print(f"  {name:<24} join {scan:7.2f} ms   rollups {rollup:6.2f} ms   {scan / rollup:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
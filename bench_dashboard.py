@@ -0,0 +1,87 @@
+"""
+Benchmark for dashboard page loads
+Times the requests the dashboard used to make (/api/streak -> /api/progress,
+/api/plan/today -> /api/ai/explain-plan, /api/ai/motivation) against the
+single /api/dashboard call, and models page-ready time over mobile
+round-trip times: the old page waited for the longest of its three
+request chains, two round trips deep
+Run with: python bench_dashboard.py
+"""
+import os
+import tempfile
+import time
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "bench_dashboard.db")
+database.init_db()
+
+import ai_service
+from app import app
+from planner import generate_daily_plan
+
+ai_service.LLM_API_KEY = None  # Mock AI responses, so only our own work is timed
+
+STUDENT = "bench_student"
+SUBJECTS = [
+    {"name": "Mathematics", "exam_date": "2030-06-01", "difficulty": "hard"},
+    {"name": "Physics", "exam_date": "2030-06-05", "difficulty": "medium"},
+    {"name": "Chemistry", "exam_date": "2030-06-09", "difficulty": "easy"},
+]
+
+
+def timed_request(send, repeat=50):
+    """Best-of-`repeat` server time in seconds and response size in bytes"""
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = send()
+        best = min(best, time.perf_counter() - start)
+        size = len(response.data)
+    return best, size
+
+
+def main(rtts_ms=(50, 150, 300, 600)):
+    database.create_student(STUDENT, "Bench")
+    database.save_study_plan(generate_daily_plan(SUBJECTS, 6.0), "daily", STUDENT)
+    client = app.test_client()
+    query = f"?student_id={STUDENT}"
+    tasks = client.get("/api/plan/today" + query).get_json()["today_plan"]
+    plan = {"date": "Today", "total_study_hours": 6, "schedule": [{"activities": tasks}]}
+
+    old = {
+        "streak": timed_request(lambda: client.get("/api/streak" + query)),
+        "progress": timed_request(lambda: client.get("/api/progress" + query)),
+        "plan_today": timed_request(lambda: client.get("/api/plan/today" + query)),
+        "explain": timed_request(lambda: client.post("/api/ai/explain-plan", json={"plan": plan})),
+        "motivation": timed_request(lambda: client.post("/api/ai/motivation", json={"student_id": STUDENT})),
+    }
+    while client.get("/api/dashboard" + query).get_json()["ai_pending"]:  # AI text is made in the background
+        time.sleep(0.05)
+    new = timed_request(lambda: client.get("/api/dashboard" + query))
+    etag = client.get("/api/dashboard" + query).headers["ETag"]
+    revalidate = timed_request(lambda: client.get("/api/dashboard" + query, headers={"If-None-Match": etag}))
+
+    print("\n" + "=" * 50)
+    print("Dashboard load")
+    print("=" * 50)
+    for name, (seconds, size) in old.items():
+        print(f"  old {name:<22} {seconds * 1000:7.2f} ms  {size:6,} B")
+    print(f"  new /api/dashboard         {new[0] * 1000:7.2f} ms  {new[1]:6,} B")
+    print(f"  new /api/dashboard (304)   {revalidate[0] * 1000:7.2f} ms  {revalidate[1]:6,} B")
+
+    chains = [
+        old["streak"][0] + old["progress"][0],
+        old["plan_today"][0] + old["explain"][0],
+        old["motivation"][0],
+    ]
+    print("\n  Page ready (server time + round trips on the critical path):")
+    for rtt in rtts_ms:
+        before = max(chains) * 1000 + 2 * rtt
+        after = new[0] * 1000 + rtt
+        print(f"    RTT {rtt:4} ms: old {before:7.1f} ms (5 requests), new {after:7.1f} ms (1 request), "
+              f"{before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark for database read/write paths
+Compares the old per-row INSERT loop with the batched executemany writer,
+and ast.literal_eval topic decoding with the JSON read path
+Run with: python bench_database.py
+"""
+import ast
+import json
+import os
+import tempfile
+import time
+
+import database
+from planner import generate_daily_plan, generate_weekly_plan
+
+SUBJECT_NAMES = ["Mathematics", "Physics", "Chemistry", "Biology",
+                 "English", "History", "Geography", "Economics"]
+
+
+def make_subjects(count):
+    return [
+        {
+            "name": SUBJECT_NAMES[i % len(SUBJECT_NAMES)] + f" {i}",
+            "exam_date": "2026-12-01",
+            "difficulty": ["easy", "medium", "hard"][i % 3],
+            "topics": [f"Topic {i}.{t}" for t in range(4)]
+        }
+        for i in range(count)
+    ]
+
+
+def save_plan_per_row(plan_data, plan_type="weekly", student_id="default"):
+    """The previous implementation: one cursor.execute per task, str(list) topics"""
+    with database.pooled_connection() as conn:
+        cursor = conn.cursor()
+        plan_date = plan_data.get("date") or plan_data.get("week_start")
+        cursor.execute("""
+            INSERT OR REPLACE INTO study_plans
+            (student_id, plan_date, plan_type, total_hours, subjects_count)
+            VALUES (?, ?, ?, ?, ?)
+        """, (student_id, plan_date, plan_type, plan_data.get("total_study_hours", 0), 0))
+        plan_id = cursor.lastrowid
+        cursor.execute("DELETE FROM study_tasks WHERE plan_id=?", (plan_id,))
+        for day_plan in plan_data["days"]:
+            for slot in day_plan.get("schedule", []):
+                for activity in slot.get("activities", []):
+                    cursor.execute(database.INSERT_TASK_SQL, (
+                        plan_id,
+                        activity.get("subject"),
+                        activity.get("subject_id"),
+                        activity.get("duration_hours", 0),
+                        activity.get("start_time"),
+                        activity.get("end_time"),
+                        slot.get("time_slot"),
+                        activity.get("difficulty"),
+                        str(activity.get("topics", []))
+                    ))
+        conn.commit()
+        return plan_id
+
+
+def get_today_plan_literal_eval(student_id="default"):
+    """The previous read path: topics stored as str(list), decoded with ast.literal_eval"""
+    with database.pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(database.TODAY_PLAN_SQL, (student_id, time.strftime("%Y-%m-%d")))
+        plan_id = cursor.fetchone()["id"]
+        cursor.execute(database.PLAN_TASKS_SQL, (plan_id,))
+        tasks = []
+        for row in cursor.fetchall():
+            topics = []
+            if row["topics"]:
+                try:
+                    import ast
+                    topics = ast.literal_eval(row["topics"])
+                except:
+                    topics = []
+            tasks.append({
+                "task_id": row["id"],
+                "subject": row["subject"],
+                "subject_id": row["subject_id"],
+                "study_hours": row["study_hours"],
+                "start_time": row["start_time"],
+                "end_time": row["end_time"],
+                "time_slot": row["time_slot"],
+                "difficulty": row["difficulty"],
+                "topics": topics,
+                "completed": bool(row["completed"]),
+                "completed_at": row["completed_at"]
+            })
+        return tasks
+
+
+def fresh_db():
+    """Each scenario gets its own file so table growth doesn't skew the comparison"""
+    database._pool.close_all()
+    database.DB_NAME = os.path.join(tempfile.mkdtemp(), "bench.db")
+    database.init_db()
+
+
+def timed(label, fn, repeat, reset_db=True):
+    if reset_db:
+        fresh_db()
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {label:<28} {elapsed:9.1f} ms total  {elapsed * 1000 / repeat:9.1f} us/op")
+    return elapsed
+
+
+def main():
+    plan = generate_weekly_plan(make_subjects(8), daily_hours=8.0)
+    rows = len(database._build_task_rows(0, plan, "weekly"))
+    repeat = 200
+
+    print("\n" + "=" * 50)
+    print(f"Weekly plan, 8 subjects ({rows} task rows), {repeat} saves")
+    print("=" * 50)
+    old = timed("per-row execute", lambda i: save_plan_per_row(plan, "weekly", f"old_{i}"), repeat)
+    new = timed("executemany", lambda i: database.save_study_plan(plan, "weekly", f"new_{i}"), repeat)
+    print(f"  speedup: {old / new:.2f}x")
+
+    print("\n" + "=" * 50)
+    print(f"Nightly batch: {repeat} students in one transaction")
+    print("=" * 50)
+    batch = [{"student_id": f"bulk_{i}", "plan": plan, "plan_type": "weekly"} for i in range(repeat)]
+    fresh_db()
+    start = time.perf_counter()
+    database.save_study_plans_bulk(batch)
+    bulk = (time.perf_counter() - start) * 1000
+    print(f"  {'save_study_plans_bulk':<28} {bulk:9.1f} ms total  {bulk * 1000 / repeat:9.1f} us/op")
+    print(f"  speedup vs per-row: {old / bulk:.2f}x")
+
+    print("\n" + "=" * 50)
+    print("Topic decoding (one task's topics, 100k decodes)")
+    print("=" * 50)
+    topics = [f"Chapter {t}: Topic name" for t in range(6)]
+    as_repr, as_json = str(topics), json.dumps(topics)
+    old = timed("ast.literal_eval", lambda i: ast.literal_eval(as_repr), 100000, reset_db=False)
+    new = timed("json.loads", lambda i: json.loads(as_json), 100000, reset_db=False)
+    print(f"  speedup: {old / new:.2f}x")
+
+    print("\n" + "=" * 50)
+    print("/api/plan/today read path (14 slots x 50 subjects), 500 reads")
+    print("=" * 50)
+    slots = [{"start": f"{h:02d}:00", "end": f"{h + 1:02d}:00", "label": f"Slot {h}"} for h in range(6, 20)]
+    daily = generate_daily_plan(make_subjects(50), daily_hours=14.0, free_time_slots=slots)
+    fresh_db()
+    database.save_study_plan(daily, "daily", "old")
+    with database.pooled_connection() as conn:
+        rows = conn.execute("SELECT id, topics FROM study_tasks").fetchall()
+        conn.executemany("UPDATE study_tasks SET topics=? WHERE id=?",
+                         [(str(json.loads(r["topics"])), r["id"]) for r in rows])
+        conn.commit()
+    database.save_study_plan(daily, "daily", "new")
+    print(f"  ({len(database.get_today_plan('new'))} tasks per read)")
+    old = timed("str(list) + literal_eval", lambda i: get_today_plan_literal_eval("old"), 500, reset_db=False)
+    new = timed("JSON + json.loads", lambda i: database.get_today_plan("new"), 500, reset_db=False)
+    print(f"  speedup: {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark for the LLM HTTP client
+Compares a bare requests.post per call (new TCP connection each time) with
+the pooled keep-alive LLMClient, against the local stub server
+Run with: python bench_llm_client.py
+"""
+import time
+
+import requests
+
+from llm_client import LLMClient
+from llm_stub_server import StubLLMServer
+
+PAYLOAD = {"messages": [{"role": "user", "content": "Explain this study plan"}]}
+
+
+def timed(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {label:<28} {elapsed:9.1f} ms total  {elapsed * 1000 / repeat:9.1f} us/call")
+    return elapsed
+
+
+def main(repeat=500):
+    with StubLLMServer() as stub:
+        url = f"{stub.url}/chat/completions"
+        client = LLMClient()
+
+        print("\n" + "=" * 50)
+        print(f"{repeat} sequential calls to a local stub (plain HTTP, no TLS)")
+        print("=" * 50)
+        old = timed("requests.post", lambda: requests.post(url, json=PAYLOAD, timeout=30).json(), repeat)
+        connections = stub.connections
+        new = timed("LLMClient (keep-alive)", lambda: client.post_json(url, PAYLOAD), repeat)
+        print(f"  connections opened: {connections} vs {stub.connections - connections}")
+        print(f"  speedup: {old / new:.2f}x (a remote HTTPS endpoint also saves DNS + TLS per call)")
+
+
+if __name__ == "__main__":
+    main()
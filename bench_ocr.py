@@ -0,0 +1,75 @@
+"""
+Benchmark for syllabus OCR
+Preprocessing (open, downscale, grayscale, binarize, tile) of generated
+phone-camera-sized page images, and OCR images/sec before (one full-size
+image at a time, as _read_image used to) and after (preprocessed strips
+on the OCR pool). The OCR part needs the tesseract binary.
+Run with: python bench_ocr.py
+"""
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw
+
+import ocr_service
+
+LINES = [f"Unit {i % 7 + 1}: Topic {i + 1} - definitions, derivations and revision questions" for i in range(60)]
+
+
+def make_page_photo(width=3000, height=4000) -> bytes:
+    """A photographed A4 page: off-white background, dark gray text, JPEG"""
+    image = Image.new("RGB", (width, height), (225, 222, 210))
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(LINES):
+        draw.text((150, 150 + i * 62), line, fill=(50, 50, 60), font_size=40)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def old_ocr(data: bytes, tesseract_cmd: str) -> str:
+    """_read_image before the OCR pool: full-size image, no preprocessing"""
+    import pytesseract
+
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    return pytesseract.image_to_string(Image.open(io.BytesIO(data)))
+
+
+def rate(label, fn, count):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {count / elapsed:7.2f} images/s  ({elapsed * 1000:8.1f} ms)")
+    return elapsed, result
+
+
+def main(count=8):
+    images = [make_page_photo() for _ in range(count)]
+    workers = ocr_service.OCR_WORKERS
+    print("\n" + "=" * 50)
+    print(f"{count} page photos (3000x4000 JPEG), {workers} worker(s)")
+    print("=" * 50)
+
+    def full_decode():
+        return [Image.open(io.BytesIO(data)).convert("L") for data in images]
+
+    decode, _ = rate("decode full size (old)", full_decode, count)
+    prepare, tiles = rate("preprocess + tile", lambda: [ocr_service.prepare_image(data) for data in images], count)
+    print(f"  strips per image: {len(tiles[0])}, size {tiles[0][0].size}")
+
+    tesseract_cmd = ocr_service.find_tesseract()
+    if tesseract_cmd is None:
+        print("  tesseract not found: OCR timings skipped (set TESSERACT_CMD)")
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(abs, range(workers)))  # Start the workers up front
+        old, _ = rate("serial full-size OCR (old)", lambda: [old_ocr(data, tesseract_cmd) for data in images], count)
+        new, _ = rate("OCR pool + preprocessing", lambda: ocr_service.ocr_images(images, pool), count)
+    print(f"  speedup: {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
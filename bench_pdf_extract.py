@@ -0,0 +1,103 @@
+"""
+Benchmark for PDF text extraction
+Compares the old serial `text +=` reader with the page-parallel extractor
+(process pool) and early stop at the LLM prompt limit, on synthetic
+1/50/500-page PDFs
+Run with: python bench_pdf_extract.py
+"""
+import os
+import tempfile
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pypdf
+
+import file_service
+from ai_service import SYLLABUS_PROMPT_CHARS
+
+LINES_PER_PAGE = 40
+
+
+def make_text_pdf(path: str, pages: int, lines_per_page: int = LINES_PER_PAGE):
+    """Write a minimal PDF whose pages hold `lines_per_page` lines of Helvetica text"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for p in range(pages):
+        lines = [f"Page {p + 1} line {i + 1}: Unit {i % 7 + 1} topics and revision notes" for i in range(lines_per_page)]
+        text = " T* ".join(f"({line}) Tj" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td {text} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def old_read_pdf(file_path: str) -> str:
+    """_read_pdf before page-parallel extraction"""
+    text = ""
+    reader = pypdf.PdfReader(file_path)
+    for page in reader.pages:
+        text += page.extract_text() + "\n"
+    return text
+
+
+def timed(label, fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<30} {best * 1000:9.1f} ms  ({len(result):,} chars)")
+    return best, result
+
+
+def main(page_counts=(1, 50, 500)):
+    workers = file_service.PDF_WORKERS
+    directory = tempfile.mkdtemp()
+    with ProcessPoolExecutor(max_workers=max(workers, 1), mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(abs, range(workers)))  # Start the workers up front
+
+        for pages in page_counts:
+            path = os.path.join(directory, f"syllabus_{pages}.pdf")
+            make_text_pdf(path, pages)
+            print("\n" + "=" * 50)
+            print(f"{pages}-page PDF ({os.path.getsize(path) / 1024:.0f} KB), {workers} worker(s), {os.cpu_count()} CPU(s)")
+            print("=" * 50)
+            old, old_text = timed("serial text += (old)", lambda: old_read_pdf(path))
+            serial, _ = timed("serial join", lambda: _serial(path))
+            parallel, text = timed("page-parallel", lambda: file_service.read_pdf_parallel(path, pool, workers=workers))
+            assert text == old_text, "page order or content changed"
+            early, _ = timed(f"early stop ({SYLLABUS_PROMPT_CHARS} chars)",
+                             lambda: file_service.read_pdf_parallel(path, pool, SYLLABUS_PROMPT_CHARS, workers=workers))
+            print(f"  speedup vs old: serial join {old / serial:.2f}x, parallel {old / parallel:.2f}x, "
+                  f"early stop {old / early:.2f}x")
+
+
+def _serial(path: str) -> str:
+    saved = file_service.PDF_PARALLEL_MIN_PAGES
+    file_service.PDF_PARALLEL_MIN_PAGES = float("inf")
+    try:
+        return file_service._read_pdf(path)
+    finally:
+        file_service.PDF_PARALLEL_MIN_PAGES = saved
+
+
+if __name__ == "__main__":
+    main()
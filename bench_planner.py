@@ -0,0 +1,109 @@
+"""
+Benchmark for the planner
+Compares per-student allocate_time_slots with the vectorized batch engine,
+the integer-time scheduler with the old datetime-based one,
+and the incremental weekly/horizon engine with one generate_daily_plan per day
+Run with: python bench_planner.py
+"""
+import random
+import time
+
+from datetime import date, timedelta
+
+from planner import (allocate_time_slots, allocate_time_slots_batch, generate_daily_plan,
+                     generate_horizon_plan)
+from test_batch_planner import make_students
+from test_scheduler import legacy_generate_daily_plan
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) * 1000 / repeat
+    print(f"  {label:<32} {elapsed:9.1f} ms")
+    return elapsed, result
+
+
+def bench_batch_allocation(student_count=20000):
+    students = make_students(student_count)
+    batch = {"student_id": [], "name": [], "exam_date": [], "difficulty": [], "id": [], "topics": []}
+    for student_id, data in students.items():
+        for subject in data["subjects"]:
+            batch["student_id"].append(student_id)
+            batch["name"].append(subject["name"])
+            batch["exam_date"].append(subject["exam_date"])
+            batch["difficulty"].append(subject["difficulty"])
+            batch["id"].append(subject.get("id"))
+            batch["topics"].append(subject["topics"])
+    hours = {student_id: data["daily_hours"] for student_id, data in students.items()}
+
+    print("\n" + "=" * 50)
+    print(f"Allocation for {student_count} students ({len(batch['name'])} subjects)")
+    print("=" * 50)
+    old, _ = timed("allocate_time_slots per student",
+                   lambda: {s: allocate_time_slots(d["subjects"], d["daily_hours"]) for s, d in students.items()})
+    new, _ = timed("allocate_time_slots_batch", lambda: allocate_time_slots_batch(batch, hours))
+    print(f"  speedup: {old / new:.2f}x")
+
+
+def make_schedule_case(subject_count, slot_count):
+    subjects = [
+        {"name": f"Subject {i}", "exam_date": "2026-12-01",
+         "difficulty": ["easy", "medium", "hard"][i % 3], "topics": [f"Topic {i}"]}
+        for i in range(subject_count)
+    ]
+    # Back-to-back 50-minute slots from 05:00, enough room for most of the hours
+    slots = [{"start": f"{(300 + 50 * s) // 60:02d}:{(300 + 50 * s) % 60:02d}",
+              "end": f"{(350 + 50 * s) // 60:02d}:{(350 + 50 * s) % 60:02d}",
+              "label": f"Slot {s}"} for s in range(slot_count)]
+    return subjects, round(slot_count * 50 / 60, 2), slots
+
+
+def bench_scheduler(repeat=200):
+    print("\n" + "=" * 50)
+    print(f"generate_daily_plan, {repeat} plans per cell (ms per plan)")
+    print("=" * 50)
+    print(f"  {'subjects x slots':<18} {'datetime':>10} {'integer':>10} {'speedup':>8}")
+    for subject_count in (1, 5, 10, 25, 50):
+        for slot_count in (1, 5, 10, 20):
+            subjects, hours, slots = make_schedule_case(subject_count, slot_count)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                legacy_generate_daily_plan(subjects, hours, slots, "2024-12-01")
+            old = (time.perf_counter() - start) * 1000 / repeat
+            start = time.perf_counter()
+            for _ in range(repeat):
+                generate_daily_plan(subjects, hours, slots, "2024-12-01")
+            new = (time.perf_counter() - start) * 1000 / repeat
+            print(f"  {f'{subject_count} x {slot_count}':<18} {old:10.3f} {new:10.3f} {old / new:7.2f}x")
+
+
+def daily_plan_per_day(subjects, hours, slots, start, days):
+    """The previous multi-day path: a full generate_daily_plan call for every day"""
+    return [generate_daily_plan(subjects, hours, slots, (start + timedelta(days=d)).isoformat())
+            for d in range(days)]
+
+
+def bench_horizon(repeat=20):
+    print("\n" + "=" * 50)
+    print(f"Multi-day plans, 10 subjects x 10 slots, {repeat} plans (ms per plan)")
+    print("=" * 50)
+    subjects, hours, slots = make_schedule_case(10, 10)
+    start = date(2026, 10, 1)
+    for days in (7, 30, 90):
+        old, _ = timed(f"{days} x generate_daily_plan",
+                       lambda: daily_plan_per_day(subjects, hours, slots, start, days), repeat)
+        new, _ = timed(f"generate_horizon_plan({days})",
+                       lambda: generate_horizon_plan(subjects, hours, slots, start.isoformat(), days), repeat)
+        print(f"  speedup: {old / new:.2f}x")
+
+
+def main():
+    bench_batch_allocation()
+    bench_scheduler()
+    bench_horizon()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,511 +1,1358 @@
-"""
-Database module for Study Saathi
-Handles SQLite database operations for study plans, tasks, and streaks
-"""
-import sqlite3
-from datetime import date, datetime, timedelta
-from typing import List, Dict, Any, Optional
-
-DB_NAME = "study_saathi.db"
-
-
-def get_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
-    return conn
-
-
-def init_db():
-    """Initialize database with required tables"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # Study Plans Table - stores generated study plans
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS study_plans (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id TEXT DEFAULT 'default',
-            plan_date TEXT NOT NULL,
-            plan_type TEXT NOT NULL,  -- 'daily' or 'weekly'
-            total_hours REAL,
-            subjects_count INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(student_id, plan_date, plan_type)
-        )
-    """)
-
-    # Study Tasks Table - individual tasks from plans
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS study_tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            plan_id INTEGER,
-            subject TEXT NOT NULL,
-            subject_id TEXT,
-            study_hours REAL NOT NULL,
-            start_time TEXT,
-            end_time TEXT,
-            time_slot TEXT,
-            difficulty TEXT,
-            topics TEXT,  -- JSON string of topics array
-            completed INTEGER DEFAULT 0,
-            completed_at TIMESTAMP,
-            FOREIGN KEY (plan_id) REFERENCES study_plans(id) ON DELETE CASCADE
-        )
-    """)
-
-    # Streak Table - tracks study streaks
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS streaks (
-            student_id TEXT PRIMARY KEY DEFAULT 'default',
-            current_streak INTEGER DEFAULT 0,
-            longest_streak INTEGER DEFAULT 0,
-            last_study_date TEXT,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-
-    # Daily Progress Table - tracks daily completion
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS daily_progress (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id TEXT DEFAULT 'default',
-            progress_date TEXT NOT NULL,
-            total_tasks INTEGER DEFAULT 0,
-            completed_tasks INTEGER DEFAULT 0,
-            total_hours REAL DEFAULT 0,
-            completed_hours REAL DEFAULT 0,
-            UNIQUE(student_id, progress_date)
-        )
-    """)
-
-    # Students Table - stores simple profiles
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS students (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    conn.commit()
-    conn.close()
-    print(f"[DATABASE] Initialized database: {DB_NAME}")
-
-
-def save_study_plan(plan_data: Dict[str, Any], plan_type: str = "daily", student_id: str = "default") -> int:
-    """
-    Save a study plan to database
-    
-    Args:
-        plan_data: The plan data from generate_daily_plan or generate_weekly_plan
-        plan_type: 'daily' or 'weekly'
-        student_id: Student identifier (default: 'default')
-    
-    Returns:
-        plan_id: The ID of the saved plan
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    plan_date = plan_data.get("date") or plan_data.get("week_start", str(date.today()))
-    total_hours = plan_data.get("total_study_hours", 0)
-    subjects_count = plan_data.get("summary", {}).get("subjects_count", 0)
-
-    # Insert or update study plan
-    cursor.execute("""
-        INSERT OR REPLACE INTO study_plans 
-        (student_id, plan_date, plan_type, total_hours, subjects_count)
-        VALUES (?, ?, ?, ?, ?)
-    """, (student_id, plan_date, plan_type, total_hours, subjects_count))
-
-    plan_id = cursor.lastrowid
-
-    # For daily plans, save tasks from schedule
-    if plan_type == "daily" and "schedule" in plan_data:
-        # Delete old tasks for this plan
-        cursor.execute("DELETE FROM study_tasks WHERE plan_id=?", (plan_id,))
-        
-        for slot in plan_data["schedule"]:
-            for activity in slot.get("activities", []):
-                topics_json = str(activity.get("topics", []))
-                cursor.execute("""
-                    INSERT INTO study_tasks 
-                    (plan_id, subject, subject_id, study_hours, start_time, end_time, 
-                     time_slot, difficulty, topics)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    plan_id,
-                    activity.get("subject"),
-                    activity.get("subject_id"),
-                    activity.get("duration_hours", 0),
-                    activity.get("start_time"),
-                    activity.get("end_time"),
-                    slot.get("time_slot"),
-                    activity.get("difficulty"),
-                    topics_json
-                ))
-
-    # For weekly plans, save tasks from each day
-    elif plan_type == "weekly" and "days" in plan_data:
-        cursor.execute("DELETE FROM study_tasks WHERE plan_id=?", (plan_id,))
-        
-        for day_plan in plan_data["days"]:
-            day_date = day_plan.get("date")
-            for slot in day_plan.get("schedule", []):
-                for activity in slot.get("activities", []):
-                    topics_json = str(activity.get("topics", []))
-                    cursor.execute("""
-                        INSERT INTO study_tasks 
-                        (plan_id, subject, subject_id, study_hours, start_time, end_time, 
-                         time_slot, difficulty, topics)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        plan_id,
-                        activity.get("subject"),
-                        activity.get("subject_id"),
-                        activity.get("duration_hours", 0),
-                        activity.get("start_time"),
-                        activity.get("end_time"),
-                        slot.get("time_slot"),
-                        activity.get("difficulty"),
-                        topics_json
-                    ))
-
-    conn.commit()
-    conn.close()
-    return plan_id
-
-
-def get_today_plan(student_id: str = "default") -> List[Dict[str, Any]]:
-    """
-    Get today's study plan from database
-    
-    Returns:
-        List of tasks for today
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    today = str(date.today())
-
-    # Get today's plan
-    cursor.execute("""
-        SELECT id FROM study_plans 
-        WHERE student_id=? AND plan_date=? AND plan_type='daily'
-        ORDER BY created_at DESC LIMIT 1
-    """, (student_id, today))
-
-    plan_row = cursor.fetchone()
-
-    if not plan_row:
-        conn.close()
-        return []
-
-    plan_id = plan_row["id"]
-
-    # Get all tasks for this plan
-    cursor.execute("""
-        SELECT id, subject, subject_id, study_hours, start_time, end_time,
-               time_slot, difficulty, topics, completed, completed_at
-        FROM study_tasks
-        WHERE plan_id=?
-        ORDER BY start_time ASC
-    """, (plan_id,))
-
-    tasks = []
-    for row in cursor.fetchall():
-        # Parse topics from string
-        topics = []
-        if row["topics"]:
-            try:
-                import ast
-                topics = ast.literal_eval(row["topics"])
-            except:
-                topics = []
-
-        tasks.append({
-            "task_id": row["id"],
-            "subject": row["subject"],
-            "subject_id": row["subject_id"],
-            "study_hours": row["study_hours"],
-            "start_time": row["start_time"],
-            "end_time": row["end_time"],
-            "time_slot": row["time_slot"],
-            "difficulty": row["difficulty"],
-            "topics": topics,
-            "completed": bool(row["completed"]),
-            "completed_at": row["completed_at"]
-        })
-
-    conn.close()
-    return tasks
-
-
-def complete_task(task_id: int, student_id: str = "default") -> bool:
-    """
-    Mark a task as completed
-    
-    Returns:
-        True if task was found and updated
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # Check if task exists
-    cursor.execute("SELECT id, completed FROM study_tasks WHERE id=?", (task_id,))
-    task = cursor.fetchone()
-
-    if not task:
-        conn.close()
-        return False
-
-    # Update task
-    cursor.execute("""
-        UPDATE study_tasks 
-        SET completed=1, completed_at=CURRENT_TIMESTAMP
-        WHERE id=?
-    """, (task_id,))
-
-    # Update daily progress
-    today = str(date.today())
-    cursor.execute("""
-        INSERT OR IGNORE INTO daily_progress 
-        (student_id, progress_date, total_tasks, completed_tasks, total_hours, completed_hours)
-        SELECT 
-            ?,
-            ?,
-            COUNT(*),
-            0,
-            SUM(study_hours),
-            0
-        FROM study_tasks
-        WHERE plan_id IN (
-            SELECT id FROM study_plans 
-            WHERE student_id=? AND plan_date=? AND plan_type='daily'
-        )
-    """, (student_id, today, student_id, today))
-
-    # Update completed tasks and hours
-    cursor.execute("""
-        UPDATE daily_progress
-        SET 
-            completed_tasks = (
-                SELECT COUNT(*) FROM study_tasks
-                WHERE plan_id IN (
-                    SELECT id FROM study_plans 
-                    WHERE student_id=? AND plan_date=? AND plan_type='daily'
-                ) AND completed=1
-            ),
-            completed_hours = (
-                SELECT COALESCE(SUM(study_hours), 0) FROM study_tasks
-                WHERE plan_id IN (
-                    SELECT id FROM study_plans 
-                    WHERE student_id=? AND plan_date=? AND plan_type='daily'
-                ) AND completed=1
-            )
-        WHERE student_id=? AND progress_date=?
-    """, (student_id, today, student_id, today, student_id, today))
-
-    conn.commit()
-    conn.close()
-
-    # Update streak after task completion
-    update_streak(student_id)
-
-    return True
-
-
-def update_streak(student_id: str = "default"):
-    """
-    Update study streak based on today's progress
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    today = str(date.today())
-
-    # Get current streak
-    cursor.execute("""
-        SELECT current_streak, longest_streak, last_study_date 
-        FROM streaks 
-        WHERE student_id=?
-    """, (student_id,))
-
-    row = cursor.fetchone()
-
-    # Check if there's progress today
-    cursor.execute("""
-        SELECT completed_tasks FROM daily_progress
-        WHERE student_id=? AND progress_date=?
-    """, (student_id, today))
-
-    progress = cursor.fetchone()
-    has_progress = progress and progress["completed_tasks"] > 0
-
-    if not row:
-        # First time - create streak
-        if has_progress:
-            cursor.execute("""
-                INSERT INTO streaks (student_id, current_streak, longest_streak, last_study_date)
-                VALUES (?, 1, 1, ?)
-            """, (student_id, today))
-    else:
-        last_study_date = row["last_study_date"]
-        current_streak = row["current_streak"]
-        longest_streak = row["longest_streak"]
-
-        if has_progress:
-            if last_study_date == today:
-                # Already updated today, don't increment
-                pass
-            elif last_study_date == str(date.today() - timedelta(days=1)):
-                # Consecutive day - increment streak
-                new_streak = current_streak + 1
-                new_longest = max(new_streak, longest_streak)
-                cursor.execute("""
-                    UPDATE streaks 
-                    SET current_streak=?, longest_streak=?, last_study_date=?, updated_at=CURRENT_TIMESTAMP
-                    WHERE student_id=?
-                """, (new_streak, new_longest, today, student_id))
-            else:
-                # Streak broken - reset to 1
-                cursor.execute("""
-                    UPDATE streaks 
-                    SET current_streak=1, last_study_date=?, updated_at=CURRENT_TIMESTAMP
-                    WHERE student_id=?
-                """, (today, student_id))
-        # If no progress today, don't update (streak continues until broken)
-
-    conn.commit()
-    conn.close()
-
-
-def get_streak(student_id: str = "default") -> Dict[str, Any]:
-    """
-    Get current streak information
-    
-    Returns:
-        Dictionary with streak data
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT current_streak, longest_streak, last_study_date
-        FROM streaks
-        WHERE student_id=?
-    """, (student_id,))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row:
-        return {
-            "current_streak": 0,
-            "longest_streak": 0,
-            "last_study_date": None
-        }
-
-    return {
-        "current_streak": row["current_streak"],
-        "longest_streak": row["longest_streak"],
-        "last_study_date": row["last_study_date"]
-    }
-
-
-def get_daily_progress(student_id: str = "default", progress_date: str = None) -> Dict[str, Any]:
-    """
-    Get daily progress statistics
-    
-    Args:
-        student_id: Student identifier
-        progress_date: Date in YYYY-MM-DD format (default: today)
-    
-    Returns:
-        Progress statistics
-    """
-    if progress_date is None:
-        progress_date = str(date.today())
-
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT total_tasks, completed_tasks, total_hours, completed_hours
-        FROM daily_progress
-        WHERE student_id=? AND progress_date=?
-    """, (student_id, progress_date))
-
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row:
-        return {
-            "date": progress_date,
-            "total_tasks": 0,
-            "completed_tasks": 0,
-            "total_hours": 0.0,
-            "completed_hours": 0.0,
-            "completion_percentage": 0.0
-        }
-
-    total_tasks = row["total_tasks"] or 0
-    completed_tasks = row["completed_tasks"] or 0
-    total_hours = row["total_hours"] or 0.0
-    completed_hours = row["completed_hours"] or 0.0
-
-    completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
-
-
-    return {
-        "date": progress_date,
-        "total_tasks": total_tasks,
-        "completed_tasks": completed_tasks,
-        "total_hours": round(total_hours, 2),
-        "completed_hours": round(completed_hours, 2),
-        "completion_percentage": round(completion_percentage, 2)
-    }
-
-
-def create_student(student_id: str, name: str) -> bool:
-    """
-    Create or update a student profile
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("""
-            INSERT OR REPLACE INTO students (id, name)
-            VALUES (?, ?)
-        """, (student_id, name))
-        conn.commit()
-        return True
-    except Exception as e:
-        print(f"Error creating student: {e}")
-        return False
-    finally:
-        conn.close()
-
-
-def get_student(student_id: str) -> Optional[Dict[str, Any]]:
-    """
-    Get student profile
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT id, name, created_at FROM students WHERE id=?", (student_id,))
-    row = cursor.fetchone()
-    conn.close()
-    
-    if not row:
-        return None
-        
-    return {
-        "id": row["id"],
-        "name": row["name"],
-        "created_at": row["created_at"]
-    }
+"""
+Database module for Study Saathi
+Handles SQLite database operations for study plans, tasks, and streaks
+"""
+import ast
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from student_cache import get_student_cache, invalidate_student
+
+DB_NAME = "study_saathi.db"
+
+# Connection pool configuration
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))  # seconds to wait for a free connection
+
+# Applied to every new connection. WAL lets readers proceed while a writer
+# holds the lock; synchronous=NORMAL is durable enough under WAL.
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",      # ~16 MB page cache per connection
+    "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def get_connection():
+    """Get a new, unpooled database connection"""
+    conn = sqlite3.connect(DB_NAME, timeout=DB_POOL_TIMEOUT, check_same_thread=False)
+    conn.row_factory = sqlite3.Row  # Enable column access by name
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """
+    Small fixed-size pool of SQLite connections.
+
+    Connections are handed out per thread: nested acquires from the same
+    thread (e.g. complete_task -> update_streak) reuse the connection the
+    thread already holds. The pool is reset after a fork so gunicorn
+    workers never share a connection with their parent.
+    """
+
+    def __init__(self, size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT):
+        self.size = max(size, 1)
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._db_name = DB_NAME
+        self._idle: List[sqlite3.Connection] = []
+        self._created = 0
+        self._local = threading.local()
+        self._stats = {
+            "acquired": 0,
+            "reused": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, waiting up to `timeout` seconds if all are busy"""
+        with self._cond:
+            if self._pid != os.getpid() or self._db_name != DB_NAME:
+                self._close_idle()
+                self._reset()
+
+            held = getattr(self._local, "conn", None)
+            if held is not None:
+                self._local.depth += 1
+                self._stats["reused"] += 1
+                return held
+
+            started = time.perf_counter()
+            waited = False
+            while not self._idle and self._created >= self.size:
+                waited = True
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise TimeoutError(
+                        f"No database connection available after {self.timeout}s "
+                        f"(pool size {self.size})"
+                    )
+                self._cond.wait(remaining)
+
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = None
+                self._created += 1
+
+            wait_ms = (time.perf_counter() - started) * 1000
+            self._stats["acquired"] += 1
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["total_wait_ms"] += wait_ms
+                self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+
+        if conn is None:
+            try:
+                conn = get_connection()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool (outermost release only)"""
+        if getattr(self._local, "conn", None) is conn:
+            self._local.depth -= 1
+            if self._local.depth > 0:
+                return
+            self._local.conn = None
+
+        # Never hand out a connection with a half-finished transaction
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._cond:
+            if self._pid != os.getpid() or self._db_name != DB_NAME:
+                conn.close()
+                return
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def _close_idle(self):
+        for conn in self._idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._idle = []
+
+    def close_all(self):
+        """Close idle connections and start from an empty pool"""
+        with self._cond:
+            self._close_idle()
+            self._reset()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and wait-time metrics"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["pool_size"] = self.size
+            stats["open_connections"] = self._created
+            stats["idle_connections"] = len(self._idle)
+            stats["in_use"] = self._created - len(self._idle)
+            stats["avg_wait_ms"] = round(stats["total_wait_ms"] / stats["waits"], 3) if stats["waits"] else 0.0
+            stats["total_wait_ms"] = round(stats["total_wait_ms"], 3)
+            stats["max_wait_ms"] = round(stats["max_wait_ms"], 3)
+        return stats
+
+
+_pool = ConnectionPool()
+
+
+@contextmanager
+def pooled_connection():
+    """Borrow a connection from the pool for the duration of a `with` block"""
+    conn = _pool.acquire()
+    try:
+        yield conn
+    finally:
+        _pool.release(conn)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Expose connection pool metrics (used by the health endpoint)"""
+    return _pool.stats()
+
+
+# Secondary indexes for the hot read/write paths (see HOT_QUERIES below).
+# study_plans lookups are already served by its UNIQUE(student_id, plan_date, plan_type) index.
+# CREATE INDEX IF NOT EXISTS makes this an idempotent migration on existing databases.
+INDEXES = (
+    # get_today_plan: tasks of one plan in start_time order
+    """CREATE INDEX IF NOT EXISTS idx_study_tasks_plan_start
+       ON study_tasks(plan_id, start_time)""",
+    # complete_task progress counters: covering index for COUNT/SUM by completion state
+    """CREATE INDEX IF NOT EXISTS idx_study_tasks_plan_completed
+       ON study_tasks(plan_id, completed, study_hours)""",
+    # job_queue dispatcher: oldest queued jobs first, stale running jobs
+    """CREATE INDEX IF NOT EXISTS idx_jobs_status_updated
+       ON jobs(status, updated_at)""",
+    # analytics compaction: daily plans of a date range
+    """CREATE INDEX IF NOT EXISTS idx_study_plans_type_date
+       ON study_plans(plan_type, plan_date)""",
+)
+
+
+# Bumped whenever a one-off data migration is added to _run_migrations.
+# Stored in SQLite's PRAGMA user_version.
+SCHEMA_VERSION = 5
+
+
+def _migrate_topics_to_json(cursor: sqlite3.Cursor) -> int:
+    """Rewrite topics saved as Python str(list) into JSON. Returns rows converted."""
+    cursor.execute("SELECT id, topics FROM study_tasks WHERE topics IS NOT NULL AND topics != ''")
+    updates = []
+    for task_id, topics in cursor.fetchall():
+        try:
+            json.loads(topics)
+            continue
+        except ValueError:
+            pass
+        try:
+            value = ast.literal_eval(topics)
+        except (ValueError, SyntaxError):
+            value = []
+        updates.append((json.dumps(value if isinstance(value, list) else []), task_id))
+
+    cursor.executemany("UPDATE study_tasks SET topics=? WHERE id=?", updates)
+    return len(updates)
+
+
+def _add_plan_hash_column(cursor: sqlite3.Cursor):
+    """Databases created before plan caching lack study_plans.plan_hash"""
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(study_plans)")]
+    if "plan_hash" not in columns:
+        cursor.execute("ALTER TABLE study_plans ADD COLUMN plan_hash TEXT")
+
+
+def _add_job_input_column(cursor: sqlite3.Cursor):
+    """jobs tables created before in-memory uploads lack jobs.input_data"""
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(jobs)")]
+    if "input_data" not in columns:
+        cursor.execute("ALTER TABLE jobs ADD COLUMN input_data BLOB")
+
+
+def _clock_minutes(clock: Optional[str]) -> Optional[int]:
+    """'HH:MM' -> minutes since midnight (None if unreadable)"""
+    try:
+        hours, minutes = clock.split(":")
+        return int(hours) * 60 + int(minutes)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _backfill_task_hours(cursor: sqlite3.Cursor) -> int:
+    """
+    Tasks saved before study_hours was read from the planner's
+    duration_minutes were stored with 0 hours. Recover them from the
+    start/end times and recount the daily_progress hours. Returns rows fixed.
+    """
+    cursor.execute("""
+        SELECT id, start_time, end_time FROM study_tasks
+        WHERE study_hours = 0 AND COALESCE(subject_id, '') != 'break'
+    """)
+    updates = []
+    for task_id, start_time, end_time in cursor.fetchall():
+        start, end = _clock_minutes(start_time), _clock_minutes(end_time)
+        if start is not None and end is not None:
+            updates.append((round((end - start) % (24 * 60) / 60, 2), task_id))
+    cursor.executemany("UPDATE study_tasks SET study_hours=? WHERE id=?", updates)
+
+    if updates:
+        cursor.execute("""
+            UPDATE daily_progress SET
+                total_hours = COALESCE((
+                    SELECT SUM(t.study_hours) FROM study_plans p JOIN study_tasks t ON t.plan_id = p.id
+                    WHERE p.student_id = daily_progress.student_id
+                      AND p.plan_date = daily_progress.progress_date AND p.plan_type = 'daily'
+                ), total_hours),
+                completed_hours = COALESCE((
+                    SELECT SUM(t.study_hours) FROM study_plans p JOIN study_tasks t ON t.plan_id = p.id
+                    WHERE p.student_id = daily_progress.student_id
+                      AND p.plan_date = daily_progress.progress_date AND p.plan_type = 'daily'
+                      AND t.completed = 1
+                ), completed_hours)
+        """)
+    return len(updates)
+
+
+def _rebuild_subject_stats(cursor: sqlite3.Cursor) -> int:
+    """
+    Count every daily plan task into subject_stats. Runs once, for plans
+    saved before the table was kept up to date on each write.
+    """
+    cursor.execute("DELETE FROM subject_stats")
+    cursor.execute("""
+        INSERT INTO subject_stats
+        (student_id, subject_id, subject, planned_tasks, completed_tasks, planned_minutes, completed_minutes)
+        SELECT p.student_id, t.subject_id, MAX(t.subject), COUNT(*), SUM(t.completed),
+               SUM(t.study_hours) * 60, SUM(CASE WHEN t.completed=1 THEN t.study_hours ELSE 0 END) * 60
+        FROM study_plans p JOIN study_tasks t ON t.plan_id = p.id
+        WHERE p.plan_type='daily' AND t.subject_id IS NOT NULL AND t.subject_id != 'break'
+        GROUP BY p.student_id, t.subject_id
+    """)
+    return cursor.rowcount
+
+
+def _run_migrations(cursor: sqlite3.Cursor):
+    """Apply data migrations newer than the database's user_version"""
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    if version < 1:
+        converted = _migrate_topics_to_json(cursor)
+        print(f"[DATABASE] Migrated {converted} task topics to JSON")
+
+    if version < 2:
+        _add_plan_hash_column(cursor)
+
+    if version < 3:
+        _add_job_input_column(cursor)
+
+    if version < 4:
+        fixed = _backfill_task_hours(cursor)
+        print(f"[DATABASE] Backfilled study hours for {fixed} tasks")
+
+    if version < 5:
+        counted = _rebuild_subject_stats(cursor)
+        print(f"[DATABASE] Built subject stats for {counted} student subjects")
+
+    if version < SCHEMA_VERSION:
+        cursor.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+
+def init_db():
+    """Initialize database with required tables"""
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+
+        # Study Plans Table - stores generated study plans
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS study_plans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                student_id TEXT DEFAULT 'default',
+                plan_date TEXT NOT NULL,
+                plan_type TEXT NOT NULL,  -- 'daily' or 'weekly'
+                total_hours REAL,
+                subjects_count INTEGER,
+                plan_hash TEXT,  -- content hash from plan_cache, to skip unchanged rewrites
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(student_id, plan_date, plan_type)
+            )
+        """)
+
+        # Study Tasks Table - individual tasks from plans
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS study_tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                plan_id INTEGER,
+                subject TEXT NOT NULL,
+                subject_id TEXT,
+                study_hours REAL NOT NULL,
+                start_time TEXT,
+                end_time TEXT,
+                time_slot TEXT,
+                difficulty TEXT,
+                topics TEXT,  -- JSON string of topics array
+                completed INTEGER DEFAULT 0,
+                completed_at TIMESTAMP,
+                FOREIGN KEY (plan_id) REFERENCES study_plans(id) ON DELETE CASCADE
+            )
+        """)
+
+        # Streak Table - tracks study streaks
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS streaks (
+                student_id TEXT PRIMARY KEY DEFAULT 'default',
+                current_streak INTEGER DEFAULT 0,
+                longest_streak INTEGER DEFAULT 0,
+                last_study_date TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+
+        # Daily Progress Table - tracks daily completion
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_progress (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                student_id TEXT DEFAULT 'default',
+                progress_date TEXT NOT NULL,
+                total_tasks INTEGER DEFAULT 0,
+                completed_tasks INTEGER DEFAULT 0,
+                total_hours REAL DEFAULT 0,
+                completed_hours REAL DEFAULT 0,
+                UNIQUE(student_id, progress_date)
+            )
+        """)
+
+        # Students Table - stores simple profiles
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS students (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Student Versions Table - bumped by every write for a student; the
+        # HTTP layer builds ETags from it (see app.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS student_versions (
+                student_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        # Task Rollups Table - completed days of study_tasks compacted per
+        # student, day, subject and difficulty (see analytics.py). Rows are
+        # stored in key order, so one student's date range is one range read.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_rollups (
+                student_id TEXT NOT NULL,
+                day TEXT NOT NULL,  -- YYYY-MM-DD
+                subject TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                planned_tasks INTEGER NOT NULL,
+                completed_tasks INTEGER NOT NULL,
+                planned_hours REAL NOT NULL,
+                completed_hours REAL NOT NULL,
+                PRIMARY KEY (student_id, day, subject, difficulty)
+            ) WITHOUT ROWID
+        """)
+
+        # Subject Stats Table - running per-student, per-subject totals over all
+        # daily plan tasks, kept up to date on every plan save and task
+        # completion. The adaptive planner reads one student's rows.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS subject_stats (
+                student_id TEXT NOT NULL,
+                subject_id TEXT NOT NULL,
+                subject TEXT,
+                planned_tasks INTEGER NOT NULL DEFAULT 0,
+                completed_tasks INTEGER NOT NULL DEFAULT 0,
+                planned_minutes REAL NOT NULL DEFAULT 0,
+                completed_minutes REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (student_id, subject_id)
+            ) WITHOUT ROWID
+        """)
+
+        # Analytics State Table - e.g. the last day compacted into task_rollups
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_state (
+                name TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+
+        # Jobs Table - background work (syllabus uploads), see job_queue.py
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                student_id TEXT DEFAULT 'default',
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',  -- queued, running, done, failed
+                stage TEXT,
+                progress INTEGER DEFAULT 0,  -- percent
+                input_path TEXT,
+                input_data BLOB,  -- small uploads are kept here instead of in a file
+                filename TEXT,
+                result TEXT,  -- JSON
+                error TEXT,
+                attempts INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        for index_sql in INDEXES:
+            cursor.execute(index_sql)
+
+        _run_migrations(cursor)
+
+        conn.commit()
+        get_student_cache().clear()  # Read models of whatever database was open before
+        print(f"[DATABASE] Initialized database: {DB_NAME}")
+
+
+BUMP_VERSION_SQL = """
+    INSERT INTO student_versions (student_id, version) VALUES (?, 1)
+    ON CONFLICT(student_id) DO UPDATE SET version = version + 1
+"""
+
+
+INSERT_TASK_SQL = """
+    INSERT INTO study_tasks
+    (plan_id, subject, subject_id, study_hours, start_time, end_time,
+     time_slot, difficulty, topics)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _build_task_rows(plan_id: int, plan_data: Dict[str, Any], plan_type: str) -> List[tuple]:
+    """
+    Flatten a plan into study_tasks row tuples in a single pass.
+    Daily plans use plan_data["schedule"]; weekly plans walk every day's schedule.
+    """
+    if plan_type == "daily":
+        schedules = [plan_data.get("schedule", [])]
+    elif plan_type == "weekly":
+        schedules = [day_plan.get("schedule", []) for day_plan in plan_data.get("days", [])]
+    else:
+        schedules = []
+
+    dumps = json.dumps
+    rows = []
+    for schedule in schedules:
+        for slot in schedule:
+            time_slot = slot.get("time_slot")
+            for activity in slot.get("activities", []):
+                # The planner gives session lengths in minutes; breaks aren't study time
+                hours = activity.get("duration_hours")
+                if hours is None:
+                    is_break = activity.get("type") == "break"
+                    hours = 0 if is_break else round(activity.get("duration_minutes", 0) / 60, 2)
+                rows.append((
+                    plan_id,
+                    activity.get("subject"),
+                    activity.get("subject_id"),
+                    hours,
+                    activity.get("start_time"),
+                    activity.get("end_time"),
+                    time_slot,
+                    activity.get("difficulty"),
+                    dumps(activity.get("topics", []))
+                ))
+    return rows
+
+
+PLAN_ID_SQL = """
+    SELECT id, plan_hash FROM study_plans
+    WHERE student_id=? AND plan_date=? AND plan_type=?
+"""
+
+DELETE_PLAN_TASKS_SQL = "DELETE FROM study_tasks WHERE plan_id=?"
+
+# subject_stats deltas for one daily plan's tasks (O(tasks in the plan)):
+# added when the plan is saved, taken off again when it is replaced
+_PLAN_SUBJECT_TOTALS = """
+    SELECT subject_id, MAX(subject) AS subject, COUNT(*) AS tasks, SUM(completed) AS completed,
+           SUM(study_hours) * 60 AS minutes,
+           SUM(CASE WHEN completed=1 THEN study_hours ELSE 0 END) * 60 AS completed_minutes
+    FROM study_tasks
+    WHERE plan_id=? AND subject_id IS NOT NULL AND subject_id != 'break'
+    GROUP BY subject_id
+"""
+
+ADD_SUBJECT_STATS_SQL = f"""
+    INSERT INTO subject_stats
+    (student_id, subject_id, subject, planned_tasks, completed_tasks, planned_minutes, completed_minutes)
+    SELECT ?, d.subject_id, d.subject, d.tasks, d.completed, d.minutes, d.completed_minutes
+    FROM ({_PLAN_SUBJECT_TOTALS}) AS d WHERE true
+    ON CONFLICT(student_id, subject_id) DO UPDATE SET
+        subject = excluded.subject,
+        planned_tasks = planned_tasks + excluded.planned_tasks,
+        completed_tasks = completed_tasks + excluded.completed_tasks,
+        planned_minutes = planned_minutes + excluded.planned_minutes,
+        completed_minutes = completed_minutes + excluded.completed_minutes
+"""
+
+REMOVE_SUBJECT_STATS_SQL = f"""
+    UPDATE subject_stats SET
+        planned_tasks = subject_stats.planned_tasks - d.tasks,
+        completed_tasks = subject_stats.completed_tasks - d.completed,
+        planned_minutes = MAX(subject_stats.planned_minutes - d.minutes, 0),
+        completed_minutes = MAX(subject_stats.completed_minutes - d.completed_minutes, 0)
+    FROM ({_PLAN_SUBJECT_TOTALS}) AS d
+    WHERE subject_stats.student_id = ? AND subject_stats.subject_id = d.subject_id
+"""
+
+COMPLETE_SUBJECT_STATS_SQL = """
+    UPDATE subject_stats SET
+        completed_tasks = completed_tasks + 1,
+        completed_minutes = completed_minutes + ? * 60
+    WHERE student_id = (SELECT student_id FROM study_plans WHERE id=? AND plan_type='daily')
+      AND subject_id = ?
+"""
+
+
+def _write_study_plan(cursor: sqlite3.Cursor, plan_data: Dict[str, Any],
+                      plan_type: str, student_id: str, plan_hash: Optional[str] = None) -> int:
+    """Write one plan and its tasks using an open cursor (caller commits)"""
+    plan_date = plan_data.get("date") or plan_data.get("week_start", str(date.today()))
+    total_hours = plan_data.get("total_study_hours", 0)
+    subjects_count = plan_data.get("summary", {}).get("subjects_count", 0)
+
+    has_tasks = (plan_type == "daily" and "schedule" in plan_data) or \
+                (plan_type == "weekly" and "days" in plan_data)
+
+    cursor.execute(PLAN_ID_SQL, (student_id, plan_date, plan_type))
+    old_plan = cursor.fetchone()
+
+    # Same content as the stored plan: keep its tasks (and their completion state)
+    if old_plan and plan_hash is not None and old_plan[1] == plan_hash:
+        return old_plan[0]
+
+    # INSERT OR REPLACE gives the plan a fresh id, so drop the tasks of the
+    # plan being replaced rather than leaving them orphaned
+    if has_tasks and old_plan:
+        if plan_type == "daily":
+            cursor.execute(REMOVE_SUBJECT_STATS_SQL, (old_plan[0], student_id))
+        cursor.execute(DELETE_PLAN_TASKS_SQL, (old_plan[0],))
+
+    # Insert or update study plan
+    cursor.execute("""
+        INSERT OR REPLACE INTO study_plans 
+        (student_id, plan_date, plan_type, total_hours, subjects_count, plan_hash)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (student_id, plan_date, plan_type, total_hours, subjects_count, plan_hash))
+
+    plan_id = cursor.lastrowid
+
+    if has_tasks:
+        cursor.executemany(INSERT_TASK_SQL, _build_task_rows(plan_id, plan_data, plan_type))
+
+    # Start the day's progress counters from the new plan; complete_task
+    # then only has to adjust them by one task at a time
+    if plan_type == "daily" and has_tasks:
+        cursor.execute(SEED_PROGRESS_SQL, (student_id, plan_date, plan_id))
+        cursor.execute(ADD_SUBJECT_STATS_SQL, (student_id, plan_id))
+
+    cursor.execute(BUMP_VERSION_SQL, (student_id,))
+    return plan_id
+
+
+def save_study_plan(plan_data: Dict[str, Any], plan_type: str = "daily", student_id: str = "default",
+                    plan_hash: Optional[str] = None) -> int:
+    """
+    Save a study plan to database
+    
+    Args:
+        plan_data: The plan data from generate_daily_plan or generate_weekly_plan
+        plan_type: 'daily' or 'weekly'
+        student_id: Student identifier (default: 'default')
+        plan_hash: Content hash from plan_cache. If the stored plan has the
+            same hash nothing is rewritten and its id is returned.
+    
+    Returns:
+        plan_id: The ID of the saved plan
+    """
+    with pooled_connection() as conn:
+        plan_id = _write_study_plan(conn.cursor(), plan_data, plan_type, student_id, plan_hash)
+        conn.commit()
+    invalidate_student(student_id)
+    return plan_id
+
+
+def save_study_plans_bulk(plans: List[Dict[str, Any]]) -> List[int]:
+    """
+    Save plans for many students in a single transaction (nightly regeneration)
+    
+    Args:
+        plans: List of {"student_id": ..., "plan": plan_data, "plan_type": 'daily' | 'weekly',
+               "plan_hash": optional, as in save_study_plan}
+    
+    Returns:
+        plan_ids in the same order as `plans`. Nothing is written if any plan fails.
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        plan_ids = []
+        try:
+            for item in plans:
+                plan_ids.append(_write_study_plan(
+                    cursor,
+                    item["plan"],
+                    item.get("plan_type", "daily"),
+                    item.get("student_id", "default"),
+                    item.get("plan_hash")
+                ))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    for student_id in {item.get("student_id", "default") for item in plans}:
+        invalidate_student(student_id)
+    return plan_ids
+
+
+TODAY_PLAN_SQL = """
+    SELECT id FROM study_plans 
+    WHERE student_id=? AND plan_date=? AND plan_type='daily'
+    ORDER BY created_at DESC LIMIT 1
+"""
+
+PLAN_TASKS_SQL = """
+    SELECT id, subject, subject_id, study_hours, start_time, end_time,
+           time_slot, difficulty, topics, completed, completed_at
+    FROM study_tasks
+    WHERE plan_id=?
+    ORDER BY start_time ASC
+"""
+
+
+def decode_topics(topics_json: Optional[str]) -> List[str]:
+    """Decode the JSON topics column ([] when empty or unreadable)"""
+    if not topics_json:
+        return []
+    try:
+        return json.loads(topics_json)
+    except ValueError:
+        return []
+
+
+def get_today_plan(student_id: str = "default") -> List[Dict[str, Any]]:
+    """
+    Get today's study plan from database
+    
+    Returns:
+        List of tasks for today
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+
+        today = str(date.today())
+
+        # Get today's plan
+        cursor.execute(TODAY_PLAN_SQL, (student_id, today))
+
+        plan_row = cursor.fetchone()
+
+        if not plan_row:
+            return []
+
+        plan_id = plan_row["id"]
+
+        # Get all tasks for this plan
+        cursor.execute(PLAN_TASKS_SQL, (plan_id,))
+
+        rows = cursor.fetchall()
+
+    tasks = []
+    for row in rows:
+        tasks.append({
+            "task_id": row["id"],
+            "subject": row["subject"],
+            "subject_id": row["subject_id"],
+            "study_hours": row["study_hours"],
+            "start_time": row["start_time"],
+            "end_time": row["end_time"],
+            "time_slot": row["time_slot"],
+            "difficulty": row["difficulty"],
+            "topics": decode_topics(row["topics"]),
+            "completed": bool(row["completed"]),
+            "completed_at": row["completed_at"]
+        })
+
+    return tasks
+
+
+TASK_SQL = "SELECT id, plan_id, subject_id, study_hours, completed FROM study_tasks WHERE id=?"
+
+# Rebuild one day's counters from a plan's tasks. Runs when a daily plan is
+# saved (and as a one-off fallback for rows saved before counters were kept).
+SEED_PROGRESS_SQL = """
+    INSERT OR REPLACE INTO daily_progress
+    (student_id, progress_date, total_tasks, completed_tasks, total_hours, completed_hours)
+    SELECT
+        ?,
+        ?,
+        COUNT(*),
+        COALESCE(SUM(completed), 0),
+        COALESCE(SUM(study_hours), 0),
+        COALESCE(SUM(CASE WHEN completed=1 THEN study_hours ELSE 0 END), 0)
+    FROM study_tasks
+    WHERE plan_id=?
+"""
+
+INCREMENT_PROGRESS_SQL = """
+    UPDATE daily_progress
+    SET completed_tasks = completed_tasks + 1,
+        completed_hours = completed_hours + ?
+    WHERE student_id=? AND progress_date=?
+"""
+
+
+def complete_task(task_id: int, student_id: str = "default") -> bool:
+    """
+    Mark a task as completed
+    
+    Flips the task flag, bumps today's progress counters by this task only
+    and updates the streak, all in one transaction. Completing a task that
+    is already done changes nothing, so double-clicks are harmless.
+    
+    Returns:
+        True if task was found and updated
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+
+        # Check if task exists
+        cursor.execute(TASK_SQL, (task_id,))
+        task = cursor.fetchone()
+
+        if not task:
+            return False
+
+        # Update task (no-op if it was already completed)
+        cursor.execute("""
+            UPDATE study_tasks 
+            SET completed=1, completed_at=CURRENT_TIMESTAMP
+            WHERE id=? AND completed=0
+        """, (task_id,))
+
+        if cursor.rowcount == 0:
+            conn.commit()
+            return True
+
+        # Only tasks from today's daily plan count towards today's progress
+        today = str(date.today())
+        cursor.execute(TODAY_PLAN_SQL, (student_id, today))
+        plan_row = cursor.fetchone()
+
+        if plan_row and plan_row["id"] == task["plan_id"]:
+            cursor.execute(INCREMENT_PROGRESS_SQL, (task["study_hours"] or 0, student_id, today))
+            if cursor.rowcount == 0:
+                # Plan saved before counters were maintained - build them once
+                cursor.execute(SEED_PROGRESS_SQL, (student_id, today, task["plan_id"]))
+
+        cursor.execute(COMPLETE_SUBJECT_STATS_SQL, (task["study_hours"] or 0, task["plan_id"], task["subject_id"]))
+
+        # Update streak after task completion
+        _update_streak(cursor, student_id, today)
+        cursor.execute(BUMP_VERSION_SQL, (student_id,))
+
+        conn.commit()
+
+    invalidate_student(student_id)
+    return True
+
+
+def _update_streak(cursor: sqlite3.Cursor, student_id: str, today: str):
+    """Streak bookkeeping on an open cursor so it can share the caller's transaction"""
+    # Get current streak
+    cursor.execute("""
+        SELECT current_streak, longest_streak, last_study_date 
+        FROM streaks 
+        WHERE student_id=?
+    """, (student_id,))
+
+    row = cursor.fetchone()
+
+    # Check if there's progress today
+    cursor.execute("""
+        SELECT completed_tasks FROM daily_progress
+        WHERE student_id=? AND progress_date=?
+    """, (student_id, today))
+
+    progress = cursor.fetchone()
+    has_progress = progress and progress["completed_tasks"] > 0
+
+    if not row:
+        # First time - create streak
+        if has_progress:
+            cursor.execute("""
+                INSERT INTO streaks (student_id, current_streak, longest_streak, last_study_date)
+                VALUES (?, 1, 1, ?)
+            """, (student_id, today))
+    else:
+        last_study_date = row["last_study_date"]
+        current_streak = row["current_streak"]
+        longest_streak = row["longest_streak"]
+
+        if has_progress:
+            if last_study_date == today:
+                # Already updated today, don't increment
+                pass
+            elif last_study_date == str(date.fromisoformat(today) - timedelta(days=1)):
+                # Consecutive day - increment streak
+                new_streak = current_streak + 1
+                new_longest = max(new_streak, longest_streak)
+                cursor.execute("""
+                    UPDATE streaks 
+                    SET current_streak=?, longest_streak=?, last_study_date=?, updated_at=CURRENT_TIMESTAMP
+                    WHERE student_id=?
+                """, (new_streak, new_longest, today, student_id))
+            else:
+                # Streak broken - reset to 1
+                cursor.execute("""
+                    UPDATE streaks 
+                    SET current_streak=1, last_study_date=?, updated_at=CURRENT_TIMESTAMP
+                    WHERE student_id=?
+                """, (today, student_id))
+        # If no progress today, don't update (streak continues until broken)
+
+
+def update_streak(student_id: str = "default"):
+    """
+    Update study streak based on today's progress
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        _update_streak(cursor, student_id, str(date.today()))
+        cursor.execute(BUMP_VERSION_SQL, (student_id,))
+        conn.commit()
+    invalidate_student(student_id)
+
+
+def get_streak(student_id: str = "default") -> Dict[str, Any]:
+    """
+    Get current streak information
+    
+    Returns:
+        Dictionary with streak data
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT current_streak, longest_streak, last_study_date
+            FROM streaks
+            WHERE student_id=?
+        """, (student_id,))
+
+        row = cursor.fetchone()
+
+    return _streak_from_row(row)
+
+
+def _streak_from_row(row: Optional[sqlite3.Row]) -> Dict[str, Any]:
+    if not row or row["current_streak"] is None:
+        return {
+            "current_streak": 0,
+            "longest_streak": 0,
+            "last_study_date": None
+        }
+
+    return {
+        "current_streak": row["current_streak"],
+        "longest_streak": row["longest_streak"],
+        "last_study_date": row["last_study_date"]
+    }
+
+
+def get_daily_progress(student_id: str = "default", progress_date: str = None) -> Dict[str, Any]:
+    """
+    Get daily progress statistics
+    
+    Args:
+        student_id: Student identifier
+        progress_date: Date in YYYY-MM-DD format (default: today)
+    
+    Returns:
+        Progress statistics
+    """
+    if progress_date is None:
+        progress_date = str(date.today())
+
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT total_tasks, completed_tasks, total_hours, completed_hours
+            FROM daily_progress
+            WHERE student_id=? AND progress_date=?
+        """, (student_id, progress_date))
+
+        row = cursor.fetchone()
+
+    return _progress_from_row(row, progress_date)
+
+
+def _progress_from_row(row: Optional[sqlite3.Row], progress_date: str) -> Dict[str, Any]:
+    if not row or row["total_tasks"] is None:
+        return {
+            "date": progress_date,
+            "total_tasks": 0,
+            "completed_tasks": 0,
+            "total_hours": 0.0,
+            "completed_hours": 0.0,
+            "completion_percentage": 0.0
+        }
+
+    total_tasks = row["total_tasks"] or 0
+    completed_tasks = row["completed_tasks"] or 0
+    total_hours = row["total_hours"] or 0.0
+    completed_hours = row["completed_hours"] or 0.0
+
+    completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
+
+
+    return {
+        "date": progress_date,
+        "total_tasks": total_tasks,
+        "completed_tasks": completed_tasks,
+        "total_hours": round(total_hours, 2),
+        "completed_hours": round(completed_hours, 2),
+        "completion_percentage": round(completion_percentage, 2)
+    }
+
+
+SUBJECT_STATS_SQL = """
+    SELECT subject_id, subject, planned_tasks, completed_tasks, planned_minutes, completed_minutes
+    FROM subject_stats
+    WHERE student_id=?
+"""
+
+
+def get_subject_stats(student_id: str = "default", exclude_date: str = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-subject totals over all of a student's daily plans (for the adaptive planner)
+    
+    Args:
+        student_id: Student identifier
+        exclude_date: Leave out the daily plan saved for this date, e.g. the
+            plan a regenerated plan will replace, so it doesn't count itself
+    
+    Returns:
+        {subject_id: {"subject", "planned_tasks", "completed_tasks",
+                      "planned_minutes", "completed_minutes"}}
+        Reads the student's subject_stats rows (and at most one plan's
+        tasks), never the task history.
+    """
+    with pooled_connection() as conn:
+        rows = conn.execute(SUBJECT_STATS_SQL, (student_id,)).fetchall()
+        excluded = {}
+        if exclude_date:
+            plan = conn.execute(PLAN_ID_SQL, (student_id, exclude_date, "daily")).fetchone()
+            if plan:
+                excluded = {row["subject_id"]: row
+                            for row in conn.execute(_PLAN_SUBJECT_TOTALS, (plan["id"],))}
+
+    stats = {}
+    for row in rows:
+        minus = excluded.get(row["subject_id"])
+        planned_tasks, completed_tasks = row["planned_tasks"], row["completed_tasks"]
+        planned_minutes, completed_minutes = row["planned_minutes"], row["completed_minutes"]
+        if minus:
+            planned_tasks -= minus["tasks"]
+            completed_tasks -= minus["completed"]
+            planned_minutes = max(planned_minutes - minus["minutes"], 0)
+            completed_minutes = max(completed_minutes - minus["completed_minutes"], 0)
+        if planned_tasks > 0:
+            stats[row["subject_id"]] = {
+                "subject": row["subject"],
+                "planned_tasks": planned_tasks,
+                "completed_tasks": completed_tasks,
+                "planned_minutes": round(planned_minutes, 1),
+                "completed_minutes": round(completed_minutes, 1)
+            }
+    return stats
+
+
+def create_student(student_id: str, name: str) -> bool:
+    """
+    Create or update a student profile
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+    
+        try:
+            cursor.execute("""
+                INSERT OR REPLACE INTO students (id, name)
+                VALUES (?, ?)
+            """, (student_id, name))
+            cursor.execute(BUMP_VERSION_SQL, (student_id,))
+            conn.commit()
+        except Exception as e:
+            print(f"Error creating student: {e}")
+            return False
+    invalidate_student(student_id)
+    return True
+
+
+def get_student(student_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get student profile
+    """
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+    
+        cursor.execute("SELECT id, name, created_at FROM students WHERE id=?", (student_id,))
+        row = cursor.fetchone()
+
+    return _student_from_row(row)
+
+
+def _student_from_row(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+    if not row or row["id"] is None:
+        return None
+    
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "created_at": row["created_at"]
+    }
+
+
+# Profile, streak, one day's progress and the write counter in a single
+# statement; every part is optional, hence the LEFT JOINs from a one-row subquery
+STUDENT_CONTEXT_SQL = """
+    SELECT s.id, s.name, s.created_at,
+           st.current_streak, st.longest_streak, st.last_study_date,
+           p.total_tasks, p.completed_tasks, p.total_hours, p.completed_hours,
+           v.version
+    FROM (SELECT :student_id AS student_id, :progress_date AS progress_date) AS k
+    LEFT JOIN students s ON s.id = k.student_id
+    LEFT JOIN streaks st ON st.student_id = k.student_id
+    LEFT JOIN daily_progress p ON p.student_id = k.student_id AND p.progress_date = k.progress_date
+    LEFT JOIN student_versions v ON v.student_id = k.student_id
+"""
+
+
+def load_student_context(student_id: str = "default", progress_date: str = None) -> Dict[str, Any]:
+    """
+    Streak, progress and profile of a student in one query (uncached)
+    
+    Returns:
+        {"streak": ..., "progress": ..., "profile": ... or None, "name": ... or None,
+         "version": ...} with the same shapes as get_streak, get_daily_progress and
+        get_student. version counts the writes made for the student.
+    """
+    if progress_date is None:
+        progress_date = str(date.today())
+
+    with pooled_connection() as conn:
+        row = conn.execute(STUDENT_CONTEXT_SQL,
+                           {"student_id": student_id, "progress_date": progress_date}).fetchone()
+
+    profile = _student_from_row(row)
+    return {
+        "streak": _streak_from_row(row),
+        "progress": _progress_from_row(row, progress_date),
+        "profile": profile,
+        "name": profile["name"] if profile else None,
+        "version": row["version"] or 0
+    }
+
+
+def get_student_context(student_id: str = "default", version: int = None) -> Dict[str, Any]:
+    """
+    load_student_context for today, through the in-process read model cache
+    (student_cache.py). Writes in this module invalidate the student's entry.
+
+    Writes made by another worker don't reach this cache; pass the version
+    from get_student_version() to reload an entry older than it.
+    """
+    today = str(date.today())
+    cache = get_student_cache()
+    context = cache.get_or_load(student_id, today, lambda: load_student_context(student_id, today))
+    if version is not None and context["version"] < version:
+        cache.invalidate(student_id)
+        context = cache.get_or_load(student_id, today, lambda: load_student_context(student_id, today))
+    return context
+
+
+STUDENT_VERSION_SQL = "SELECT version FROM student_versions WHERE student_id=?"
+
+
+def get_student_version(student_id: str = "default") -> int:
+    """
+    The student's write counter, read from SQLite by primary key (uncached,
+    so it also sees writes made by other workers)
+    """
+    with pooled_connection() as conn:
+        row = conn.execute(STUDENT_VERSION_SQL, (student_id,)).fetchone()
+    return row["version"] if row else 0
+
+
+JOB_SQL = """
+    SELECT id, student_id, kind, status, stage, progress, input_path, filename,
+           result, error, attempts, created_at, updated_at
+    FROM jobs WHERE id=?
+"""
+
+QUEUED_JOBS_SQL = """
+    SELECT id FROM jobs
+    WHERE status='queued'
+    ORDER BY updated_at LIMIT ?
+"""
+
+STALE_JOBS_SQL = """
+    SELECT id, attempts FROM jobs
+    WHERE status='running' AND updated_at<datetime('now', ?)
+"""
+
+# Columns update_job may set
+JOB_FIELDS = ("status", "stage", "progress", "result", "error", "input_data")
+
+
+def create_job(job_id: str, kind: str, input_path: str = None, filename: str = None,
+               student_id: str = "default", input_data: bytes = None, result: Dict[str, Any] = None):
+    """
+    Insert a queued job; its input is either a file (input_path) or bytes
+    (input_data). With a result the job is inserted as done instead.
+    """
+    status, stage, progress = ("done", "done", 100) if result is not None else ("queued", "queued", 0)
+    with pooled_connection() as conn:
+        conn.execute("""
+            INSERT INTO jobs (id, student_id, kind, status, stage, progress, input_path, filename,
+                              input_data, result)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (job_id, student_id, kind, status, stage, progress, input_path, filename, input_data,
+              json.dumps(result) if result is not None else None))
+        conn.commit()
+
+
+def claim_queued_jobs(limit: int) -> List[Dict[str, Any]]:
+    """
+    Move up to `limit` queued jobs to running and return them, oldest first.
+    Each claim is a conditional UPDATE, so when several workers poll the
+    same database a job is only ever claimed by one of them.
+    """
+    claimed = []
+    with pooled_connection() as conn:
+        for row in conn.execute(QUEUED_JOBS_SQL, (limit,)).fetchall():
+            cursor = conn.execute("""
+                UPDATE jobs SET status='running', attempts=attempts+1, updated_at=CURRENT_TIMESTAMP
+                WHERE id=? AND status='queued'
+            """, (row["id"],))
+            conn.commit()
+            if cursor.rowcount:
+                claimed.append(get_job(row["id"]))
+    return claimed
+
+
+def update_job(job_id: str, claim: Optional[int] = None, **fields) -> bool:
+    """
+    Set any of JOB_FIELDS on a job and bump updated_at (with no fields,
+    this is the heartbeat of a running job). `result` is stored as JSON.
+    
+    With `claim` (the job's attempts count when it was claimed) the update
+    only applies while that claim still owns the job, i.e. it is running
+    and wasn't requeued and claimed again. Returns whether a row was updated.
+    """
+    unknown = set(fields) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+    if "result" in fields:
+        fields["result"] = json.dumps(fields["result"])
+    assignments = "".join(f"{name}=?, " for name in fields)
+    where, params = "id=?", (job_id,)
+    if claim is not None:
+        where, params = "id=? AND status='running' AND attempts=?", (job_id, claim)
+    with pooled_connection() as conn:
+        cursor = conn.execute(f"UPDATE jobs SET {assignments}updated_at=CURRENT_TIMESTAMP WHERE {where}",
+                              (*fields.values(), *params))
+        conn.commit()
+    return cursor.rowcount > 0
+
+
+def requeue_stale_jobs(stale_seconds: float, max_attempts: int) -> Dict[str, int]:
+    """
+    Running jobs whose heartbeat stopped more than `stale_seconds` ago
+    belonged to a worker that died or restarted: queue them again, or fail
+    them once they have used up `max_attempts`.
+    """
+    counts = {"requeued": 0, "failed": 0}
+    with pooled_connection() as conn:
+        stale = conn.execute(STALE_JOBS_SQL, (f"-{int(stale_seconds)} seconds",)).fetchall()
+        for row in stale:
+            if row["attempts"] >= max_attempts:
+                conn.execute("""
+                    UPDATE jobs SET status='failed', error=?, updated_at=CURRENT_TIMESTAMP
+                    WHERE id=? AND status='running'
+                """, (f"Gave up after {row['attempts']} attempts", row["id"]))
+                counts["failed"] += 1
+            else:
+                conn.execute("""
+                    UPDATE jobs SET status='queued', stage='queued', progress=0, updated_at=CURRENT_TIMESTAMP
+                    WHERE id=? AND status='running'
+                """, (row["id"],))
+                counts["requeued"] += 1
+        conn.commit()
+    return counts
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """A job with its result decoded, or None"""
+    with pooled_connection() as conn:
+        row = conn.execute(JOB_SQL, (job_id,)).fetchone()
+    if not row:
+        return None
+    job = dict(row)
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+def get_job_input(job_id: str) -> Optional[bytes]:
+    """The bytes of a job's in-memory input (not loaded by get_job)"""
+    with pooled_connection() as conn:
+        row = conn.execute("SELECT input_data FROM jobs WHERE id=?", (job_id,)).fetchone()
+    return row["input_data"] if row else None
+
+
+def count_jobs_by_status() -> Dict[str, int]:
+    with pooled_connection() as conn:
+        rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+    return {row["status"]: row["n"] for row in rows}
+
+
+# Queries on the request path with representative parameters.
+# test_query_plans.py runs EXPLAIN QUERY PLAN on each and fails on table scans.
+HOT_QUERIES = {
+    "today_plan": (TODAY_PLAN_SQL, ("default", "2024-12-01")),
+    "plan_tasks": (PLAN_TASKS_SQL, (1,)),
+    "replaced_plan": (PLAN_ID_SQL, ("default", "2024-12-01", "daily")),
+    "delete_plan_tasks": (DELETE_PLAN_TASKS_SQL, (1,)),
+    "task_by_id": (TASK_SQL, (1,)),
+    "seed_progress": (SEED_PROGRESS_SQL, ("default", "2024-12-01", 1)),
+    "increment_progress": (INCREMENT_PROGRESS_SQL, (1.0, "default", "2024-12-01")),
+    "streak": ("SELECT current_streak, longest_streak, last_study_date FROM streaks WHERE student_id=?",
+               ("default",)),
+    "daily_progress": ("""
+        SELECT total_tasks, completed_tasks, total_hours, completed_hours
+        FROM daily_progress
+        WHERE student_id=? AND progress_date=?
+    """, ("default", "2024-12-01")),
+    "student": ("SELECT id, name, created_at FROM students WHERE id=?", ("default",)),
+    "student_context": (STUDENT_CONTEXT_SQL, {"student_id": "default", "progress_date": "2024-12-01"}),
+    "student_version": (STUDENT_VERSION_SQL, ("default",)),
+    "subject_stats": (SUBJECT_STATS_SQL, ("default",)),
+    "add_subject_stats": (ADD_SUBJECT_STATS_SQL, ("default", 1)),
+    "remove_subject_stats": (REMOVE_SUBJECT_STATS_SQL, (1, "default")),
+    "complete_subject_stats": (COMPLETE_SUBJECT_STATS_SQL, (1.0, 1, "mathematics")),
+    "job": (JOB_SQL, ("job-id",)),
+    "queued_jobs": (QUEUED_JOBS_SQL, (4,)),
+    "stale_jobs": (STALE_JOBS_SQL, ("-60 seconds",)),
+}
+
+
+def explain_query_plan(sql: str, params=()) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+    with pooled_connection() as conn:
+        rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [row["detail"] for row in rows]
+
+
+def find_table_scans(queries: Dict[str, tuple] = None) -> Dict[str, List[str]]:
+    """
+    Audit HOT_QUERIES (or another {name: (sql, params)} set) against the current schema
+    
+    Returns:
+        {query_name: [plan lines]} for every hot query that scans a whole table
+    """
+    scans = {}
+    for name, (sql, params) in (HOT_QUERIES if queries is None else queries).items():
+        plan = explain_query_plan(sql, params)
+        # "SCAN <table>" is a full scan; "SEARCH ... USING INDEX" is what we want.
+        # Scanning a subquery's result (a CO-ROUTINE or MATERIALIZE) doesn't touch a table.
+        coroutines = {line.split(" ", 1)[1] for line in plan if line.startswith(("CO-ROUTINE ", "MATERIALIZE "))}
+        bad = [line for line in plan if line.startswith("SCAN ") and "CONSTANT ROW" not in line
+               and line[len("SCAN "):] not in coroutines]
+        if bad:
+            scans[name] = plan
+    return scans
@@ -1,71 +1,309 @@
-import os
-import pypdf
-import docx
-
-def read_file_content(file_path: str) -> str:
-    """
-    Reads content from a PDF or DOCX file.
-    Returns the extracted text.
-    """
-    _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
-    
-    if ext == ".pdf":
-        return _read_pdf(file_path)
-    elif ext == ".docx":
-        return _read_docx(file_path)
-    elif ext == ".txt":
-        return _read_txt(file_path)
-    elif ext in [".jpg", ".jpeg", ".png"]:
-        return _read_image(file_path)
-    else:
-        raise ValueError(f"Unsupported file format: {ext}")
-
-def _read_image(file_path: str) -> str:
-    """Read text from image using OCR"""
-    try:
-        from PIL import Image
-        import pytesseract
-        
-        # Point to Tesseract if needed (Windows often needs this)
-        # Assuming standard install path or PATH is set
-        pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-        
-        text = pytesseract.image_to_string(Image.open(file_path))
-        return text if text.strip() else "OCR extracted no text."
-    except ImportError:
-        return "[Error] Python libraries 'Pillow' or 'pytesseract' not installed. Cannot read images."
-    except Exception as e:
-        print(f"Error reading Image: {e}")
-        return f"[Error] OCR Failed. Ensure Tesseract is installed and in your PATH. (Details: {str(e)})"
-
-
-def _read_pdf(file_path: str) -> str:
-    text = ""
-    try:
-        reader = pypdf.PdfReader(file_path)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-    except Exception as e:
-        print(f"Error reading PDF: {e}")
-        return ""
-    return text
-
-def _read_docx(file_path: str) -> str:
-    text = ""
-    try:
-        doc = docx.Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-    except Exception as e:
-        print(f"Error reading DOCX: {e}")
-        return ""
-    return text
-
-def _read_txt(file_path: str) -> str:
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except Exception as e:
-        print(f"Error reading TXT: {e}")
-        return ""
+import codecs
+import io
+import math
+import multiprocessing
+import os
+import shutil
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Callable, List, Optional, Union
+
+import pypdf
+import docx
+
+# PDF extraction: PDFs with at least PDF_PARALLEL_MIN_PAGES pages are split
+# into chunks of up to PDF_CHUNK_PAGES pages, extracted by PDF_WORKERS processes
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(os.cpu_count() or 1, 4))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+PDF_CHUNK_PAGES = int(os.getenv("PDF_CHUNK_PAGES", "16"))
+
+# Uploads: larger than MAX_UPLOAD_BYTES is rejected; up to UPLOAD_SPOOL_BYTES
+# is kept in memory, anything bigger is spooled to a temporary file
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+
+# Bytes looked at for format detection
+HEAD_BYTES = 2048
+
+# Formats read with OCR
+IMAGE_FORMATS = (".jpg", ".png")
+
+Source = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+class UploadTooLarge(ValueError):
+    """The upload is bigger than MAX_UPLOAD_BYTES"""
+
+def _is_docx(source: Source) -> bool:
+    """A ZIP archive holding word/document.xml (a .zip, .xlsx or .pptx is not a Word file)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    position = None if isinstance(source, (str, os.PathLike)) else source.tell()
+    try:
+        with zipfile.ZipFile(source) as archive:
+            archive.getinfo("word/document.xml")
+        return True
+    except (zipfile.BadZipFile, KeyError, EOFError):
+        return False
+    finally:
+        if position is not None:
+            source.seek(position)
+
+def detect_format(head: bytes, source: Optional[Source] = None) -> Optional[str]:
+    """
+    File format from the first bytes of a file (magic numbers), as the
+    extension it would normally have: ".pdf", ".docx", ".png", ".jpg" or
+    ".txt" for UTF-8 text. None for anything else.
+
+    A ZIP is only ".docx" if its directory (at the end of the file) lists
+    word/document.xml, so that needs the whole file as `source` (a path,
+    bytes or seekable stream, left where it was); without it a ZIP is None.
+    """
+    if b"%PDF-" in head[:1024]:  # PDF allows junk before the header
+        return ".pdf"
+    if head.startswith(b"PK\x03\x04"):  # ZIP container, as DOCX is
+        return ".docx" if source is not None and _is_docx(source) else None
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head and b"\x00" not in head:
+        try:
+            # Incremental: a multi-byte character may be cut off at the end of head
+            codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+            return ".txt"
+        except UnicodeDecodeError:
+            pass
+    return None
+
+def _check_size(size: int):
+    if size > MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(f"File is {size} bytes; the limit is {MAX_UPLOAD_BYTES}")
+
+def spool_upload(stream: BinaryIO, max_bytes: Optional[int] = None) -> SpooledTemporaryFile:
+    """
+    Copy a (possibly non-seekable) stream into memory, rolling over to a
+    temporary file past UPLOAD_SPOOL_BYTES. Raises UploadTooLarge as soon as
+    more than max_bytes (default MAX_UPLOAD_BYTES) have been read.
+    """
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    spooled = SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES, mode="w+b")
+    size = 0
+    while True:
+        chunk = stream.read(64 * 1024)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            spooled.close()
+            raise UploadTooLarge(f"File is over the {max_bytes}-byte limit")
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+def stream_size(stream: BinaryIO) -> int:
+    """Size of a seekable stream, leaving it positioned at the start"""
+    size = stream.seek(0, io.SEEK_END)
+    stream.seek(0)
+    return size
+
+def peek_format(stream: BinaryIO) -> Optional[str]:
+    """detect_format() on a seekable stream, leaving it positioned at the start"""
+    stream.seek(0)
+    head = stream.read(HEAD_BYTES)
+    stream.seek(0)
+    return detect_format(head, stream)
+
+def save_stream(stream: BinaryIO, path: str):
+    """Write a stream to `path` in chunks"""
+    with open(path, "wb") as f:
+        shutil.copyfileobj(stream, f, 64 * 1024)
+
+def read_file_content(source: Source, max_chars: Optional[int] = None) -> str:
+    """
+    Reads content from a PDF, DOCX, TXT or image (JPG/PNG) file.
+    Returns the extracted text.
+
+    source is a file path, the file's bytes or a binary file object; the
+    format comes from the content (magic bytes), not the name. Streams that
+    can't seek are spooled first. Sources over MAX_UPLOAD_BYTES raise
+    UploadTooLarge without being read.
+
+    max_chars lets PDF extraction stop early, once at least that much text
+    has been collected (whole pages, so the result may be a little longer).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        _check_size(os.path.getsize(source))
+        with open(source, "rb") as f:
+            ext = detect_format(f.read(HEAD_BYTES), source)
+    else:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        elif not (hasattr(source, "seekable") and source.seekable()):
+            source = spool_upload(source)
+        _check_size(stream_size(source))
+        ext = peek_format(source)
+
+    if ext == ".pdf":
+        return _read_pdf(source, max_chars)
+    elif ext == ".docx":
+        return _read_docx(source)
+    elif ext == ".txt":
+        return _read_txt(source)
+    elif ext in IMAGE_FORMATS:
+        return _read_image(source)
+    else:
+        raise ValueError("Unsupported file format: expected a PDF, DOCX, TXT, JPG or PNG file")
+
+def _read_image(file_path: Source) -> str:
+    """Read text from image using OCR (see ocr_service)"""
+    try:
+        from ocr_service import OCRUnavailable, ocr_images
+
+        source = os.fspath(file_path) if isinstance(file_path, (str, os.PathLike)) else file_path.read()
+        text = ocr_images([source])
+        return text if text.strip() else "OCR extracted no text."
+    except ImportError:
+        return "[Error] Python libraries 'Pillow' or 'pytesseract' not installed. Cannot read images."
+    except OCRUnavailable as e:
+        return f"[Error] {e}"
+    except Exception as e:
+        print(f"Error reading Image: {e}")
+        return f"[Error] OCR Failed. Ensure Tesseract is installed and in your PATH. (Details: {str(e)})"
+
+_pdf_pool = None
+_pdf_pool_pid = None
+_pdf_pool_lock = threading.Lock()
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Process pool for page-parallel PDF extraction, created on first use (per process)"""
+    global _pdf_pool, _pdf_pool_pid
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_pid != os.getpid():
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+            _pdf_pool_pid = os.getpid()
+        return _pdf_pool
+
+# Last PDF opened by this pool process: its next chunk skips re-parsing the file
+_chunk_reader = (None, None)
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop), one string per page. Runs in pool processes."""
+    global _chunk_reader
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    if _chunk_reader[0] != key:
+        _chunk_reader = (key, pypdf.PdfReader(file_path))
+    reader = _chunk_reader[1]
+    return [reader.pages[i].extract_text() or "" for i in range(start, min(stop, len(reader.pages)))]
+
+def read_pdf_parallel(file_path: str, executor: Executor, max_chars: Optional[int] = None,
+                      workers: int = PDF_WORKERS, chunk_pages: int = PDF_CHUNK_PAGES,
+                      on_progress: Optional[Callable[[int, int], None]] = None,
+                      reader: Optional[pypdf.PdfReader] = None) -> str:
+    """
+    Extract a PDF in page chunks on `executor`, joined in page order.
+
+    The caller's reader (or one opened here for the page count) extracts
+    page 0 itself, so the parse in this process isn't thrown away; with
+    max_chars that page is read before anything is submitted, and a short
+    syllabus on the first page never reaches the pool. Only a couple of
+    chunks per worker are in flight at a time, so the chunks past the point
+    where enough text was collected are never submitted; with max_chars
+    chunks also start at one page and double, so a short syllabus at the
+    front isn't read 16 pages at a time.
+    on_progress(pages_done, page_count) is called as pages come back.
+    """
+    if reader is None:
+        reader = pypdf.PdfReader(file_path)
+    page_count = len(reader.pages)
+    if page_count == 0:
+        return ""
+    workers = max(workers, 1)
+    chunk_pages = max(1, min(chunk_pages, math.ceil((page_count - 1) / workers)))
+    chunks = deque()
+    start, size = 1, 1 if max_chars is not None else chunk_pages
+    while start < page_count:
+        chunks.append((start, min(start + size, page_count)))
+        start += size
+        size = min(size * 2, chunk_pages)
+    in_flight = deque()
+
+    def submit():
+        while chunks and len(in_flight) < workers * 2:
+            in_flight.append(executor.submit(extract_pdf_pages, file_path, *chunks.popleft()))
+
+    try:
+        if max_chars is None:
+            submit()  # The workers start on pages 1+ while this process reads page 0
+        first = reader.pages[0].extract_text() or ""
+        parts: List[str] = [first]
+        collected = len(first) + 1
+        pages_done = 1
+        if on_progress:
+            on_progress(pages_done, page_count)
+
+        while (chunks or in_flight) and (max_chars is None or collected < max_chars):
+            submit()
+            pages = in_flight.popleft().result()
+            parts.extend(pages)
+            pages_done += len(pages)
+            collected += sum(len(page) + 1 for page in pages)
+            if on_progress:
+                on_progress(pages_done, page_count)
+    finally:
+        # Early stop, or a chunk failed: don't leave queued chunks to the pool
+        for future in in_flight:
+            future.cancel()
+
+    return "\n".join(parts) + "\n"
+
+def _read_pdf(file_path: Source, max_chars: Optional[int] = None) -> str:
+    try:
+        reader = pypdf.PdfReader(file_path)
+        # Pool processes open the file themselves, so only paths go parallel;
+        # bytes and stream uploads are always read here, page by page
+        if (isinstance(file_path, (str, os.PathLike)) and len(reader.pages) >= PDF_PARALLEL_MIN_PAGES
+                and PDF_WORKERS > 1):
+            return read_pdf_parallel(file_path, _get_pdf_pool(), max_chars, reader=reader)
+
+        parts = []
+        collected = 0
+        for page in reader.pages:
+            text = page.extract_text() or ""
+            parts.append(text)
+            collected += len(text) + 1
+            if max_chars is not None and collected >= max_chars:
+                break
+    except Exception as e:
+        print(f"Error reading PDF: {e}")
+        return ""
+    return "\n".join(parts) + "\n" if parts else ""
+
+def _read_docx(file_path: Source) -> str:
+    text = ""
+    try:
+        doc = docx.Document(file_path)
+        for para in doc.paragraphs:
+            text += para.text + "\n"
+    except Exception as e:
+        print(f"Error reading DOCX: {e}")
+        return ""
+    return text
+
+def _read_txt(file_path: Source) -> str:
+    try:
+        if isinstance(file_path, (str, os.PathLike)):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        wrapper = io.TextIOWrapper(file_path, encoding='utf-8')
+        try:
+            return wrapper.read()
+        finally:
+            wrapper.detach()  # Leave the caller's stream open
+    except Exception as e:
+        print(f"Error reading TXT: {e}")
+        return ""
@@ -0,0 +1,344 @@
+"""
+Background job queue for Study Saathi
+Syllabus uploads are stored as jobs in SQLite (small files inline, larger
+ones in JOB_UPLOAD_DIR) and processed by a local
+worker pool: text extraction (CPU-bound PDF parsing and OCR) runs in worker
+processes, the LLM parsing step in a thread. Jobs survive a restart: a
+running job whose heartbeat stops is queued again.
+"""
+import multiprocessing
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Union
+
+import ai_service
+import database
+from ai_service import parse_syllabus, syllabus_parser_id
+from file_service import (
+    HEAD_BYTES, IMAGE_FORMATS, MAX_UPLOAD_BYTES, UPLOAD_SPOOL_BYTES, UploadTooLarge,
+    detect_format, read_file_content, read_pdf_parallel, save_stream, stream_size
+)
+from ocr_service import ocr_images
+from syllabus_cache import combined_hash, content_hash, file_hash, get_syllabus_cache, stream_hash
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # extraction processes (and jobs run at once)
+JOB_UPLOAD_DIR = os.getenv("JOB_UPLOAD_DIR", "uploads")  # uploaded files wait here until processed
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))  # seconds between queue checks
+JOB_HEARTBEAT = float(os.getenv("JOB_HEARTBEAT", "10"))  # seconds between running-job heartbeats
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "60"))  # silent this long = worker died
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "600"))  # seconds allowed for extraction
+
+SYLLABUS_UPLOAD = "syllabus_upload"
+
+
+def _max_chars() -> Optional[int]:
+    # With an LLM configured only the first SYLLABUS_PROMPT_CHARS are
+    # parsed, so PDF extraction stops there; the local fallback parser
+    # reads everything
+    return ai_service.SYLLABUS_PROMPT_CHARS if ai_service.LLM_API_KEY else None
+
+
+def _image_files(directory: str) -> List[str]:
+    """The photos of a multi-image upload, in upload order"""
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))]
+
+
+def _input_hash(data: Optional[bytes], path: str) -> str:
+    if data is not None:
+        return content_hash(data)
+    if os.path.isdir(path):
+        return combined_hash([file_hash(image) for image in _image_files(path)])
+    return file_hash(path)
+
+
+def _extract_text(source: Union[str, bytes], max_chars: Optional[int] = None) -> str:
+    """Runs in a pool process"""
+    return read_file_content(source, max_chars)
+
+
+class JobQueue:
+    """
+    Dispatcher thread + worker pools, started lazily once per process.
+
+    The dispatcher claims queued jobs from the database (any worker process
+    pointing at the same file may claim them, each job only once), hands
+    each to a runner thread and re-queues jobs whose heartbeat went stale.
+    submit() wakes it up immediately instead of waiting for the next poll.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = max(workers, 1)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+        self._running = 0
+        self._processes = None
+        self._runners = None
+        self._stats = {
+            "submitted": 0,
+            "claimed": 0,
+            "completed": 0,
+            "failed": 0,
+            "requeued": 0,
+            "answered_from_cache": 0,
+        }
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Spawned (not forked) processes: the web server has threads and
+            # open SQLite connections that a forked child must not inherit
+            self._processes = ProcessPoolExecutor(max_workers=self.workers,
+                                                  mp_context=multiprocessing.get_context("spawn"))
+            self._runners = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job-runner")
+            self._running = 0
+            self._pid = os.getpid()
+            threading.Thread(target=self._dispatch_loop, daemon=True, name="job-dispatcher").start()
+
+    def start(self):
+        """Start processing (picks up jobs left over from a previous run)"""
+        self._ensure_started()
+        self._wake.set()
+
+    def submit(self, kind: str, input_path: str = None, filename: str = None, student_id: str = "default",
+               input_data: bytes = None) -> str:
+        job_id = uuid.uuid4().hex
+        database.create_job(job_id, kind, input_path, filename, student_id, input_data)
+        with self._lock:
+            self._stats["submitted"] += 1
+        self.start()
+        return job_id
+
+    def submit_done(self, kind: str, result: Dict[str, Any], filename: str = None,
+                    student_id: str = "default") -> str:
+        """Record a job whose result is already known (e.g. cached); nothing is run"""
+        job_id = uuid.uuid4().hex
+        database.create_job(job_id, kind, None, filename, student_id, result=result)
+        self._count("answered_from_cache")
+        return job_id
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _dispatch_loop(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            self._wake.clear()
+            try:
+                stale = database.requeue_stale_jobs(JOB_STALE_AFTER, JOB_MAX_ATTEMPTS)
+                self._count("requeued", stale["requeued"])
+                self._count("failed", stale["failed"])
+                with self._lock:
+                    free = self.workers - self._running
+                for job in database.claim_queued_jobs(free) if free > 0 else []:
+                    with self._lock:
+                        self._running += 1
+                        self._stats["claimed"] += 1
+                    self._runners.submit(self._run, job)
+            except Exception as e:
+                print(f"[JOB QUEUE] Dispatcher error: {e}")
+            self._wake.wait(JOB_POLL_INTERVAL)
+
+    def _wait(self, future) -> Any:
+        """Wait for a pool future, up to JOB_TIMEOUT"""
+        try:
+            return future.result(timeout=JOB_TIMEOUT)
+        except FutureTimeout:
+            future.cancel()
+            raise TimeoutError(f"Extraction took longer than {JOB_TIMEOUT:.0f}s")
+
+    def _heartbeat(self, job_id: str, claim: int, stop: threading.Event):
+        """
+        Keep a running job's updated_at fresh for as long as _run works on
+        it (extraction, a slow LLM call, waiting on another worker's
+        single-flight lock), so it is never requeued while still running
+        """
+        while not stop.wait(JOB_HEARTBEAT):
+            try:
+                if not database.update_job(job_id, claim=claim):
+                    return  # Requeued and claimed by someone else: nothing left to keep alive
+            except Exception as e:
+                print(f"[JOB QUEUE] Heartbeat for job {job_id} failed: {e}")
+
+    def _extract(self, job_id: str, claim: int, source: Union[str, bytes], max_chars: Optional[int]) -> str:
+        # PDF pages and OCR strips are spread over the whole pool and report progress
+        def on_progress(done: int, total: int):
+            database.update_job(job_id, claim=claim, progress=10 + 50 * done // total)
+
+        if isinstance(source, str) and os.path.isdir(source):
+            return ocr_images(_image_files(source), self._processes, on_progress)
+
+        if isinstance(source, bytes):
+            file_format = detect_format(source[:HEAD_BYTES], source)
+        else:
+            with open(source, "rb") as f:
+                file_format = detect_format(f.read(HEAD_BYTES), source)
+
+        if file_format in IMAGE_FORMATS:
+            return ocr_images([source], self._processes, on_progress)
+        if file_format == ".pdf" and not isinstance(source, bytes):
+            return read_pdf_parallel(source, self._processes, max_chars, workers=self.workers,
+                                     on_progress=on_progress)
+        return self._wait(self._processes.submit(_extract_text, source, max_chars))
+
+    def _run(self, job: Dict[str, Any]):
+        job_id = job["id"]
+        path = job["input_path"]
+        claim = job["attempts"]  # Every write below only applies while this claim owns the job
+        owned = True
+        stop = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(job_id, claim, stop), daemon=True,
+                         name=f"job-heartbeat-{job_id[:8]}").start()
+        try:
+            data = database.get_job_input(job_id)
+            if data is None and (not path or not os.path.exists(path)):
+                raise FileNotFoundError("Uploaded file is missing")
+
+            # Same file uploaded before: reuse its text and parse
+            cache = get_syllabus_cache()
+            max_chars = _max_chars()
+            upload_hash = _input_hash(data, path)
+            content = cache.get_text(upload_hash, max_chars) if cache else None
+
+            if content is None:
+                database.update_job(job_id, claim=claim, stage="extracting", progress=10)
+                try:
+                    content = self._extract(job_id, claim, data if data is not None else path, max_chars)
+                except BrokenProcessPool:
+                    # A crashed extraction process (e.g. OCR on a bad image)
+                    # breaks the whole pool; replace it for the next jobs
+                    with self._lock:
+                        self._processes = ProcessPoolExecutor(max_workers=self.workers,
+                                                              mp_context=multiprocessing.get_context("spawn"))
+                    raise RuntimeError("Text extraction crashed")
+                if not content or not content.strip():
+                    raise ValueError("Could not extract text from file")
+                if cache:
+                    cache.put_text(upload_hash, content, max_chars)
+
+            database.update_job(job_id, claim=claim, stage="parsing", progress=60)
+            parser = syllabus_parser_id()
+            schedule_data = cache.get_parsed(content, parser) if cache else None
+            if schedule_data is None:
+                schedule_data, parsed_by_parser = parse_syllabus(content)
+                # A fallback answer after an LLM failure isn't cached, so the next upload retries the LLM
+                if cache and parsed_by_parser:
+                    cache.put_parsed(content, parser, schedule_data)
+
+            owned = database.update_job(job_id, claim=claim, status="done", stage="done", progress=100,
+                                        result={"extracted_data": schedule_data}, input_data=None)
+            if owned:
+                self._count("completed")
+                print(f"[JOB QUEUE] Job {job_id} done")
+        except Exception as e:
+            owned = database.update_job(job_id, claim=claim, status="failed", stage="failed", error=str(e),
+                                        input_data=None)
+            if owned:
+                self._count("failed")
+                print(f"[JOB QUEUE] Job {job_id} failed: {e}")
+        finally:
+            stop.set()
+            if not owned:
+                # Requeued while this run was still going: the new claim owns
+                # the job, its status and its input now
+                print(f"[JOB QUEUE] Job {job_id} was taken over by another run; result discarded")
+            elif path and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif path and os.path.exists(path):
+                os.remove(path)
+            with self._lock:
+                self._running -= 1
+            self._wake.set()  # A slot is free
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["running"] = self._running
+        stats["workers"] = self.workers
+        stats["jobs"] = database.count_jobs_by_status()
+        return stats
+
+
+_queue = JobQueue()
+
+
+def submit_syllabus_upload(stream: BinaryIO, filename: str = None, student_id: str = "default") -> str:
+    """
+    Queue an uploaded file (a seekable binary stream) for extraction +
+    parsing; returns the job id. Uploads up to UPLOAD_SPOOL_BYTES are stored
+    in the job row, larger ones are copied to JOB_UPLOAD_DIR. Raises
+    UploadTooLarge past MAX_UPLOAD_BYTES.
+
+    A file whose text and parse are both in the syllabus cache gets a job
+    that is done already.
+    """
+    size = stream_size(stream)
+    if size > MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(f"File is {size} bytes; the limit is {MAX_UPLOAD_BYTES}")
+
+    cache = get_syllabus_cache()
+    if cache:
+        parsed = cache.lookup_upload(stream_hash(stream), _max_chars(), syllabus_parser_id())
+        if parsed is not None:
+            return _queue.submit_done(SYLLABUS_UPLOAD, {"extracted_data": parsed}, filename, student_id)
+
+    if size <= UPLOAD_SPOOL_BYTES:
+        return _queue.submit(SYLLABUS_UPLOAD, None, filename, student_id, input_data=stream.read())
+
+    os.makedirs(JOB_UPLOAD_DIR, exist_ok=True)
+    name = os.path.basename(filename or "upload")
+    path = os.path.join(JOB_UPLOAD_DIR, f"{uuid.uuid4().hex}_{name}")
+    save_stream(stream, path)
+    return _queue.submit(SYLLABUS_UPLOAD, path, filename, student_id)
+
+
+def submit_syllabus_images(streams: Sequence[BinaryIO], filenames: Sequence[str] = (),
+                           student_id: str = "default") -> str:
+    """
+    Queue photos of several syllabus pages as one job (OCR'd in order, text
+    joined); returns the job id. The images are kept in a directory under
+    JOB_UPLOAD_DIR until the job finishes.
+    """
+    size = sum(stream_size(stream) for stream in streams)
+    if size > MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(f"Files are {size} bytes together; the limit is {MAX_UPLOAD_BYTES}")
+    label = f"{len(streams)} images"
+
+    cache = get_syllabus_cache()
+    if cache:
+        upload_hash = combined_hash([stream_hash(stream) for stream in streams])
+        parsed = cache.lookup_upload(upload_hash, _max_chars(), syllabus_parser_id())
+        if parsed is not None:
+            return _queue.submit_done(SYLLABUS_UPLOAD, {"extracted_data": parsed}, label, student_id)
+
+    directory = os.path.join(JOB_UPLOAD_DIR, uuid.uuid4().hex)
+    os.makedirs(directory)
+    names = list(filenames) + [""] * (len(streams) - len(filenames))
+    for i, (stream, name) in enumerate(zip(streams, names)):
+        # The index prefix keeps the page order
+        save_stream(stream, os.path.join(directory, f"{i:03d}_{os.path.basename(name or 'image')}"))
+    return _queue.submit(SYLLABUS_UPLOAD, directory, label, student_id)
+
+
+def start_job_queue():
+    _queue.start()
+
+
+def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """Public view of a job (no server paths), or None"""
+    job = database.get_job(job_id)
+    if job is None:
+        return None
+    job.pop("input_path", None)
+    return job
+
+
+def get_job_queue_stats() -> Dict[str, Any]:
+    return _queue.stats()
@@ -0,0 +1,177 @@
+"""
+LLM response cache for Study Saathi
+Stores LLM answers in a local SQLite file keyed on (model, system prompt,
+normalized user prompt, temperature), so repeated explanations and common
+doubts are answered without calling the LLM API again
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "llm_cache.db")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+# Size is checked (and least recently used rows evicted) every this many stores
+_EVICT_EVERY = 50
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    Canonical form of a prompt for cache keys: Unicode NFC, whitespace runs
+    collapsed. Prompts built from indented f-strings, or doubts that differ
+    only in spacing, share one entry. Case and compatibility forms are kept:
+    "Co" is not "CO", and "x²" is not "x2".
+    """
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def make_cache_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+    parts = (model, normalize_prompt(system_prompt), normalize_prompt(user_prompt), repr(float(temperature)))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed response cache with a TTL and least-recently-used eviction.
+
+    One connection is shared by all threads of a worker behind a lock;
+    several workers can point at the same file (WAL mode).
+    """
+
+    def __init__(self, path: str = LLM_CACHE_DB, ttl: float = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max(max_entries, 1)
+        self._lock = threading.Lock()
+        self._stores = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+        }
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE cache_key=?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            if row[1] + self.ttl <= now:
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_responses WHERE cache_key=?", (key,))
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE llm_responses SET last_used=?, hit_count=hit_count+1 WHERE cache_key=?",
+                    (now, key)
+                )
+            self._stats["hits"] += 1
+            return row[0]
+
+    def peek(self, key: str) -> Optional[str]:
+        """Unexpired response for `key` without touching stats or recency"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_responses WHERE cache_key=? AND created_at>?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO llm_responses (cache_key, response, created_at, last_used)
+                    VALUES (?, ?, ?, ?)
+                """, (key, response, now, now))
+                self._stats["stores"] += 1
+                self._stores += 1
+                if self._stores % _EVICT_EVERY == 0:
+                    self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired rows, then the least recently used ones above max_entries"""
+        cursor = self._conn.execute("DELETE FROM llm_responses WHERE created_at<=?", (now - self.ttl,))
+        self._stats["expired"] += cursor.rowcount
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        if count > self.max_entries:
+            cursor = self._conn.execute("""
+                DELETE FROM llm_responses WHERE cache_key IN (
+                    SELECT cache_key FROM llm_responses ORDER BY last_used LIMIT ?
+                )
+            """, (count - self.max_entries,))
+            self._stats["evictions"] += cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM llm_responses")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl
+        return stats
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """The worker's cache, opened on first use (None when LLM_CACHE_ENABLED=0)"""
+    global _cache, _cache_pid
+    if not LLM_CACHE_ENABLED:
+        return None
+    # A SQLite connection must not be used across a fork
+    if _cache is None or (_cache_pid is not None and _cache_pid != os.getpid()):
+        with _cache_lock:
+            if _cache is None or (_cache_pid is not None and _cache_pid != os.getpid()):
+                _cache = LLMResponseCache()
+                _cache_pid = os.getpid()
+    return _cache
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    cache = get_llm_cache()
+    return cache.stats() if cache else {"enabled": False}
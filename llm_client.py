@@ -0,0 +1,265 @@
+"""
+HTTP client for the LLM API
+One pooled keep-alive requests.Session per worker process, retries with
+jittered exponential backoff on 429/5xx, a circuit breaker per endpoint,
+and a rate limit on requests sent to the provider
+"""
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))  # keep-alive connections per host
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))  # seconds per attempt
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))  # seconds, doubled per retry
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))  # consecutive failed calls
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))  # seconds before a trial call
+LLM_RATE_LIMIT = float(os.getenv("LLM_RATE_LIMIT", "0"))  # requests/second per worker; 0 = unlimited
+LLM_RATE_BURST = int(os.getenv("LLM_RATE_BURST", "0"))  # requests allowed back to back; 0 = same as the rate
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed -> open after `threshold` failed calls in a row; open -> half_open
+    once `cooldown` seconds have passed, letting one trial call through;
+    the trial's outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, threshold: int = LLM_BREAKER_THRESHOLD, cooldown: float = LLM_BREAKER_COOLDOWN):
+        self.threshold = max(threshold, 1)
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class RateLimiter:
+    """
+    Token bucket: `rate` tokens per second, at most `burst` saved up.
+    acquire() blocks until a token is free; rate <= 0 disables limiting.
+    """
+
+    def __init__(self, rate: float = LLM_RATE_LIMIT, burst: int = LLM_RATE_BURST):
+        self.rate = rate
+        self.burst = max(burst or int(rate), 1)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def acquire(self) -> float:
+        """Take one token; returns the seconds spent waiting for it"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now (possibly going negative) so concurrent
+            # callers queue up behind each other instead of all waking at once
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class LLMClient:
+    """Thread-safe; one instance is shared by every request in a worker"""
+
+    def __init__(self, pool_size: int = LLM_POOL_SIZE, timeout: float = LLM_TIMEOUT,
+                 max_retries: int = LLM_MAX_RETRIES, backoff_base: float = LLM_BACKOFF_BASE,
+                 backoff_max: float = LLM_BACKOFF_MAX, rate_limiter: RateLimiter = None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max(max_retries, 0)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._pid = None
+        self._session: Optional[requests.Session] = None
+        self._stats = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "short_circuited": 0,
+            "rate_limited": 0,
+            "rate_limit_wait_ms": 0.0,
+        }
+
+    def _get_session(self) -> requests.Session:
+        # A session (and its sockets) must not be shared with a forked worker
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session, self._pid = session, os.getpid()
+            return self._session
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        with self._lock:
+            if url not in self._breakers:
+                self._breakers[url] = CircuitBreaker()
+            return self._breakers[url]
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Full-jitter exponential backoff, or the server's Retry-After if it sent one"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _post(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]],
+              stream: bool = False) -> requests.Response:
+        """
+        POST with retries and the circuit breaker; returns a 2xx/3xx response.
+
+        Retries connection errors, timeouts and 429/5xx responses up to
+        max_retries times. Raises CircuitOpenError without sending anything
+        while the endpoint's breaker is open, and requests exceptions for
+        anything else.
+        """
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            self._count("short_circuited")
+            raise CircuitOpenError(f"Circuit open for {url}")
+
+        self._count("calls")
+        session = self._get_session()
+        attempt = 0
+        while True:
+            waited = self.rate_limiter.acquire()
+            if waited:
+                with self._lock:
+                    self._stats["rate_limited"] += 1
+                    self._stats["rate_limit_wait_ms"] += waited * 1000
+            self._count("attempts")
+            response = None
+            try:
+                response = session.post(url, headers=headers, json=payload, timeout=self.timeout, stream=stream)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    breaker.record_success()
+                    return response
+                response.close()
+                error = requests.HTTPError(f"{response.status_code} from {url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except Exception:
+                # 4xx or similar: the endpoint is up, retrying won't help
+                if response is not None:
+                    response.close()
+                breaker.record_success()
+                raise
+
+            if attempt >= self.max_retries:
+                self._count("failures")
+                breaker.record_failure()
+                raise error
+
+            self._count("retries")
+            time.sleep(self._backoff(attempt, response))
+            attempt += 1
+
+    def post_json(self, url: str, payload: Dict[str, Any], headers: Dict[str, str] = None) -> Dict[str, Any]:
+        """POST `payload` and return the decoded JSON body (see _post for retries)"""
+        return self._post(url, payload, headers).json()
+
+    def post_stream(self, url: str, payload: Dict[str, Any], headers: Dict[str, str] = None) -> Iterator[str]:
+        """
+        POST `payload` with stream=true and yield the content deltas of the
+        OpenAI-style Server-Sent Events stream as they arrive.
+
+        Retries only happen before the first byte; an error mid-stream is
+        raised to the caller, which has already seen part of the answer.
+        """
+        payload = dict(payload, stream=True)
+        with self._post(url, payload, headers, stream=True) as response:
+            done = False
+            for line in response.iter_lines():
+                # Keep reading to the end of the body after [DONE], so the
+                # connection goes back to the pool instead of being closed
+                if done or not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    done = True
+                    continue
+                choices = json.loads(data).get("choices") or []
+                if choices:
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["breakers"] = {url: b.state for url, b in self._breakers.items()}
+        stats["rate_limit_wait_ms"] = round(stats["rate_limit_wait_ms"], 1)
+        stats["pool_size"] = self.pool_size
+        stats["rate_limit_per_second"] = self.rate_limiter.rate
+        return stats
+
+
+_client = LLMClient()
+
+
+def get_llm_client() -> LLMClient:
+    return _client
+
+
+def get_llm_client_stats() -> Dict[str, Any]:
+    return _client.stats()
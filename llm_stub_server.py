@@ -0,0 +1,200 @@
+"""
+Local stub of an OpenAI-compatible /chat/completions endpoint (plain and streaming)
+Used by the LLM client tests and benchmark (StubLLMServer.patched points
+ai_service at a fresh stub for one test); can also be run by hand:
+    python llm_stub_server.py 8001
+    LLM_BASE_URL=http://localhost:8001/v1 LLM_API_KEY=stub python app.py
+"""
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Iterator
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like a real API
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle plus
+        # delayed ACKs stall every keep-alive response by ~40 ms
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.stub._count("connections")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        stub._count("requests")
+        stub._track_in_flight(+1)
+        try:
+            if stub.delay:
+                time.sleep(stub.delay)
+            self._answer(stub, payload)
+        finally:
+            stub._track_in_flight(-1)
+
+    def _answer(self, stub, payload):
+        status = stub._next_status()
+        if status != 200:
+            self._send(status, {"error": {"message": f"stub error {status}"}}, stub.error_headers)
+            return
+
+        user_prompt = next((m["content"] for m in payload.get("messages", []) if m["role"] == "user"), "")
+        answer = f"Stub answer to: {user_prompt.strip()}"
+        if payload.get("stream"):
+            self._stream(answer)
+            return
+        self._send(200, {"choices": [{"message": {"role": "assistant", "content": answer}}]})
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _stream(self, answer: str):
+        """Send the answer word by word as OpenAI-style SSE chunks"""
+        stub = self.server.stub
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = answer.split(" ")
+        for i, word in enumerate(words):
+            if stub.fail_stream_after is not None and i >= stub.fail_stream_after:
+                self.close_connection = True  # Drop the connection mid-answer
+                return
+            delta = word if i == 0 else " " + word
+            event = {"choices": [{"delta": {"content": delta}}]}
+            self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            if stub.chunk_delay:
+                time.sleep(stub.chunk_delay)
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+
+class StubLLMServer:
+    """
+    Threaded stub server on 127.0.0.1.
+
+    queue_statuses([503, 429]) makes the next requests fail with those
+    statuses before it goes back to answering 200. `delay` adds latency to
+    every request. Counts requests and TCP connections accepted, and the
+    most requests it was handling at once (max_in_flight).
+
+    Requests with "stream": true get the answer as Server-Sent Events, one
+    word per chunk, `chunk_delay` seconds apart; fail_stream_after=N drops
+    the connection after N words.
+    """
+
+    def __init__(self, port: int = 0, delay: float = 0.0, chunk_delay: float = 0.0):
+        self.delay = delay
+        self.chunk_delay = chunk_delay
+        self.fail_stream_after = None
+        self.error_headers = {}
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cache_path = ""  # Response cache file while patched(cache=True)
+        self._statuses = deque()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def queue_statuses(self, statuses: Iterable[int]):
+        with self._lock:
+            self._statuses.extend(statuses)
+
+    def _next_status(self) -> int:
+        with self._lock:
+            return self._statuses.popleft() if self._statuses else 200
+
+    def _track_in_flight(self, delta: int):
+        with self._lock:
+            self.in_flight += delta
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @classmethod
+    @contextmanager
+    def patched(cls, cache: bool = False, **kwargs) -> Iterator["StubLLMServer"]:
+        """
+        Start a stub (kwargs as for the constructor) and point ai_service at
+        it for the duration, with a fresh single-flight group and either a
+        fresh response cache in a temp directory (cache=True) or none.
+        Everything is put back afterwards.
+        """
+        import ai_service
+        import llm_cache
+        from single_flight import SingleFlight
+
+        saved = (ai_service.LLM_API_KEY, ai_service.LLM_BASE_URL, ai_service._llm_flight,
+                 llm_cache._cache, llm_cache._cache_pid, llm_cache.LLM_CACHE_ENABLED)
+        with cls(**kwargs) as stub:
+            ai_service.LLM_API_KEY, ai_service.LLM_BASE_URL = "stub-key", stub.url
+            ai_service._llm_flight = SingleFlight("")
+            if cache:
+                stub.cache_path = os.path.join(tempfile.mkdtemp(), "llm_cache.db")
+                llm_cache._cache = llm_cache.LLMResponseCache(stub.cache_path)
+                llm_cache._cache_pid = os.getpid()
+            llm_cache.LLM_CACHE_ENABLED = cache
+            try:
+                yield stub
+            finally:
+                (ai_service.LLM_API_KEY, ai_service.LLM_BASE_URL, ai_service._llm_flight,
+                 llm_cache._cache, llm_cache._cache_pid, llm_cache.LLM_CACHE_ENABLED) = saved
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8001
+    server = StubLLMServer(port=port)
+    print(f"[STUB LLM] Serving {server.url}/chat/completions")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,187 @@
+"""
+OCR for syllabus photos and scans
+Finds the tesseract binary, cleans images up before recognition (downscale,
+grayscale, Otsu binarization), cuts very tall images into strips at blank
+rows, and recognises the strips of one or many images in parallel on a
+persistent process pool
+"""
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, Union
+
+from PIL import Image, ImageOps
+
+TESSERACT_CMD = os.getenv("TESSERACT_CMD", "")  # explicit path; otherwise PATH and the usual install dirs
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(min(os.cpu_count() or 1, 4))))
+OCR_MAX_DIM = int(os.getenv("OCR_MAX_DIM", "3000"))  # longest side in px after downscaling
+OCR_TILE_HEIGHT = int(os.getenv("OCR_TILE_HEIGHT", "1200"))  # taller images are cut into strips about this high
+OCR_MAX_IMAGES = int(os.getenv("OCR_MAX_IMAGES", "20"))  # photos per upload
+
+if sys.platform == "win32":
+    TESSERACT_LOCATIONS = (
+        r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+        r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+    )
+else:
+    TESSERACT_LOCATIONS = ("/usr/bin/tesseract", "/usr/local/bin/tesseract", "/opt/homebrew/bin/tesseract")
+
+ImageSource = Union[str, bytes]
+
+
+class OCRUnavailable(RuntimeError):
+    """No tesseract binary could be found"""
+
+
+def _executable(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+_tesseract_cmd = None
+
+
+def find_tesseract(refresh: bool = False) -> Optional[str]:
+    """
+    Path of the tesseract binary: TESSERACT_CMD if set, else `tesseract`
+    on PATH, else the platform's usual install locations. None if absent.
+    The answer is remembered; refresh=True looks again.
+    """
+    global _tesseract_cmd
+    if _tesseract_cmd is None or refresh:
+        if TESSERACT_CMD:
+            found = TESSERACT_CMD if _executable(TESSERACT_CMD) else None
+        else:
+            found = shutil.which("tesseract") or next(
+                (path for path in TESSERACT_LOCATIONS if _executable(path)), None
+            )
+        _tesseract_cmd = found or ""
+    return _tesseract_cmd or None
+
+
+def otsu_threshold(histogram: Sequence[int]) -> int:
+    """Gray level that best separates ink from paper (Otsu's method on a 256-bin histogram)"""
+    total = sum(histogram[:256])
+    sum_all = sum(level * count for level, count in enumerate(histogram[:256]))
+    best, threshold = -1.0, 127
+    weight_dark = sum_dark = 0
+    for level in range(256):
+        weight_dark += histogram[level]
+        if weight_dark == 0:
+            continue
+        weight_light = total - weight_dark
+        if weight_light == 0:
+            break
+        sum_dark += level * histogram[level]
+        mean_dark = sum_dark / weight_dark
+        mean_light = (sum_all - sum_dark) / weight_light
+        between = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+        if between > best:
+            best, threshold = between, level
+    return threshold
+
+
+def preprocess(image: Image.Image, max_dim: int = OCR_MAX_DIM) -> Image.Image:
+    """Upright, grayscale, at most max_dim px on the longest side, black text on white"""
+    image = ImageOps.exif_transpose(image).convert("L")
+    longest = max(image.size)
+    if longest > max_dim:
+        scale = max_dim / longest
+        image = image.resize((max(round(image.width * scale), 1), max(round(image.height * scale), 1)),
+                             Image.LANCZOS)
+    threshold = otsu_threshold(image.histogram())
+    return image.point([0] * (threshold + 1) + [255] * (255 - threshold))
+
+
+def split_tiles(image: Image.Image, tile_height: int = OCR_TILE_HEIGHT) -> List[Image.Image]:
+    """
+    Cut a tall image into horizontal strips about tile_height high. Each
+    cut goes through the whitest row near its target, so lines of text
+    aren't split between two strips.
+    """
+    width, height = image.size
+    if height <= tile_height * 3 // 2:
+        return [image]
+    # Average brightness of every row, via a 1-px-wide box resize
+    rows = image.convert("L").resize((1, height), Image.BOX).tobytes()
+    cuts = [0]
+    while height - cuts[-1] > tile_height * 3 // 2:
+        target = cuts[-1] + tile_height
+        window = range(target - tile_height // 4, target + tile_height // 4)
+        cuts.append(max(window, key=lambda y: (rows[y], -abs(y - target))))
+    cuts.append(height)
+    return [image.crop((0, top, width, bottom)) for top, bottom in zip(cuts, cuts[1:])]
+
+
+def prepare_image(source: ImageSource, max_dim: int = OCR_MAX_DIM,
+                  tile_height: int = OCR_TILE_HEIGHT) -> List[Image.Image]:
+    """Open, preprocess and tile one image (a path or its bytes). Runs in pool processes."""
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as image:
+        if image.format == "JPEG":
+            # Let the JPEG decoder scale down (and drop colour) while decoding
+            image.draft("L", (max_dim, max_dim))
+        return split_tiles(preprocess(image, max_dim), tile_height)
+
+
+def recognize_tile(tile: Image.Image, tesseract_cmd: str, lang: str = OCR_LANG) -> str:
+    """Runs in pool processes"""
+    import pytesseract
+
+    # Parallelism comes from the pool; tesseract's own threads would only contend
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    return pytesseract.image_to_string(tile, lang=lang)
+
+
+_ocr_pool = None
+_ocr_pool_pid = None
+_ocr_pool_lock = threading.Lock()
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Persistent OCR process pool, created on first use (per process)"""
+    global _ocr_pool, _ocr_pool_pid
+    with _ocr_pool_lock:
+        if _ocr_pool is None or _ocr_pool_pid != os.getpid():
+            _ocr_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+            _ocr_pool_pid = os.getpid()
+        return _ocr_pool
+
+
+def ocr_images(sources: Sequence[ImageSource], executor: Optional[Executor] = None,
+               on_progress: Optional[Callable[[int, int], None]] = None) -> str:
+    """
+    Text of one or more images (paths or bytes), in order; images are
+    separated by a blank line.
+
+    Every image is prepared and every strip recognised as its own task on
+    `executor` (default: the OCR pool), so one large photo or several small
+    ones keep all workers busy. on_progress(strips_done, strip_count) is
+    called as strips finish. Raises OCRUnavailable without tesseract.
+    """
+    tesseract_cmd = find_tesseract()
+    if tesseract_cmd is None:
+        raise OCRUnavailable("Tesseract OCR not found. Install it or set TESSERACT_CMD.")
+    executor = executor or _get_ocr_pool()
+
+    prepared = [executor.submit(prepare_image, source, OCR_MAX_DIM, OCR_TILE_HEIGHT) for source in sources]
+    strips = [[executor.submit(recognize_tile, tile, tesseract_cmd, OCR_LANG) for tile in future.result()]
+              for future in prepared]
+
+    total = sum(len(futures) for futures in strips)
+    done = 0
+    pages = []
+    for futures in strips:
+        parts = []
+        for future in futures:
+            parts.append(future.result().strip())
+            done += 1
+            if on_progress:
+                on_progress(done, total)
+        pages.append("\n".join(part for part in parts if part))
+    return "\n\n".join(pages)
@@ -0,0 +1,240 @@
+"""
+Plan cache for Study Saathi
+Caches generated daily/weekly plans keyed on a hash of the planner inputs,
+so repeated requests with the same subjects, hours and slots skip the planner
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from planner import DEFAULT_TIME_SLOTS, generate_daily_plan, generate_weekly_plan
+
+# Bump when the planner's output changes for the same inputs, so entries
+# left in the shared SQLite tier by an older version are never served
+PLAN_CACHE_VERSION = 1
+
+PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "256"))
+PLAN_CACHE_TTL = float(os.getenv("PLAN_CACHE_TTL", "3600"))  # seconds
+PLAN_CACHE_DB = os.getenv("PLAN_CACHE_DB", "")  # SQLite file shared by all workers; empty = in-process only
+
+# Expired rows are purged from the SQLite tier every this many writes
+_DISK_PURGE_EVERY = 100
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def plan_cache_key(plan_type: str, subjects, daily_hours: float,
+                   free_time_slots=None, date: str = None, subject_stats=None) -> str:
+    """
+    Hash of everything the planner output depends on.
+
+    Defaults are filled in first, so an omitted field and its explicit
+    default share a key. Daily plans count days-left from today, so today's
+    date is part of the key as well. Adaptive plans also depend on the
+    student's subject stats, which change with every completed task.
+    """
+    today = datetime.today().strftime("%Y-%m-%d")
+    payload = {
+        "version": PLAN_CACHE_VERSION,
+        "type": plan_type,
+        "subjects": subjects,
+        "daily_hours": float(daily_hours),
+        "free_time_slots": DEFAULT_TIME_SLOTS if free_time_slots is None else free_time_slots,
+        "date": date or today,
+        "today": today if plan_type == "daily" else None,
+        "subject_stats": subject_stats,
+    }
+    return hashlib.sha256(_canonical(payload).encode("utf-8")).hexdigest()
+
+
+def plan_fingerprint(plan_json: str) -> str:
+    """Content hash stored with a saved plan to detect unchanged rewrites"""
+    return hashlib.sha256(plan_json.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """
+    LRU + TTL cache of plans, with an optional shared SQLite tier.
+
+    Entries are stored as JSON text and decoded on every hit, so callers
+    get their own copy and can't corrupt the cached plan.
+    """
+
+    def __init__(self, size: int = PLAN_CACHE_SIZE, ttl: float = PLAN_CACHE_TTL,
+                 db_path: str = PLAN_CACHE_DB):
+        self.size = max(size, 1)
+        self.ttl = ttl
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str, str]]" = OrderedDict()
+        self._disk_writes = 0
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+        if self.db_path:
+            self._init_disk()
+
+    # SQLite tier
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_disk(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS plan_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    plan TEXT NOT NULL,
+                    plan_hash TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+        conn.close()
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str, str]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT expires_at, plan, plan_hash FROM plan_cache WHERE cache_key=? AND expires_at>?",
+                (key, time.time())
+            ).fetchone()
+        finally:
+            conn.close()
+        return tuple(row) if row else None
+
+    def _disk_put(self, key: str, entry: Tuple[float, str, str]):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO plan_cache (cache_key, expires_at, plan, plan_hash) VALUES (?, ?, ?, ?)",
+                    (key,) + entry
+                )
+                with self._lock:
+                    self._disk_writes += 1
+                    purge = self._disk_writes % _DISK_PURGE_EVERY == 0
+                if purge:
+                    conn.execute("DELETE FROM plan_cache WHERE expires_at<=?", (time.time(),))
+        finally:
+            conn.close()
+
+    # In-process tier
+
+    def _remember(self, key: str, entry: Tuple[float, str, str]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, str, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                self._stats["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def get_or_create(self, key: str, generate: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+        """
+        Return (plan, plan_hash) for `key`, calling generate() only on a miss.
+
+        plan_hash is a fingerprint of the plan content; pass it to
+        save_study_plan so an unchanged plan isn't rewritten.
+        """
+        entry = self._lookup(key)
+
+        if entry is None and self.db_path:
+            try:
+                entry = self._disk_get(key)
+            except sqlite3.Error as e:
+                print(f"[PLAN CACHE] Disk tier unavailable: {e}")
+                entry = None
+            if entry is not None:
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+                self._remember(key, entry)
+
+        if entry is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            plan_json = json.dumps(generate(), ensure_ascii=False)
+            entry = (time.time() + self.ttl, plan_json, plan_fingerprint(plan_json))
+            self._remember(key, entry)
+            if self.db_path:
+                try:
+                    self._disk_put(key, entry)
+                except sqlite3.Error as e:
+                    print(f"[PLAN CACHE] Disk tier unavailable: {e}")
+
+        return json.loads(entry[1]), entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM plan_cache")
+            finally:
+                conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        stats["capacity"] = self.size
+        stats["ttl_seconds"] = self.ttl
+        stats["shared_db"] = bool(self.db_path)
+        return stats
+
+
+_cache = PlanCache()
+
+
+def cached_daily_plan(subjects, daily_hours: float, free_time_slots=None,
+                      date: str = None, subject_stats=None) -> Tuple[Dict[str, Any], str]:
+    """generate_daily_plan through the cache; returns (plan, plan_hash)"""
+    key = plan_cache_key("daily", subjects, daily_hours, free_time_slots, date, subject_stats)
+    return _cache.get_or_create(key, lambda: generate_daily_plan(
+        subjects=subjects, daily_hours=daily_hours, free_time_slots=free_time_slots, date=date,
+        subject_stats=subject_stats
+    ))
+
+
+def cached_weekly_plan(subjects, daily_hours: float, free_time_slots=None,
+                       start_date: str = None, subject_stats=None) -> Tuple[Dict[str, Any], str]:
+    """generate_weekly_plan through the cache; returns (plan, plan_hash)"""
+    key = plan_cache_key("weekly", subjects, daily_hours, free_time_slots, start_date, subject_stats)
+    return _cache.get_or_create(key, lambda: generate_weekly_plan(
+        subjects=subjects, daily_hours=daily_hours, free_time_slots=free_time_slots, start_date=start_date,
+        subject_stats=subject_stats
+    ))
+
+
+def get_plan_cache_stats() -> Dict[str, Any]:
+    return _cache.stats()
@@ -1,232 +1,537 @@
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
-
-DIFFICULTY_WEIGHT = {
-    "easy": 1,
-    "medium": 2,
-    "hard": 3
-}
-
-# Default time slots
-DEFAULT_TIME_SLOTS = [
-    {"start": "06:00", "end": "08:00", "label": "Morning"},
-    {"start": "09:00", "end": "11:00", "label": "Late Morning"},
-    {"start": "14:00", "end": "16:00", "label": "Afternoon"},
-    {"start": "17:00", "end": "19:00", "label": "Evening"},
-    {"start": "20:00", "end": "22:00", "label": "Night"}
-]
-
-def days_until_exam(exam_date: str) -> int:
-    """Calculate days until exam date"""
-    today = datetime.today().date()
-    try:
-        exam = datetime.strptime(exam_date, "%Y-%m-%d").date()
-        return max((exam - today).days, 1)
-    except ValueError:
-        return 30 # Default safety
-
-def calculate_priority_score(subject: Dict[str, Any]) -> float:
-    """Calculate priority score based on difficulty and days until exam"""
-    days_left = days_until_exam(subject["exam_date"])
-    difficulty = subject.get("difficulty", "medium").lower()
-    weight = DIFFICULTY_WEIGHT.get(difficulty, 2)
-    
-    # Higher priority for harder subjects and closer exams
-    priority_score = (weight * 10) / days_left
-    
-    # Boost priority if exam is very close (within 7 days)
-    if days_left <= 7:
-        priority_score *= 1.5
-    
-    return round(priority_score, 2)
-
-def allocate_time_slots(subjects: List[Dict[str, Any]], daily_hours: float) -> List[Dict[str, Any]]:
-    """Allocate study time to subjects based on priority"""
-    if not subjects:
-        return []
-    
-    # Calculate priority for each subject
-    plan = []
-    for subject in subjects:
-        priority = calculate_priority_score(subject)
-        plan.append({
-            "subject": subject["name"],
-            "subject_id": subject.get("id", subject["name"].lower().replace(" ", "_")),
-            "priority": priority,
-            "difficulty": subject.get("difficulty", "medium"),
-            "exam_date": subject["exam_date"],
-            "days_until_exam": days_until_exam(subject["exam_date"]),
-            "topics": subject.get("topics", []),
-            "study_hours": 0  # Will be calculated
-        })
-    
-    # Sort by priority (higher first)
-    plan.sort(key=lambda x: x["priority"], reverse=True)
-    
-    # Allocate time proportionally based on priority
-    total_priority = sum(item["priority"] for item in plan)
-    
-    if total_priority > 0:
-        for item in plan:
-            allocated_time = (item["priority"] / total_priority) * daily_hours
-            item["study_hours"] = round(allocated_time, 2)
-    
-    return plan
-
-def generate_daily_plan(subjects: List[Dict[str, Any]], daily_hours: float,
-                       free_time_slots: List[Dict[str, str]] = None,
-                       date: str = None) -> Dict[str, Any]:
-    """Generate a detailed daily study plan with time slots and BREAKS"""
-    
-    if date is None:
-        date = datetime.today().strftime("%Y-%m-%d")
-    
-    if free_time_slots is None:
-        free_time_slots = DEFAULT_TIME_SLOTS
-    
-    # 1. Allocate hours per subject based on user input 'daily_hours'
-    allocated_plan = allocate_time_slots(subjects, daily_hours)
-    
-    daily_schedule = []
-    remaining_subjects = allocated_plan.copy()
-    
-    # Track how much we've scheduled to insert breaks
-    BREAK_DURATION_MINS = 10
-    
-    for slot in free_time_slots:
-        slot_start = datetime.strptime(slot["start"], "%H:%M")
-        slot_end = datetime.strptime(slot["end"], "%H:%M")
-        
-        # Calculate total minutes in this slot
-        slot_duration_mins = (slot_end - slot_start).total_seconds() / 60
-        
-        current_time_mins = 0
-        slot_activities = []
-        
-        while current_time_mins < slot_duration_mins and remaining_subjects:
-            # Pick the highest priority subject that still needs time
-            # We round robin slightly or sticking to priority list is fine
-            # Let's stick to the list order (Highest Priority First)
-            
-            subject = remaining_subjects[0]
-            
-            if subject["study_hours"] <= 0.1:
-                remaining_subjects.pop(0)
-                continue
-                
-            # Determine session length (e.g. max 60 mins per session before break)
-            SESSION_MAX_MINS = 60
-            time_available_mins = slot_duration_mins - current_time_mins
-            
-            # How much time does this subject need?
-            needed_mins = subject["study_hours"] * 60
-            
-            actual_session_mins = min(needed_mins, SESSION_MAX_MINS, time_available_mins)
-            
-            if actual_session_mins < 10: 
-                # Too small time slot, skip to next big slot or finish
-                break
-                
-            # Add Study Activity
-            start_ts = slot_start + timedelta(minutes=current_time_mins)
-            end_ts = start_ts + timedelta(minutes=actual_session_mins)
-            
-            slot_activities.append({
-                "subject": subject["subject"],
-                "subject_id": subject["subject_id"],
-                "type": "study",
-                "duration_minutes": int(actual_session_mins),
-                "start_time": start_ts.strftime("%H:%M"),
-                "end_time": end_ts.strftime("%H:%M"),
-                "difficulty": subject["difficulty"],
-                "topics": subject.get("topics", [])
-            })
-            
-            # Update counters
-            subject["study_hours"] -= (actual_session_mins / 60)
-            current_time_mins += actual_session_mins
-            
-            # Remove subject if done (or close enough)
-            if subject["study_hours"] <= 0.1:
-                if subject in remaining_subjects:
-                    remaining_subjects.remove(subject)
-
-            
-            # Insert Break if there is time left
-            if current_time_mins + BREAK_DURATION_MINS <= slot_duration_mins and subject["study_hours"] > 0:
-                b_start = end_ts
-                b_end = b_start + timedelta(minutes=BREAK_DURATION_MINS)
-                
-                slot_activities.append({
-                    "subject": "Break",
-                    "subject_id": "break",
-                    "type": "break",
-                    "duration_minutes": BREAK_DURATION_MINS,
-                    "start_time": b_start.strftime("%H:%M"),
-                    "end_time": b_end.strftime("%H:%M"),
-                    "details": "Relax, stretch, drink water!"
-                })
-                current_time_mins += BREAK_DURATION_MINS
-
-        if slot_activities:
-            daily_schedule.append({
-                "time_slot": slot["label"],
-                "slot_start": slot["start"],
-                "slot_end": slot["end"],
-                "activities": slot_activities
-            })
-
-    # Summary
-    unallocated = [s for s in remaining_subjects if s["study_hours"] > 0.1]
-    
-    return {
-        "date": date,
-        "total_study_hours": daily_hours,
-        "schedule": daily_schedule,
-        "summary": {
-            "subjects_count": len(allocated_plan),
-            "time_slots_used": len(daily_schedule),
-            "unallocated_subjects": len(unallocated)
-        },
-        "subject_priorities": allocated_plan
-    }
-    
-def generate_weekly_plan(subjects: List[Dict[str, Any]], daily_hours: float,
-                         free_time_slots: List[Dict[str, str]] = None,
-                         start_date: str = None) -> Dict[str, Any]:
-    """Generate a weekly study plan"""
-    if start_date is None:
-        start_date = datetime.today().strftime("%Y-%m-%d")
-    
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    weekly_plan = []
-    
-    for day_offset in range(7):
-        current_date = (start + timedelta(days=day_offset)).strftime("%Y-%m-%d")
-        day_plan = generate_daily_plan(subjects, daily_hours, free_time_slots, current_date)
-        weekly_plan.append(day_plan)
-    
-    return {
-        "week_start": start_date,
-        "week_end": (start + timedelta(days=6)).strftime("%Y-%m-%d"),
-        "daily_hours": daily_hours,
-        "days": weekly_plan,
-        "summary": {
-            "total_subjects": len(subjects),
-            "total_study_hours_week": daily_hours * 7
-        }
-    }
-
-def validate_student_inputs(data: Dict[str, Any]) -> Tuple[bool, str]:
-    """Validate student input data"""
-    if "subjects" not in data:
-        return False, "Missing 'subjects' field"
-    
-    if not isinstance(data["subjects"], list) or len(data["subjects"]) == 0:
-        return False, "'subjects' must be a non-empty list"
-    
-    if "daily_hours" not in data:
-        # Default to 6 if not provided, allowing flexible inputs
-        data["daily_hours"] = 6.0
-    
-    return True, "Valid"
+from collections import deque
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Sequence, Union
+
+DIFFICULTY_WEIGHT = {
+    "easy": 1,
+    "medium": 2,
+    "hard": 3
+}
+
+# Default time slots
+DEFAULT_TIME_SLOTS = [
+    {"start": "06:00", "end": "08:00", "label": "Morning"},
+    {"start": "09:00", "end": "11:00", "label": "Late Morning"},
+    {"start": "14:00", "end": "16:00", "label": "Afternoon"},
+    {"start": "17:00", "end": "19:00", "label": "Evening"},
+    {"start": "20:00", "end": "22:00", "label": "Night"}
+]
+
+# Scheduler settings
+SESSION_MAX_MINS = 60
+BREAK_DURATION_MINS = 10
+MAX_HORIZON_DAYS = 366
+
+# Adaptive mode: how far a neglected subject's priority may be raised
+ADAPTIVE_STRENGTH = 1.0  # priority x (1 + strength x neglect), neglect in [0, 1]
+ADAPTIVE_MAX_BOOST = 2.0
+ADAPTIVE_PRIOR_TASKS = 4  # a subject with little history counts as on track
+
+# Clock times are tracked as integer microseconds since midnight, the same
+# resolution the old datetime/timedelta arithmetic rounded to
+US_PER_MINUTE = 60_000_000
+_CLOCK_LABELS = [f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)]
+
+
+@lru_cache(maxsize=256)
+def _parse_clock_minutes(value: str) -> int:
+    """'HH:MM' -> minutes since midnight (validated by strptime, cached per string)"""
+    parsed = datetime.strptime(value, "%H:%M")
+    return parsed.hour * 60 + parsed.minute
+
+
+def _format_clock(offset_us: int) -> str:
+    """Microseconds since midnight -> 'HH:MM' (truncated, wrapping past midnight)"""
+    return _CLOCK_LABELS[(offset_us // US_PER_MINUTE) % (24 * 60)]
+
+
+@lru_cache(maxsize=1024)
+def _parse_exam_date(exam_date: str) -> Optional[date]:
+    """'YYYY-MM-DD' -> date, or None if it can't be parsed (cached per string)"""
+    try:
+        return datetime.strptime(exam_date, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _difficulty_weight(subject: Dict[str, Any]) -> int:
+    return DIFFICULTY_WEIGHT.get(subject.get("difficulty", "medium").lower(), 2)
+
+
+def _priority(weight: int, days_left: int) -> float:
+    # Higher priority for harder subjects and closer exams
+    priority_score = (weight * 10) / days_left
+    
+    # Boost priority if exam is very close (within 7 days)
+    if days_left <= 7:
+        priority_score *= 1.5
+    
+    return round(priority_score, 2)
+
+
+def days_until_exam(exam_date: str) -> int:
+    """Calculate days until exam date"""
+    exam = _parse_exam_date(exam_date)
+    if exam is None:
+        return 30 # Default safety
+    return max((exam - datetime.today().date()).days, 1)
+
+def calculate_priority_score(subject: Dict[str, Any], days_left: int = None) -> float:
+    """Calculate priority score based on difficulty and days until exam"""
+    if days_left is None:
+        days_left = days_until_exam(subject["exam_date"])
+    return _priority(_difficulty_weight(subject), days_left)
+
+def _apply_adaptive(plan: List[Dict[str, Any]], subject_stats: Dict[str, Dict[str, Any]]):
+    """
+    Raise the priority of subjects the student keeps skipping.
+    
+    Neglect averages two signals from the student's history (see
+    database.get_subject_stats): the share of planned tasks left undone,
+    and how far the subject's share of minutes actually studied falls
+    short of its share of priority. Both are shrunk toward "on track" for
+    subjects with little history. O(subjects).
+    """
+    total_priority = sum(item["priority"] for item in plan)
+    studied = {item["subject_id"]: subject_stats.get(item["subject_id"], {}).get("completed_minutes", 0)
+               for item in plan}
+    total_studied = sum(studied.values())
+
+    for item in plan:
+        stats = subject_stats.get(item["subject_id"], {})
+        planned, completed = stats.get("planned_tasks", 0), stats.get("completed_tasks", 0)
+        completion_ratio = (completed + ADAPTIVE_PRIOR_TASKS) / (planned + ADAPTIVE_PRIOR_TASKS)
+
+        shortfall = 0.0
+        if total_priority > 0 and total_studied > 0:
+            target_share = item["priority"] / total_priority
+            shortfall = max(target_share - studied[item["subject_id"]] / total_studied, 0) / target_share
+            # Shrunk by the same prior: a new subject isn't neglected just
+            # because the others have minutes on record
+            shortfall *= planned / (planned + ADAPTIVE_PRIOR_TASKS)
+
+        neglect = ((1 - completion_ratio) + shortfall) / 2
+        boost = min(1 + ADAPTIVE_STRENGTH * neglect, ADAPTIVE_MAX_BOOST)
+        # Finer rounding than _priority: far-off exams have priorities around
+        # 0.02, where two decimals would swallow a small boost
+        item["priority"] = round(item["priority"] * boost, 4)
+        item["adaptive_boost"] = round(boost, 2)
+        item["completion_ratio"] = round(completed / planned, 2) if planned else None
+
+
+def _allocate(entries: List[Tuple[Dict[str, Any], int, int]], daily_hours: float,
+              subject_stats: Dict[str, Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Priority-proportional hours for (subject, days_left, weight) entries"""
+    plan = []
+    for subject, days_left, weight in entries:
+        plan.append({
+            "subject": subject["name"],
+            "subject_id": subject.get("id", subject["name"].lower().replace(" ", "_")),
+            "priority": _priority(weight, days_left),
+            "difficulty": subject.get("difficulty", "medium"),
+            "exam_date": subject["exam_date"],
+            "days_until_exam": days_left,
+            "topics": subject.get("topics", []),
+            "study_hours": 0  # Will be calculated
+        })
+    
+    if subject_stats is not None:
+        _apply_adaptive(plan, subject_stats)
+    
+    # Sort by priority (higher first)
+    plan.sort(key=lambda x: x["priority"], reverse=True)
+    
+    # Allocate time proportionally based on priority
+    total_priority = sum(item["priority"] for item in plan)
+    
+    if total_priority > 0:
+        for item in plan:
+            allocated_time = (item["priority"] / total_priority) * daily_hours
+            item["study_hours"] = round(allocated_time, 2)
+    
+    return plan
+
+def allocate_time_slots(subjects: List[Dict[str, Any]], daily_hours: float,
+                        subject_stats: Dict[str, Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Allocate study time to subjects based on priority
+    
+    Adaptive mode: pass the student's subject_stats ({subject_id: totals},
+    from database.get_subject_stats) to shift hours toward neglected subjects.
+    """
+    if not subjects:
+        return []
+    
+    entries = [(subject, days_until_exam(subject["exam_date"]), _difficulty_weight(subject))
+               for subject in subjects]
+    return _allocate(entries, daily_hours, subject_stats)
+
+
+def allocate_time_slots_batch(batch: Dict[str, Sequence[Any]],
+                              daily_hours: Union[float, Dict[str, float]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Vectorized allocate_time_slots for many students at once (nightly batch jobs).
+    
+    Args:
+        batch: Columnar input, one entry per (student, subject):
+            "student_id", "name", "exam_date", "difficulty" (required)
+            "id", "topics" (optional, None entries fall back like the scalar path)
+        daily_hours: Hours per day for every student, or {student_id: hours}
+    
+    Returns:
+        {student_id: allocated plan}, each list identical to what
+        allocate_time_slots returns for that student's subjects
+    """
+    import numpy as np
+
+    student_ids = list(batch["student_id"])
+    n = len(student_ids)
+    if n == 0:
+        return {}
+
+    names = list(batch["name"])
+    exam_dates = list(batch["exam_date"])
+    difficulties = list(batch.get("difficulty") or ["medium"] * n)
+    ids = list(batch.get("id") or [None] * n)
+    topics = list(batch.get("topics") or [None] * n)
+
+    # Exam dates and difficulties repeat heavily across students: parse each distinct value once
+    unique_dates, date_idx = np.unique(np.asarray(exam_dates, dtype=object).astype(str), return_inverse=True)
+    days_left = np.array([days_until_exam(d) for d in unique_dates], dtype=np.int64)[date_idx]
+
+    difficulties = [d if d is not None else "medium" for d in difficulties]
+    unique_diff, diff_idx = np.unique(np.asarray(difficulties, dtype=str), return_inverse=True)
+    weights = np.array([DIFFICULTY_WEIGHT.get(d.lower(), 2) for d in unique_diff], dtype=np.int64)[diff_idx]
+
+    # Same float operations, in the same order, as calculate_priority_score
+    raw_priority = (weights * 10) / days_left
+    raw_priority = np.where(days_left <= 7, raw_priority * 1.5, raw_priority)
+    priority = np.array([round(p, 2) for p in raw_priority.tolist()])
+
+    # Group rows per student, highest priority first; ties keep input order like list.sort
+    unique_students, student_idx = np.unique(np.asarray(student_ids, dtype=str), return_inverse=True)
+    order = np.lexsort((np.arange(n), -priority, student_idx))
+    sorted_students = student_idx[order]
+    sorted_priority = priority[order]
+
+    # Position of every row inside its student's group, then a padded (students x subjects) matrix
+    group_start = np.searchsorted(sorted_students, np.arange(len(unique_students)))
+    position = np.arange(n) - group_start[sorted_students]
+    padded = np.zeros((len(unique_students), int(position.max()) + 1))
+    padded[sorted_students, position] = sorted_priority
+
+    # Sum column by column so each student's total adds up left to right, exactly like sum()
+    total_priority = np.zeros(len(unique_students))
+    for column in padded.T:
+        total_priority = total_priority + column
+
+    if isinstance(daily_hours, dict):
+        hours_by_student = {str(k): float(v) for k, v in daily_hours.items()}
+        hours = np.array([hours_by_student[s] for s in unique_students.tolist()])
+    else:
+        hours = np.full(len(unique_students), float(daily_hours))
+
+    row_total = total_priority[sorted_students]
+    safe_total = np.where(row_total > 0, row_total, 1.0)
+    allocated = np.where(row_total > 0, (sorted_priority / safe_total) * hours[sorted_students], 0.0)
+    study_hours = [round(h, 2) if t > 0 else 0 for h, t in zip(allocated.tolist(), row_total.tolist())]
+
+    # Build the output dicts from plain lists: indexing numpy arrays per row is slow
+    student_keys = unique_students.tolist()
+    plans = {student_id: [] for student_id in student_keys}
+    days_list = days_left.tolist()
+    for row, student, prio, hours_k in zip(order.tolist(), sorted_students.tolist(),
+                                           sorted_priority.tolist(), study_hours):
+        name = names[row]
+        plans[student_keys[student]].append({
+            "subject": name,
+            "subject_id": ids[row] if ids[row] is not None else name.lower().replace(" ", "_"),
+            "priority": prio,
+            "difficulty": difficulties[row],
+            "exam_date": exam_dates[row],
+            "days_until_exam": days_list[row],
+            "topics": topics[row] if topics[row] is not None else [],
+            "study_hours": hours_k
+        })
+
+    return plans
+
+
+def generate_daily_plans_batch(students: Dict[str, Dict[str, Any]],
+                               free_time_slots: List[Dict[str, str]] = None,
+                               date: str = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Daily plans for many students, with priorities/hours from allocate_time_slots_batch
+    
+    Args:
+        students: {student_id: {"subjects": [...], "daily_hours": 6.0}}
+    """
+    batch = {"student_id": [], "name": [], "exam_date": [], "difficulty": [], "id": [], "topics": []}
+    for student_id, data in students.items():
+        for subject in data["subjects"]:
+            batch["student_id"].append(student_id)
+            batch["name"].append(subject["name"])
+            batch["exam_date"].append(subject["exam_date"])
+            batch["difficulty"].append(subject.get("difficulty", "medium"))
+            batch["id"].append(subject.get("id"))
+            batch["topics"].append(subject.get("topics"))
+
+    daily_hours = {student_id: float(data["daily_hours"]) for student_id, data in students.items()}
+    allocations = allocate_time_slots_batch(batch, daily_hours)
+
+    return {
+        student_id: generate_daily_plan(
+            data["subjects"], daily_hours[student_id], free_time_slots, date,
+            allocated_plan=allocations.get(str(student_id), [])
+        )
+        for student_id, data in students.items()
+    }
+
+
+def _slot_geometry(free_time_slots: List[Dict[str, str]]) -> List[Tuple[Dict[str, str], int, float]]:
+    """Parse slots once into (slot, start offset in microseconds, length in minutes)"""
+    geometry = []
+    for slot in free_time_slots:
+        slot_start_mins = _parse_clock_minutes(slot["start"])
+        slot_end_mins = _parse_clock_minutes(slot["end"])
+        geometry.append((slot, slot_start_mins * US_PER_MINUTE, float(slot_end_mins - slot_start_mins)))
+    return geometry
+
+
+def _schedule_slots(allocated_plan: List[Dict[str, Any]],
+                    geometry: List[Tuple[Dict[str, str], int, float]]) -> Tuple[List[Dict[str, Any]], deque]:
+    """
+    Fill the slots with study sessions and breaks, highest priority first.
+    Consumes study_hours on the allocated_plan items.
+    
+    Returns:
+        (daily_schedule, subjects still waiting for time)
+    """
+    daily_schedule = []
+    remaining_subjects = deque(allocated_plan)
+    
+    for slot, slot_start_us, slot_duration_mins in geometry:
+        current_time_mins = 0
+        slot_activities = []
+        
+        while current_time_mins < slot_duration_mins and remaining_subjects:
+            # Stick to the list order (Highest Priority First)
+            subject = remaining_subjects[0]
+            
+            if subject["study_hours"] <= 0.1:
+                remaining_subjects.popleft()
+                continue
+                
+            # Determine session length (max 60 mins per session before break)
+            time_available_mins = slot_duration_mins - current_time_mins
+            
+            # How much time does this subject need?
+            needed_mins = subject["study_hours"] * 60
+            
+            actual_session_mins = min(needed_mins, SESSION_MAX_MINS, time_available_mins)
+            
+            if actual_session_mins < 10: 
+                # Too small time slot, skip to next big slot or finish
+                break
+                
+            # Add Study Activity (offsets rounded to microseconds, as timedelta does)
+            start_us = slot_start_us + round(current_time_mins * US_PER_MINUTE)
+            end_us = start_us + round(actual_session_mins * US_PER_MINUTE)
+            
+            slot_activities.append({
+                "subject": subject["subject"],
+                "subject_id": subject["subject_id"],
+                "type": "study",
+                "duration_minutes": int(actual_session_mins),
+                "start_time": _format_clock(start_us),
+                "end_time": _format_clock(end_us),
+                "difficulty": subject["difficulty"],
+                "topics": subject.get("topics", [])
+            })
+            
+            # Update counters
+            subject["study_hours"] -= (actual_session_mins / 60)
+            current_time_mins += actual_session_mins
+            
+            # Remove subject if done (or close enough)
+            if subject["study_hours"] <= 0.1:
+                remaining_subjects.popleft()
+
+            # Insert Break if there is time left
+            if current_time_mins + BREAK_DURATION_MINS <= slot_duration_mins and subject["study_hours"] > 0:
+                slot_activities.append({
+                    "subject": "Break",
+                    "subject_id": "break",
+                    "type": "break",
+                    "duration_minutes": BREAK_DURATION_MINS,
+                    "start_time": _format_clock(end_us),
+                    "end_time": _format_clock(end_us + BREAK_DURATION_MINS * US_PER_MINUTE),
+                    "details": "Relax, stretch, drink water!"
+                })
+                current_time_mins += BREAK_DURATION_MINS
+
+        if slot_activities:
+            daily_schedule.append({
+                "time_slot": slot["label"],
+                "slot_start": slot["start"],
+                "slot_end": slot["end"],
+                "activities": slot_activities
+            })
+
+    return daily_schedule, remaining_subjects
+
+
+def generate_daily_plan(subjects: List[Dict[str, Any]], daily_hours: float,
+                       free_time_slots: List[Dict[str, str]] = None,
+                       date: str = None,
+                       allocated_plan: List[Dict[str, Any]] = None,
+                       subject_stats: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Generate a detailed daily study plan with time slots and BREAKS
+    (adaptive when subject_stats is given, see allocate_time_slots)
+    """
+    
+    if date is None:
+        date = datetime.today().strftime("%Y-%m-%d")
+    
+    if free_time_slots is None:
+        free_time_slots = DEFAULT_TIME_SLOTS
+    
+    # 1. Allocate hours per subject based on user input 'daily_hours'
+    #    (batch jobs pass an allocation precomputed by allocate_time_slots_batch)
+    if allocated_plan is None:
+        allocated_plan = allocate_time_slots(subjects, daily_hours, subject_stats)
+    
+    daily_schedule, remaining_subjects = _schedule_slots(allocated_plan, _slot_geometry(free_time_slots))
+    
+    return _daily_plan_result(date, daily_hours, daily_schedule, remaining_subjects, allocated_plan)
+
+
+def _daily_plan_result(date: str, daily_hours: float, daily_schedule: List[Dict[str, Any]],
+                       remaining_subjects: deque, allocated_plan: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Summary
+    unallocated = [s for s in remaining_subjects if s["study_hours"] > 0.1]
+    
+    return {
+        "date": date,
+        "total_study_hours": daily_hours,
+        "schedule": daily_schedule,
+        "summary": {
+            "subjects_count": len(allocated_plan),
+            "time_slots_used": len(daily_schedule),
+            "unallocated_subjects": len(unallocated)
+        },
+        "subject_priorities": allocated_plan
+    }
+
+
+def _plan_days(subjects: List[Dict[str, Any]], daily_hours: float,
+               free_time_slots: List[Dict[str, str]], start: date, day_count: int,
+               skip_finished_exams: bool = False,
+               subject_stats: Dict[str, Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Incremental multi-day engine behind the weekly and horizon plans.
+    
+    Exam dates, difficulty weights and slot times are parsed once; each day
+    only shifts every subject's days-left by one and re-runs allocation and
+    slot filling. Days-left is counted from the day being planned.
+    """
+    if free_time_slots is None:
+        free_time_slots = DEFAULT_TIME_SLOTS
+    geometry = _slot_geometry(free_time_slots)
+
+    # Days from `start` to each exam (None when the date can't be parsed)
+    prepared = []
+    for subject in subjects:
+        exam = _parse_exam_date(subject["exam_date"])
+        prepared.append((subject, (exam - start).days if exam else None, _difficulty_weight(subject)))
+
+    days = []
+    for offset in range(day_count):
+        entries = []
+        for subject, base_days, weight in prepared:
+            if base_days is None:
+                entries.append((subject, 30, weight))  # Default safety, as in days_until_exam
+            elif base_days - offset >= 0 or not skip_finished_exams:
+                entries.append((subject, max(base_days - offset, 1), weight))
+
+        allocated_plan = _allocate(entries, daily_hours, subject_stats)
+        daily_schedule, remaining_subjects = _schedule_slots(allocated_plan, geometry)
+        days.append(_daily_plan_result(
+            (start + timedelta(days=offset)).strftime("%Y-%m-%d"),
+            daily_hours, daily_schedule, remaining_subjects, allocated_plan
+        ))
+    return days
+
+
+def generate_weekly_plan(subjects: List[Dict[str, Any]], daily_hours: float,
+                         free_time_slots: List[Dict[str, str]] = None,
+                         start_date: str = None,
+                         subject_stats: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Generate a weekly study plan (adaptive when subject_stats is given)"""
+    if start_date is None:
+        start_date = datetime.today().strftime("%Y-%m-%d")
+    
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    weekly_plan = _plan_days(subjects, daily_hours, free_time_slots, start.date(), 7,
+                             subject_stats=subject_stats)
+    
+    return {
+        "week_start": start_date,
+        "week_end": (start + timedelta(days=6)).strftime("%Y-%m-%d"),
+        "daily_hours": daily_hours,
+        "days": weekly_plan,
+        "summary": {
+            "total_subjects": len(subjects),
+            "total_study_hours_week": daily_hours * 7
+        }
+    }
+
+def generate_horizon_plan(subjects: List[Dict[str, Any]], daily_hours: float,
+                          free_time_slots: List[Dict[str, str]] = None,
+                          start_date: str = None, days: int = None) -> Dict[str, Any]:
+    """
+    Generate an N-day plan (e.g. 14/30/90 days) for exam season.
+    
+    With days=None the plan runs up to the last exam date. A subject is
+    dropped from the days after its exam.
+    """
+    if start_date is None:
+        start_date = datetime.today().strftime("%Y-%m-%d")
+    
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    
+    if days is None:
+        exams = [_parse_exam_date(subject["exam_date"]) for subject in subjects]
+        exams = [exam for exam in exams if exam is not None]
+        days = (max(exams) - start).days + 1 if exams else 7
+    days = min(max(int(days), 1), MAX_HORIZON_DAYS)
+    
+    plan_days = _plan_days(subjects, daily_hours, free_time_slots, start, days, skip_finished_exams=True)
+    
+    return {
+        "start_date": start_date,
+        "end_date": (start + timedelta(days=days - 1)).strftime("%Y-%m-%d"),
+        "horizon_days": days,
+        "daily_hours": daily_hours,
+        "days": plan_days,
+        "summary": {
+            "total_subjects": len(subjects),
+            "total_study_hours": daily_hours * days
+        }
+    }
+
+def validate_student_inputs(data: Dict[str, Any]) -> Tuple[bool, str]:
+    """Validate student input data"""
+    if "subjects" not in data:
+        return False, "Missing 'subjects' field"
+    
+    if not isinstance(data["subjects"], list) or len(data["subjects"]) == 0:
+        return False, "'subjects' must be a non-empty list"
+    
+    if "daily_hours" not in data:
+        # Default to 6 if not provided, allowing flexible inputs
+        data["daily_hours"] = 6.0
+    
+    return True, "Valid"
@@ -0,0 +1,179 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight call instead
+of each making their own; optionally extended across worker processes with
+one lock file per key, removed when its holder is done
+"""
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Directory for cross-worker lock files; empty = coalesce within a worker only
+SINGLE_FLIGHT_DIR = os.getenv("SINGLE_FLIGHT_DIR", "")
+# Longest wait for another worker's lock before calling anyway
+SINGLE_FLIGHT_LOCK_WAIT = float(os.getenv("SINGLE_FLIGHT_LOCK_WAIT", "60"))  # seconds
+
+_LOCK_POLL_INTERVAL = 0.05  # seconds between non-blocking lock attempts
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    do(key, fn): the first caller for `key` runs fn(); callers that arrive
+    while it is running wait and get the same result (or exception).
+    Nothing is remembered once the call finishes; caching is the caller's job.
+    """
+
+    def __init__(self, lock_dir: str = SINGLE_FLIGHT_DIR, lock_wait: float = SINGLE_FLIGHT_LOCK_WAIT):
+        self.lock_dir = lock_dir
+        self.lock_wait = lock_wait
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {
+            "calls": 0,
+            "executed": 0,
+            "coalesced": 0,
+            "worker_lock_waits": 0,
+            "worker_lock_timeouts": 0,
+            "worker_coalesced": 0,
+        }
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    @staticmethod
+    def _try_lock(fd: int) -> bool:
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:  # Held by someone else
+            return False
+
+    @staticmethod
+    def _unlock(fd: int):
+        if not fcntl:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        # Else closing the descriptor releases the flock
+
+    @staticmethod
+    def _is_current(fd: int, path: str) -> bool:
+        """Whether `fd` is still the file at `path` (not one its last holder removed)"""
+        try:
+            return os.path.samestat(os.fstat(fd), os.stat(path))
+        except FileNotFoundError:
+            return False
+
+    @contextmanager
+    def worker_lock(self, key: str):
+        """
+        Exclusive lock on `key` across worker processes (a no-op without
+        lock_dir). The holder should re-check the shared cache first: if it
+        had to wait, another worker has probably just stored the answer.
+
+        Each key gets its own lock file, so different prompts never wait on
+        each other; the holder removes the file before releasing it, so the
+        directory only holds the keys in flight. A waiter that then gets the
+        lock on the removed file retries on the path. Waiting polls a
+        non-blocking lock until `lock_wait` runs out; after that the block
+        runs without the lock (a duplicate upstream call rather than a
+        request stuck behind a hung worker).
+        """
+        if not self.lock_dir:
+            yield False
+            return
+
+        path = os.path.join(self.lock_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".lock")
+        deadline = time.monotonic() + self.lock_wait
+        waited = locked = False
+        fd = None
+        try:
+            while True:
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+                locked = self._try_lock(fd)
+                while not locked and time.monotonic() < deadline:
+                    waited = True
+                    time.sleep(_LOCK_POLL_INTERVAL)
+                    locked = self._try_lock(fd)
+                if not locked or self._is_current(fd, path):
+                    break
+                self._unlock(fd)  # Locked a file its holder already removed
+                os.close(fd)
+                fd, locked = None, False
+            if waited:
+                with self._lock:
+                    self._stats["worker_lock_waits"] += 1
+                    if not locked:
+                        self._stats["worker_lock_timeouts"] += 1
+            if not locked:
+                print(f"[SINGLE FLIGHT] Lock for {key[:12]} still held after {self.lock_wait}s; calling anyway")
+            yield waited
+        finally:
+            if fd is not None:
+                if locked:
+                    try:
+                        os.unlink(path)
+                    except OSError:  # Windows can't remove a file that is open elsewhere
+                        pass
+                    self._unlock(fd)
+                os.close(fd)
+
+    def count_worker_coalesced(self):
+        """Record a call answered by another worker's result (e.g. found in a shared cache)"""
+        with self._lock:
+            self._stats["worker_coalesced"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["cross_worker"] = bool(self.lock_dir)
+        return stats
@@ -0,0 +1,122 @@
+"""
+Read model cache for Study Saathi
+Keeps each student's streak, today's progress and profile in process, as
+loaded by database.load_student_context in one query, and drops the entry
+whenever database.py writes for that student (complete_task,
+create_student, save_study_plan), so dashboard refreshes rarely touch SQLite
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+
+STUDENT_CACHE_SIZE = int(os.getenv("STUDENT_CACHE_SIZE", "1024"))
+# Invalidation only reaches the worker that did the write, so this bounds
+# how long another worker can serve a student's old streak/progress
+STUDENT_CACHE_TTL = float(os.getenv("STUDENT_CACHE_TTL", "30"))  # seconds
+
+
+class StudentCache:
+    """
+    LRU + TTL cache of per-student read models. Each entry is for one day
+    (today's progress), so it stops matching at midnight.
+
+    While a student's read model is being loaded they have a generation
+    number, bumped by invalidate(). A load that started before a write is
+    not stored after it, so a slow reader can't put back the state the write
+    just replaced. The number is dropped with the last load in flight, so
+    only students being loaded right now are tracked. Entries are stored as
+    JSON text and decoded on every hit, like PlanCache.
+    """
+
+    def __init__(self, size: int = STUDENT_CACHE_SIZE, ttl: float = STUDENT_CACHE_TTL):
+        self.size = max(size, 1)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str, str]]" = OrderedDict()
+        # student_id -> [loads in flight, generation]
+        self._loads: Dict[str, List[int]] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+
+    def get_or_load(self, student_id: str, day: str, load: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """The student's read model for `day`, calling load() only on a miss"""
+        with self._lock:
+            entry = self._entries.get(student_id)
+            if entry is not None and (entry[0] <= time.time() or entry[1] != day):
+                del self._entries[student_id]
+                self._stats["expired"] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(student_id)
+                self._stats["hits"] += 1
+                return json.loads(entry[2])
+            self._stats["misses"] += 1
+            record = self._loads.setdefault(student_id, [0, 0])
+            record[0] += 1
+            generation = record[1]
+
+        value_json = None
+        try:
+            value = load()
+            value_json = json.dumps(value, ensure_ascii=False)
+        finally:
+            with self._lock:
+                current = self._loads.get(student_id) is record
+                if value_json is not None and current and record[1] == generation:
+                    self._entries[student_id] = (time.time() + self.ttl, day, value_json)
+                    self._entries.move_to_end(student_id)
+                    while len(self._entries) > self.size:
+                        self._entries.popitem(last=False)
+                        self._stats["evictions"] += 1
+                record[0] -= 1
+                if record[0] == 0 and current:
+                    del self._loads[student_id]
+        return value
+
+    def invalidate(self, student_id: str):
+        """Forget everything cached for the student (call after the write commits)"""
+        with self._lock:
+            record = self._loads.get(student_id)
+            if record is not None:
+                record[1] += 1
+            self._entries.pop(student_id, None)
+            self._stats["invalidations"] += 1
+
+    def clear(self):
+        """Forget every entry; loads in flight aren't stored either"""
+        with self._lock:
+            self._entries.clear()
+            self._loads.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["capacity"] = self.size
+        stats["ttl_seconds"] = self.ttl
+        return stats
+
+
+_cache = StudentCache()
+
+
+def get_student_cache() -> StudentCache:
+    return _cache
+
+
+def invalidate_student(student_id: str):
+    _cache.invalidate(student_id)
+
+
+def get_student_cache_stats() -> Dict[str, Any]:
+    return _cache.stats()
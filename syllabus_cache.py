@@ -0,0 +1,189 @@
+"""
+Content-addressed cache for syllabus uploads
+Maps the SHA-256 of an uploaded file to its extracted text, and the SHA-256
+of that text to the parsed {"subjects": [...]}, in a local SQLite file with
+a total-size bound, so a batch of students uploading the same PDF pays for
+extraction and the LLM parse once
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Optional, Sequence
+
+SYLLABUS_CACHE_ENABLED = os.getenv("SYLLABUS_CACHE_ENABLED", "1") != "0"
+SYLLABUS_CACHE_DB = os.getenv("SYLLABUS_CACHE_DB", "syllabus_cache.db")
+SYLLABUS_CACHE_MAX_BYTES = int(os.getenv("SYLLABUS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Total size is checked (and least recently used rows evicted) every this many stores
+_EVICT_EVERY = 20
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def stream_hash(stream: BinaryIO) -> str:
+    """SHA-256 of a seekable stream's content, leaving it positioned at the start"""
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(64 * 1024), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return stream_hash(f)
+
+
+def combined_hash(hashes: Sequence[str]) -> str:
+    """One key for an upload made of several files (e.g. photos of each page), in order"""
+    return content_hash("\n".join(hashes).encode("ascii"))
+
+
+def _text_key(upload_hash: str, max_chars: Optional[int]) -> str:
+    # Early-stopped extractions are partial, so they are cached separately
+    return f"text:{upload_hash}:{max_chars or 'all'}"
+
+
+def _parsed_key(text: str, parser: str) -> str:
+    return f"parsed:{content_hash(text.encode('utf-8'))}:{parser}"
+
+
+class SyllabusCache:
+    """
+    SQLite-backed cache of extracted text and parsed subjects, bounded by
+    the total size of the stored values (least recently used evicted first).
+
+    One connection is shared by all threads of a worker behind a lock;
+    several workers can point at the same file (WAL mode).
+    """
+
+    def __init__(self, path: str = SYLLABUS_CACHE_DB, max_bytes: int = SYLLABUS_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max(max_bytes, 1)
+        self._lock = threading.Lock()
+        self._stores = 0
+        self._stats = {
+            "text_hits": 0,
+            "text_misses": 0,
+            "parsed_hits": 0,
+            "parsed_misses": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS syllabus_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_syllabus_cache_last_used ON syllabus_cache(last_used)"
+            )
+
+    def _get(self, key: str, kind: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM syllabus_cache WHERE cache_key=?", (key,)).fetchone()
+            if row is None:
+                self._stats[f"{kind}_misses"] += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE syllabus_cache SET last_used=? WHERE cache_key=?", (time.time(), key))
+            self._stats[f"{kind}_hits"] += 1
+            return row[0]
+
+    def _put(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO syllabus_cache (cache_key, value, size, created_at, last_used)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (key, value, len(value.encode("utf-8")), now, now))
+                self._stats["stores"] += 1
+                self._stores += 1
+                if self._stores % _EVICT_EVERY == 0:
+                    self._evict()
+
+    def _evict(self):
+        """Drop least recently used rows until the stored values fit in max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM syllabus_cache").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for key, size in self._conn.execute("SELECT cache_key, size FROM syllabus_cache ORDER BY last_used"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM syllabus_cache WHERE cache_key=?", victims)
+        self._stats["evictions"] += len(victims)
+
+    def get_text(self, upload_hash: str, max_chars: Optional[int] = None) -> Optional[str]:
+        return self._get(_text_key(upload_hash, max_chars), "text")
+
+    def put_text(self, upload_hash: str, text: str, max_chars: Optional[int] = None):
+        self._put(_text_key(upload_hash, max_chars), text)
+
+    def get_parsed(self, text: str, parser: str) -> Optional[Dict[str, Any]]:
+        value = self._get(_parsed_key(text, parser), "parsed")
+        return json.loads(value) if value is not None else None
+
+    def put_parsed(self, text: str, parser: str, parsed: Dict[str, Any]):
+        self._put(_parsed_key(text, parser), json.dumps(parsed))
+
+    def lookup_upload(self, upload_hash: str, max_chars: Optional[int], parser: str) -> Optional[Dict[str, Any]]:
+        """Parsed subjects for an upload seen before, if both steps are cached"""
+        text = self.get_text(upload_hash, max_chars)
+        return self.get_parsed(text, parser) if text is not None else None
+
+    def clear(self):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM syllabus_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"], stats["bytes"] = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM syllabus_cache"
+            ).fetchone()
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+_cache: Optional[SyllabusCache] = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+
+def get_syllabus_cache() -> Optional[SyllabusCache]:
+    """The worker's cache, opened on first use (None when SYLLABUS_CACHE_ENABLED=0)"""
+    global _cache, _cache_pid
+    if not SYLLABUS_CACHE_ENABLED:
+        return None
+    # A SQLite connection must not be used across a fork
+    if _cache is None or (_cache_pid is not None and _cache_pid != os.getpid()):
+        with _cache_lock:
+            if _cache is None or (_cache_pid is not None and _cache_pid != os.getpid()):
+                _cache = SyllabusCache()
+                _cache_pid = os.getpid()
+    return _cache
+
+
+def get_syllabus_cache_stats() -> Dict[str, Any]:
+    cache = get_syllabus_cache()
+    return cache.stats() if cache else {"enabled": False}
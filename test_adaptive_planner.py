@@ -0,0 +1,206 @@
+"""
+Test script for the adaptive planner
+Tests: hours shifted toward skipped subjects, no change without history,
+the boost cap, subject_stats kept in step with plan saves / replacements /
+task completions (and equal to a full recount), a regenerated plan not
+counting itself, the "adaptive" API flag, and the one-off stats rebuild
+No server needed: python test_adaptive_planner.py
+"""
+import os
+import sqlite3
+import tempfile
+from datetime import date, timedelta
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "adaptive_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+import planner
+from app import app
+from planner import allocate_time_slots, generate_daily_plan, generate_weekly_plan
+
+SUBJECTS = [
+    {"name": "Mathematics", "exam_date": "2030-06-01", "difficulty": "medium"},
+    {"name": "Physics", "exam_date": "2030-06-01", "difficulty": "medium"},
+    {"name": "Chemistry", "exam_date": "2030-06-01", "difficulty": "medium"},
+]
+
+
+def _hours(allocation) -> dict:
+    return {item["subject_id"]: item["study_hours"] for item in allocation}
+
+
+def _stats(planned, completed, minutes_per_task=60) -> dict:
+    return {"planned_tasks": planned, "completed_tasks": completed,
+            "planned_minutes": planned * minutes_per_task, "completed_minutes": completed * minutes_per_task}
+
+
+def _recount(student_id: str) -> dict:
+    """subject_stats the slow way: over the whole task history"""
+    with database.pooled_connection() as conn:
+        rows = conn.execute("""
+            SELECT t.subject_id, COUNT(*) AS planned, SUM(t.completed) AS completed
+            FROM study_plans p JOIN study_tasks t ON t.plan_id = p.id
+            WHERE p.student_id=? AND p.plan_type='daily' AND t.subject_id != 'break'
+            GROUP BY t.subject_id
+        """, (student_id,)).fetchall()
+    return {row["subject_id"]: (row["planned"], row["completed"]) for row in rows}
+
+
+def _plan_tasks(student_id: str, day: str) -> list:
+    with database.pooled_connection() as conn:
+        return [dict(row) for row in conn.execute("""
+            SELECT t.id AS task_id, t.subject_id FROM study_plans p JOIN study_tasks t ON t.plan_id = p.id
+            WHERE p.student_id=? AND p.plan_date=? AND p.plan_type='daily'
+        """, (student_id, day))]
+
+
+def _counts(student_id: str) -> dict:
+    return {subject_id: (s["planned_tasks"], s["completed_tasks"])
+            for subject_id, s in database.get_subject_stats(student_id).items()}
+
+
+def test_neglected_subject_gets_more_hours():
+    history = {"mathematics": _stats(20, 19), "physics": _stats(20, 4), "chemistry": _stats(20, 18)}
+    plain = _hours(allocate_time_slots(SUBJECTS, 6.0))
+    adaptive = allocate_time_slots(SUBJECTS, 6.0, history)
+    hours = _hours(adaptive)
+
+    assert hours["physics"] > plain["physics"], (plain, hours)
+    assert hours["physics"] > hours["mathematics"] and hours["physics"] > hours["chemistry"]
+    assert abs(sum(hours.values()) - 6.0) < 0.05
+    physics = next(item for item in adaptive if item["subject_id"] == "physics")
+    assert physics["completion_ratio"] == 0.2 and physics["adaptive_boost"] > 1
+
+
+def test_no_history_changes_nothing():
+    plain = _hours(allocate_time_slots(SUBJECTS, 6.0))
+    assert _hours(allocate_time_slots(SUBJECTS, 6.0, {})) == plain
+    on_track = {s: _stats(10, 10) for s in ("mathematics", "physics", "chemistry")}
+    assert _hours(allocate_time_slots(SUBJECTS, 6.0, on_track)) == plain
+
+
+def test_partial_history_does_not_penalise():
+    """Subjects without history aren't treated as neglected next to one that was kept up"""
+    plain = _hours(allocate_time_slots(SUBJECTS, 6.0))
+    kept_up = allocate_time_slots(SUBJECTS, 6.0, {"mathematics": _stats(10, 10)})
+    assert _hours(kept_up) == plain, (plain, _hours(kept_up))
+    assert all(item["adaptive_boost"] == 1.0 for item in kept_up)
+
+    # A little history moves hours a little, a lot of history more
+    little = _hours(allocate_time_slots(SUBJECTS, 6.0, {"mathematics": _stats(10, 10), "physics": _stats(1, 0)}))
+    lots = _hours(allocate_time_slots(SUBJECTS, 6.0, {"mathematics": _stats(10, 10), "physics": _stats(30, 0)}))
+    assert plain["physics"] < little["physics"] < lots["physics"], (plain, little, lots)
+
+
+def test_boost_is_capped():
+    never_studied = {"mathematics": _stats(500, 500), "physics": _stats(500, 0), "chemistry": _stats(500, 500)}
+    allocation = allocate_time_slots(SUBJECTS, 6.0, never_studied)
+    assert max(item["adaptive_boost"] for item in allocation) <= planner.ADAPTIVE_MAX_BOOST
+
+
+def test_stats_follow_writes():
+    yesterday = str(date.today() - timedelta(days=1))
+    plan = generate_daily_plan(SUBJECTS, 3.0, date=yesterday)
+    database.save_study_plan(plan, "daily", "ad_writes")
+    assert _counts("ad_writes") == {k: (v[0], 0) for k, v in _recount("ad_writes").items()}
+
+    tasks = _plan_tasks("ad_writes", yesterday)
+    physics = next(t for t in tasks if t["subject_id"] == "physics")
+    database.complete_task(physics["task_id"], "ad_writes")
+    database.complete_task(physics["task_id"], "ad_writes")  # Double click counts once
+    assert _counts("ad_writes") == _recount("ad_writes")
+    assert database.get_subject_stats("ad_writes")["physics"]["completed_minutes"] > 0
+
+    # Replacing the day's plan takes the old plan's tasks off again
+    database.save_study_plan(generate_daily_plan(SUBJECTS[:2], 3.0, date=yesterday), "daily", "ad_writes")
+    assert _counts("ad_writes") == _recount("ad_writes")
+    assert "chemistry" not in database.get_subject_stats("ad_writes")
+
+    # Weekly plans are projections, not history
+    before = _counts("ad_writes")
+    database.save_study_plan(generate_weekly_plan(SUBJECTS, 6.0), "weekly", "ad_writes")
+    assert _counts("ad_writes") == before
+
+
+def test_regenerated_plan_does_not_count_itself():
+    today = str(date.today())
+    database.save_study_plan(generate_daily_plan(SUBJECTS, 6.0, date=today), "daily", "ad_self")
+    assert database.get_subject_stats("ad_self")
+    assert database.get_subject_stats("ad_self", exclude_date=today) == {}
+
+
+def _scheduled_minutes(plan) -> dict:
+    minutes = {}
+    for slot in plan["schedule"]:
+        for activity in slot["activities"]:
+            minutes[activity["subject_id"]] = minutes.get(activity["subject_id"], 0) + activity["duration_minutes"]
+    return minutes
+
+
+def test_adaptive_flag():
+    client = app.test_client()
+    for days_ago in range(1, 6):
+        day = str(date.today() - timedelta(days=days_ago))
+        database.save_study_plan(generate_daily_plan(SUBJECTS, 3.0, date=day), "daily", "ad_api")
+        for task in _plan_tasks("ad_api", day):
+            if task["subject_id"] not in ("physics", "break"):
+                database.complete_task(task["task_id"], "ad_api")
+
+    body = {"subjects": SUBJECTS, "daily_hours": 3.0, "student_id": "ad_api"}
+    plain = client.post("/api/plan/daily", json=body).get_json()["plan"]
+    adaptive = client.post("/api/plan/daily", json=dict(body, adaptive=True)).get_json()["plan"]
+    assert _scheduled_minutes(adaptive)["physics"] > _scheduled_minutes(plain)["physics"], (plain, adaptive)
+    assert adaptive["subject_priorities"][0]["subject_id"] == "physics"
+    assert "adaptive_boost" not in plain["subject_priorities"][0]
+
+    again = client.post("/api/plan/daily", json=dict(body, adaptive=True)).get_json()["plan"]
+    assert again == adaptive, "regenerating changed the adaptive plan"
+
+    weekly = client.post("/api/plan/weekly", json=dict(body, adaptive=True)).get_json()["plan"]
+    assert _scheduled_minutes(weekly["days"][0])["physics"] > _scheduled_minutes(plain)["physics"]
+
+
+def test_stats_rebuilt_by_migration():
+    path = os.path.join(tempfile.mkdtemp(), "old.db")
+    saved = database.DB_NAME
+    database.DB_NAME = path
+    try:
+        database.init_db()
+        database.save_study_plan(generate_daily_plan(SUBJECTS, 6.0), "daily", "ad_old")
+        expected = _recount("ad_old")
+        with sqlite3.connect(path) as conn:  # What older versions had
+            conn.execute("DELETE FROM subject_stats")
+            conn.execute("PRAGMA user_version=4")
+        database.init_db()
+        assert _counts("ad_old") == expected
+    finally:
+        database.DB_NAME = saved
+        database.init_db()
+
+
+def main():
+    print("\n" + "="*50)
+    print("ADAPTIVE PLANNER TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_neglected_subject_gets_more_hours, test_no_history_changes_nothing,
+                 test_partial_history_does_not_penalise, test_boost_is_capped,
+                 test_stats_follow_writes, test_regenerated_plan_does_not_count_itself, test_adaptive_flag,
+                 test_stats_rebuilt_by_migration):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Test script for the async AI layer
+Checks that /api/ai/plan-and-motivation runs its two LLM calls concurrently,
+using the local stub LLM server with an artificial delay
+No server or API key needed: python test_ai_async.py
+"""
+import os
+import tempfile
+import threading
+import time
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "ai_async_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+from ai_async import run_async, solve_doubt_async, plan_and_motivation_async
+from app import app
+from llm_stub_server import StubLLMServer
+
+STUB_DELAY = 0.4
+PLAN = {"date": "2024-12-01", "total_study_hours": 2,
+        "schedule": [{"time_slot": "Morning", "activities": [{"subject": "Calculus", "difficulty": "hard"}]}]}
+
+
+def test_plan_and_motivation_concurrent():
+    with StubLLMServer.patched(delay=STUB_DELAY) as stub:
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.post("/api/ai/plan-and-motivation", json={"plan": PLAN, "mode": "english"})
+        elapsed = time.perf_counter() - start
+        data = response.get_json()
+        print(f"Combined endpoint: {elapsed * 1000:.0f} ms for two {STUB_DELAY * 1000:.0f} ms calls")
+        assert response.status_code == 200
+        assert data["explanation"].startswith("Stub answer to: Explain this study plan")
+        assert data["motivation"].startswith("Stub answer to: Give a short, punchy motivational message")
+        assert stub.requests == 2
+        assert elapsed < STUB_DELAY * 1.75, f"calls ran sequentially ({elapsed:.2f}s)"
+
+
+def test_bridge_from_many_threads():
+    """Sync callers on several request threads share the one background loop"""
+    with StubLLMServer.patched(delay=STUB_DELAY) as stub:
+        answers = {}
+
+        def worker(i):
+            answers[i] = run_async(solve_doubt_async(f"Doubt {i}"))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        assert answers == {i: f"Stub answer to: Student Doubt: Doubt {i}" for i in range(4)}
+        assert elapsed < STUB_DELAY * 1.75, f"bridge serialized callers ({elapsed:.2f}s)"
+
+
+def test_context_loaded_alongside_explanation():
+    with StubLLMServer.patched(delay=STUB_DELAY):
+        def slow_context():
+            time.sleep(STUB_DELAY)
+            return {"name": "Asha", "streak": {"current_streak": 5}}
+
+        start = time.perf_counter()
+        explanation, motivation = run_async(plan_and_motivation_async(PLAN, slow_context))
+        elapsed = time.perf_counter() - start
+        assert "Address the student as 'Asha'" in motivation
+        # Context lookup + motivation call, with the explanation overlapping them
+        assert elapsed < STUB_DELAY * 2.75, f"explanation waited for the context ({elapsed:.2f}s)"
+
+
+def main():
+    print("\n" + "="*50)
+    print("ASYNC AI LAYER TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_plan_and_motivation_concurrent, test_bridge_from_many_threads,
+                 test_context_loaded_alongside_explanation):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Test script for the analytics rollups
+Tests: compaction of finished days into task_rollups (breaks and today left
+out), re-runs and late completions, a day regenerated with a subject removed, weekly/monthly subject trends, completion
+rate by difficulty, class-wide queries, bad parameters (400), the rollup
+queries' index use, and the study_hours backfill migration
+No server needed: python test_analytics.py
+"""
+import os
+import sqlite3
+import tempfile
+from datetime import date, timedelta
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "analytics_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+import analytics
+from app import app
+from planner import generate_daily_plan
+
+SUBJECTS = [
+    {"name": "Mathematics", "exam_date": "2030-06-01", "difficulty": "hard"},
+    {"name": "Physics", "exam_date": "2030-06-05", "difficulty": "medium"},
+    {"name": "Chemistry", "exam_date": "2030-06-09", "difficulty": "easy"},
+]
+TODAY = date.today()
+
+
+def _day(days_ago: int) -> str:
+    return str(TODAY - timedelta(days=days_ago))
+
+
+def _save_day(student_id: str, days_ago: int, complete: int = 0, subjects: list = SUBJECTS) -> list:
+    """Save a daily plan dated `days_ago`, complete its first `complete` study tasks"""
+    plan = generate_daily_plan(subjects, 4.0)
+    plan["date"] = _day(days_ago)
+    plan_id = database.save_study_plan(plan, "daily", student_id)
+    with database.pooled_connection() as conn:
+        tasks = conn.execute("SELECT id, subject_id FROM study_tasks WHERE plan_id=? ORDER BY id",
+                             (plan_id,)).fetchall()
+    study = [row["id"] for row in tasks if row["subject_id"] != "break"]
+    for task_id in study[:complete]:
+        database.complete_task(task_id, student_id)
+    return study
+
+
+def _recompact():
+    """Compact from scratch (the app's background compactor may have run already)"""
+    with database.pooled_connection() as conn:
+        conn.execute("DELETE FROM analytics_state")
+        conn.commit()
+    return analytics.compact()
+
+
+def _rollups(student_id: str) -> list:
+    with database.pooled_connection() as conn:
+        return [dict(row) for row in conn.execute(
+            "SELECT * FROM task_rollups WHERE student_id=? ORDER BY day, subject", (student_id,))]
+
+
+def test_compaction():
+    for days_ago in (3, 2, 1, 0):
+        _save_day("an_one", days_ago, complete=2)
+    result = _recompact()
+    assert result["through"] == _day(1)
+
+    rollups = _rollups("an_one")
+    assert {row["day"] for row in rollups} == {_day(3), _day(2), _day(1)}, "today must not be compacted"
+    with database.pooled_connection() as conn:
+        planned = conn.execute("""
+            SELECT COUNT(*) AS n, SUM(t.study_hours) AS hours FROM study_plans p JOIN study_tasks t ON t.plan_id=p.id
+            WHERE p.student_id='an_one' AND p.plan_date=? AND t.subject_id != 'break'
+        """, (_day(1),)).fetchone()
+    yesterday = [row for row in rollups if row["day"] == _day(1)]
+    assert sum(row["planned_tasks"] for row in yesterday) == planned["n"]
+    assert abs(sum(row["planned_hours"] for row in yesterday) - planned["hours"]) < 1e-6
+    assert planned["hours"] > 0, "study tasks saved with 0 hours"
+    assert sum(row["completed_tasks"] for row in yesterday) == 2
+    assert "Break" not in {row["subject"] for row in rollups}
+
+
+def test_rerun_and_late_completion():
+    study = _save_day("an_late", 1, complete=1)
+    _recompact()
+    before = _rollups("an_late")
+    assert analytics.compact()["through"] == _day(1)
+    assert _rollups("an_late") == before, "re-run changed the rollups"
+
+    database.complete_task(study[1], "an_late")  # Ticked off the next morning
+    analytics.compact()
+    assert sum(row["completed_tasks"] for row in _rollups("an_late")) == 2
+
+
+def test_regenerated_day_drops_old_groups():
+    _save_day("an_regen", 1)
+    _recompact()
+    assert "Chemistry" in {row["subject"] for row in _rollups("an_regen")}
+
+    _save_day("an_regen", 1, subjects=SUBJECTS[:2])  # Same day planned again without Chemistry
+    analytics.compact()
+    rollups = _rollups("an_regen")
+    with database.pooled_connection() as conn:
+        planned = conn.execute("""
+            SELECT t.subject FROM study_plans p JOIN study_tasks t ON t.plan_id=p.id
+            WHERE p.student_id='an_regen' AND t.subject_id != 'break'
+        """).fetchall()
+    assert {row["subject"] for row in rollups} == {row["subject"] for row in planned}, rollups
+    assert "Chemistry" not in {row["subject"] for row in rollups}
+    assert sum(row["planned_tasks"] for row in rollups) == len(planned)
+
+
+def test_trends_and_difficulty():
+    for days_ago in range(1, 15):
+        _save_day("an_trend", days_ago, complete=1)
+    _recompact()
+
+    weekly = analytics.subject_trends(["an_trend"], _day(14), _day(1), "week")
+    weeks = {row["period"] for row in weekly["trends"]}
+    assert all(date.fromisoformat(week).weekday() == 0 for week in weeks), weeks
+    assert len(weeks) in (2, 3)
+    assert sum(row["planned_tasks"] for row in weekly["trends"]) == \
+        sum(row["planned_tasks"] for row in _rollups("an_trend"))
+    assert weekly["compacted_through"] == _day(1)
+
+    monthly = analytics.subject_trends(["an_trend"], _day(14), _day(1), "month")
+    assert all(len(row["period"]) == 7 for row in monthly["trends"])
+
+    by_difficulty = analytics.completion_by_difficulty(["an_trend"], _day(14), _day(1))["difficulty"]
+    assert set(by_difficulty) <= {"easy", "medium", "hard"} and by_difficulty
+    assert sum(level["completed_tasks"] for level in by_difficulty.values()) == 14
+    for level in by_difficulty.values():
+        assert 0 <= level["completion_rate"] <= 100
+
+
+def test_class_query():
+    for student_id in ("an_c1", "an_c2", "an_c3"):
+        _save_day(student_id, 2, complete=1)
+    _recompact()
+    client = app.test_client()
+    one = client.get(f"/api/analytics/difficulty?student_id=an_c1&from={_day(2)}&to={_day(2)}").get_json()
+    everyone = client.get(f"/api/analytics/difficulty?student_ids=an_c1,an_c2,an_c3&from={_day(2)}&to={_day(2)}")
+    assert everyone.status_code == 200
+    body = everyone.get_json()
+    assert body["students"] == 3
+    assert sum(v["completed_tasks"] for v in body["difficulty"].values()) == 3
+    assert sum(v["planned_tasks"] for v in body["difficulty"].values()) == \
+        3 * sum(v["planned_tasks"] for v in one["difficulty"].values())
+
+    subjects = client.get(f"/api/analytics/subjects?student_ids=an_c1,an_c2,an_c3&from={_day(2)}&to={_day(2)}"
+                          "&period=day").get_json()
+    assert {row["period"] for row in subjects["trends"]} == {_day(2)}
+
+
+def test_bad_parameters():
+    client = app.test_client()
+    for query in ("period=year", "from=yesterday", f"from={_day(1)}&to={_day(5)}", "from=2020-01-01&to=2030-01-01",
+                  "student_ids=" + ",".join(f"s{i}" for i in range(analytics.ANALYTICS_MAX_STUDENTS + 1))):
+        response = client.get(f"/api/analytics/subjects?{query}")
+        assert response.status_code == 400, query
+    assert client.get("/api/analytics/subjects").status_code == 200  # Defaults: last year, 'default'
+
+
+def test_rollup_queries_use_indexes():
+    scans = database.find_table_scans(analytics.ANALYTICS_QUERIES)
+    assert scans == {}, scans
+
+
+def test_backfill_migration():
+    path = os.path.join(tempfile.mkdtemp(), "old.db")
+    saved = database.DB_NAME
+    database.DB_NAME = path
+    try:
+        database.init_db()
+        _save_day("an_old", 0, complete=1)
+        with sqlite3.connect(path) as conn:  # What older versions stored
+            conn.execute("UPDATE study_tasks SET study_hours=0")
+            conn.execute("UPDATE daily_progress SET total_hours=0, completed_hours=0")
+            conn.execute("PRAGMA user_version=3")
+        database.init_db()
+        with sqlite3.connect(path) as conn:
+            hours = conn.execute("SELECT SUM(study_hours) FROM study_tasks WHERE subject_id != 'break'").fetchone()[0]
+            breaks = conn.execute("SELECT SUM(study_hours) FROM study_tasks WHERE subject_id = 'break'").fetchone()[0]
+            total, completed = conn.execute("SELECT total_hours, completed_hours FROM daily_progress "
+                                            "WHERE student_id='an_old'").fetchone()
+        assert hours > 0 and not breaks
+        assert abs(total - hours) < 1e-6 and 0 < completed < total
+    finally:
+        database.DB_NAME = saved
+        database.init_db()
+
+
+def main():
+    print("\n" + "="*50)
+    print("ANALYTICS ROLLUP TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_compaction, test_rerun_and_late_completion, test_regenerated_day_drops_old_groups,
+                 test_trends_and_difficulty, test_class_query,
+                 test_bad_parameters, test_rollup_queries_use_indexes, test_backfill_migration):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
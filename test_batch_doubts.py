@@ -0,0 +1,134 @@
+"""
+Test script for batch doubt solving
+Tests: bounded concurrency, input order, per-item timeouts (a timed-out call
+keeps its slot), the whole-batch deadline, streamed results, and the
+provider rate limit, against the local stub LLM server
+No server or API key needed: python test_batch_doubts.py
+"""
+import json
+import os
+import tempfile
+import time
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "batch_doubts_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+import ai_async
+import app as app_module
+from app import app
+from llm_client import LLMClient, RateLimiter
+from llm_stub_server import StubLLMServer
+
+STUB_DELAY = 0.2
+DOUBTS = [f"Question {i}?" for i in range(8)]
+
+
+def test_batch_bounded_and_ordered():
+    with StubLLMServer.patched(delay=STUB_DELAY) as stub:
+        start = time.perf_counter()
+        response = app.test_client().post("/api/ai/solve-doubts/batch", json={"doubts": DOUBTS})
+        elapsed = time.perf_counter() - start
+        results = response.get_json()["results"]
+        print(f"{len(DOUBTS)} doubts in {elapsed * 1000:.0f} ms, at most {stub.max_in_flight} in flight")
+        assert [r["index"] for r in results] == list(range(len(DOUBTS)))
+        assert all(r["status"] == "ok" and r["answer"] == f"Stub answer to: Student Doubt: {r['doubt']}"
+                   for r in results)
+        assert stub.max_in_flight <= ai_async.BATCH_CONCURRENCY
+        assert elapsed < STUB_DELAY * len(DOUBTS) / 2, "doubts ran one at a time"
+
+
+def test_item_timeout():
+    with StubLLMServer.patched(delay=STUB_DELAY):
+        results = ai_async.run_async(ai_async.solve_doubts_batch_async(
+            ["Slow?", "Also slow?"], concurrency=2, timeout=STUB_DELAY / 4))
+        assert [r["status"] for r in results] == ["timeout", "timeout"]
+        assert results[0]["answer"] is None
+
+
+def test_timed_out_call_keeps_its_slot():
+    """The worker thread of a timed-out doubt still counts against the concurrency limit"""
+    with StubLLMServer.patched(delay=STUB_DELAY) as stub:
+        results = ai_async.run_async(ai_async.solve_doubts_batch_async(
+            ["Slow?", "Also slow?", "Slow too?"], concurrency=1, timeout=STUB_DELAY / 4))
+        assert [r["status"] for r in results] == ["timeout"] * 3
+        time.sleep(STUB_DELAY * 3.5)  # Let the abandoned calls finish
+        assert stub.max_in_flight == 1, f"{stub.max_in_flight} calls in flight with concurrency 1"
+
+
+def test_batch_deadline():
+    with StubLLMServer.patched(delay=STUB_DELAY):
+        seen = []
+        start = time.perf_counter()
+        results = ai_async.run_async(ai_async.solve_doubts_batch_async(
+            DOUBTS[:4], concurrency=1, timeout=10, on_result=seen.append, batch_timeout=STUB_DELAY * 1.5))
+        elapsed = time.perf_counter() - start
+        assert elapsed < STUB_DELAY * 3, f"batch ran past its deadline ({elapsed:.2f}s)"
+        assert results[0]["status"] == "ok" and results[-1]["status"] == "timeout"
+        assert sorted(r["index"] for r in seen) == [0, 1, 2, 3], "a result was reported twice or not at all"
+        time.sleep(STUB_DELAY * 1.5)  # Let the abandoned call finish
+
+
+def test_streamed_results():
+    with StubLLMServer.patched(delay=STUB_DELAY):
+        response = app.test_client().post("/api/ai/solve-doubts/batch", buffered=False,
+                                          json={"doubts": DOUBTS[:5], "stream": True})
+        assert response.mimetype == "text/event-stream"
+        body = b"".join(response.response).decode("utf-8")
+        events = [block for block in body.split("\n\n") if block]
+        assert len(events) == 6 and events[-1].startswith("event: done")
+        indexes = sorted(json.loads(block[len("data: "):])["index"] for block in events[:-1])
+        assert indexes == list(range(5))
+
+
+def test_validation():
+    client = app.test_client()
+    assert client.post("/api/ai/solve-doubts/batch", json={"doubts": []}).status_code == 400
+    assert client.post("/api/ai/solve-doubts/batch", json={"doubts": ["ok", ""]}).status_code == 400
+    too_many = ["Why?"] * (app_module.BATCH_MAX_DOUBTS + 1)
+    assert client.post("/api/ai/solve-doubts/batch", json={"doubts": too_many}).status_code == 400
+
+
+def test_rate_limit():
+    limiter = RateLimiter(rate=20, burst=1)
+    start = time.perf_counter()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.perf_counter() - start >= 4 / 20 * 0.9
+
+    with StubLLMServer() as stub:
+        client = LLMClient(rate_limiter=RateLimiter(rate=10, burst=2))
+        payload = {"messages": [{"role": "user", "content": "Hi"}]}
+        start = time.perf_counter()
+        for _ in range(4):
+            client.post_json(f"{stub.url}/chat/completions", payload)
+        elapsed = time.perf_counter() - start
+        # Two burst tokens, then 10/s
+        assert elapsed >= 2 / 10 * 0.9, f"rate limit not applied ({elapsed:.3f}s)"
+        assert client.stats()["rate_limited"] == 2
+
+
+def main():
+    print("\n" + "="*50)
+    print("BATCH DOUBT SOLVING TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_batch_bounded_and_ordered, test_item_timeout, test_timed_out_call_keeps_its_slot,
+                 test_batch_deadline, test_streamed_results,
+                 test_validation, test_rate_limit):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
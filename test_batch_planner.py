@@ -0,0 +1,92 @@
+"""
+Test script for the vectorized batch planner
+Checks allocate_time_slots_batch against the scalar allocate_time_slots
+No server needed: python test_batch_planner.py
+"""
+import random
+from datetime import datetime, timedelta
+
+from planner import (
+    allocate_time_slots, allocate_time_slots_batch,
+    generate_daily_plan, generate_daily_plans_batch
+)
+
+
+def make_students(count, seed=7):
+    rng = random.Random(seed)
+    today = datetime.today()
+    students = {}
+    for s in range(count):
+        subjects = []
+        for i in range(rng.randint(1, 8)):
+            if rng.random() < 0.05:
+                exam_date = "not-a-date"
+            else:
+                exam_date = (today + timedelta(days=rng.randint(-5, 120))).strftime("%Y-%m-%d")
+            subject = {
+                "name": f"Subject {rng.randint(0, 5)}",
+                "exam_date": exam_date,
+                "difficulty": rng.choice(["easy", "medium", "hard", "Hard", "unknown"]),
+                "topics": [f"Topic {t}" for t in range(rng.randint(0, 3))]
+            }
+            if rng.random() < 0.3:
+                subject["id"] = f"custom_{i}"
+            subjects.append(subject)
+        students[f"student_{s}"] = {"subjects": subjects, "daily_hours": rng.choice([2, 4.5, 6, 7.25])}
+    return students
+
+
+def test_batch_matches_scalar():
+    """Every student's allocation must equal the scalar path exactly"""
+    students = make_students(500)
+    batch = {"student_id": [], "name": [], "exam_date": [], "difficulty": [], "id": [], "topics": []}
+    for student_id, data in students.items():
+        for subject in data["subjects"]:
+            batch["student_id"].append(student_id)
+            batch["name"].append(subject["name"])
+            batch["exam_date"].append(subject["exam_date"])
+            batch["difficulty"].append(subject["difficulty"])
+            batch["id"].append(subject.get("id"))
+            batch["topics"].append(subject["topics"])
+
+    hours = {student_id: data["daily_hours"] for student_id, data in students.items()}
+    result = allocate_time_slots_batch(batch, hours)
+
+    mismatches = [
+        student_id for student_id, data in students.items()
+        if result[student_id] != allocate_time_slots(data["subjects"], data["daily_hours"])
+    ]
+    print(f"Students checked: {len(students)}, mismatches: {len(mismatches)}")
+    assert not mismatches, f"Batch allocation differs for {mismatches[:5]}"
+
+
+def test_batch_daily_plans_match_scalar():
+    """generate_daily_plans_batch produces the same plans as generate_daily_plan"""
+    students = make_students(50, seed=11)
+    plans = generate_daily_plans_batch(students, date="2024-12-01")
+    for student_id, data in students.items():
+        expected = generate_daily_plan(data["subjects"], data["daily_hours"], date="2024-12-01")
+        assert plans[student_id] == expected, student_id
+
+
+def main():
+    print("\n" + "="*50)
+    print("BATCH PLANNER TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_batch_matches_scalar, test_batch_daily_plans_match_scalar):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Test script for the aggregated dashboard endpoint
+Tests: streak, progress, today's tasks and AI text in one response, the AI
+text generated in the background (a slow LLM doesn't hold up the response),
+ETag / If-None-Match answering 304, and a new ETag once a task is completed
+No server or API key needed: python test_dashboard.py
+"""
+import os
+import tempfile
+import time
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "dashboard_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+import ai_async
+import ai_service
+from app import app
+from planner import generate_daily_plan
+
+ai_service.LLM_API_KEY = None  # Mock AI responses
+
+SUBJECTS = [
+    {"name": "Mathematics", "exam_date": "2030-06-01", "difficulty": "hard"},
+    {"name": "Physics", "exam_date": "2030-06-05", "difficulty": "medium"},
+]
+
+
+def _load_when_ready(client, student_id, timeout=10):
+    """The dashboard once the AI text for the current data is in"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = client.get(f"/api/dashboard?student_id={student_id}")
+        if not response.get_json()["ai_pending"]:
+            return response
+        time.sleep(0.05)
+    raise AssertionError(f"dashboard text for {student_id} still pending after {timeout}s")
+
+
+def test_dashboard_has_everything():
+    client = app.test_client()
+    database.create_student("dash_full", "Meera")
+    database.save_study_plan(generate_daily_plan(SUBJECTS, 4.0), "daily", "dash_full")
+
+    body = _load_when_ready(client, "dash_full").get_json()
+    assert body["success"], body
+    assert body["profile"]["name"] == "Meera"
+    assert body["streak"] == client.get("/api/streak?student_id=dash_full").get_json()["streak"]
+    assert body["progress"] == client.get("/api/progress?student_id=dash_full").get_json()["progress"]
+    assert body["today_plan"] == client.get("/api/plan/today?student_id=dash_full").get_json()["today_plan"]
+    assert body["explanation"] and body["motivation"]
+
+
+def test_dashboard_without_plan():
+    body = _load_when_ready(app.test_client(), "dash_empty").get_json()
+    assert body["success"] and body["today_plan"] == [] and body["total_tasks"] == 0
+    assert body["explanation"] is None and body["motivation"]
+    assert body["profile"] is None
+
+
+def test_slow_llm_does_not_block():
+    """The response carries the last text at once; the new text follows"""
+    client = app.test_client()
+    database.save_study_plan(generate_daily_plan(SUBJECTS, 4.0), "daily", "dash_slow")
+    old = _load_when_ready(client, "dash_slow").get_json()
+
+    saved = ai_async.generate_plan_explanation, ai_async.generate_motivation
+
+    def slow(text):
+        def call(*args):
+            time.sleep(1.0)
+            return text
+        return call
+
+    ai_async.generate_plan_explanation, ai_async.generate_motivation = slow("new explanation"), slow("new motivation")
+    try:
+        client.post(f"/api/task/complete/{old['today_plan'][0]['task_id']}?student_id=dash_slow")
+        start = time.perf_counter()
+        body = client.get("/api/dashboard?student_id=dash_slow").get_json()
+        assert time.perf_counter() - start < 0.5, "dashboard waited on the LLM"
+        assert body["ai_pending"] and body["completed_tasks"] == 1
+        assert body["motivation"] == old["motivation"], "last text not returned while refreshing"
+
+        body = _load_when_ready(client, "dash_slow").get_json()
+        assert body["explanation"] == "new explanation" and body["motivation"] == "new motivation"
+    finally:
+        ai_async.generate_plan_explanation, ai_async.generate_motivation = saved
+
+
+def test_etag_and_not_modified():
+    client = app.test_client()
+    database.save_study_plan(generate_daily_plan(SUBJECTS, 4.0), "daily", "dash_etag")
+
+    first = _load_when_ready(client, "dash_etag")
+    etag = first.headers["ETag"]
+    assert etag and "no-cache" in first.headers["Cache-Control"]
+
+    again = client.get("/api/dashboard?student_id=dash_etag", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b""
+
+    task_id = first.get_json()["today_plan"][0]["task_id"]
+    client.post(f"/api/task/complete/{task_id}?student_id=dash_etag")
+    changed = client.get("/api/dashboard?student_id=dash_etag", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert changed.get_json()["completed_tasks"] == 1
+
+    # The refreshed text gets its own ETag, so a client polling with If-None-Match sees it
+    pending = changed.headers["ETag"]
+    assert _load_when_ready(client, "dash_etag").headers["ETag"] != pending
+
+
+def main():
+    print("\n" + "="*50)
+    print("DASHBOARD ENDPOINT TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_dashboard_has_everything, test_dashboard_without_plan, test_slow_llm_does_not_block,
+                 test_etag_and_not_modified):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
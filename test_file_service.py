@@ -0,0 +1,247 @@
+"""
+Test script for syllabus file extraction
+Tests: page-parallel PDF extraction keeps page order, early stop, page 0
+read by the parent's reader (one parse per read in this process), queued
+chunks cancelled when one fails, the serial/parallel switch in
+read_file_content, bytes and stream input with format detection from magic
+bytes (only ZIPs holding word/document.xml count as DOCX), and the upload
+size limit
+No server needed: python test_file_service.py
+"""
+import io
+import multiprocessing
+import os
+import tempfile
+import zipfile
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+
+import docx
+import pypdf
+
+import file_service
+from bench_pdf_extract import make_text_pdf, old_read_pdf
+
+PAGES = 20
+
+
+def _pdf(pages=PAGES):
+    path = os.path.join(tempfile.mkdtemp(), f"syllabus_{pages}.pdf")
+    make_text_pdf(path, pages, lines_per_page=5)
+    return path
+
+
+def _pool():
+    return ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+
+
+def test_parallel_matches_serial():
+    path = _pdf()
+    progress = []
+    with _pool() as pool:
+        text = file_service.read_pdf_parallel(path, pool, workers=2, chunk_pages=3,
+                                              on_progress=lambda done, total: progress.append((done, total)))
+    assert text == old_read_pdf(path), "pages out of order or missing"
+    assert progress[-1] == (PAGES, PAGES)
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+
+def test_early_stop():
+    path = _pdf()
+    full = old_read_pdf(path)
+    with _pool() as pool:
+        text = file_service.read_pdf_parallel(path, pool, max_chars=500, workers=2, chunk_pages=4)
+    assert len(text) >= 500
+    assert len(text) < len(full) / 2, f"read {len(text)} of {len(full)} chars"
+    assert full.startswith(text), "early-stop text is not a prefix of the full text"
+
+
+class _RecordingExecutor(ProcessPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+        self.chunks = []
+
+    def submit(self, fn, *args):
+        self.chunks.append(args[1:])
+        return super().submit(fn, *args)
+
+
+def test_first_page_read_in_parent():
+    path = _pdf()
+    with _RecordingExecutor() as pool:
+        text = file_service.read_pdf_parallel(path, pool, max_chars=50, workers=2, chunk_pages=4)
+    assert old_read_pdf(path).startswith(text) and len(text) >= 50
+    assert pool.chunks == [], f"chunks {pool.chunks} submitted for text on the first page"
+
+    with _RecordingExecutor() as pool:
+        assert file_service.read_pdf_parallel(path, pool, workers=2, chunk_pages=4) == old_read_pdf(path)
+    assert pool.chunks[0][0] == 1 and pool.chunks[-1][1] == PAGES, pool.chunks
+
+
+class _FailingExecutor(Executor):
+    """The first chunk fails at once; the rest stay queued"""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        if not self.futures:
+            future.set_exception(RuntimeError("corrupt page"))
+        self.futures.append(future)
+        return future
+
+
+def test_failed_chunk_cancels_the_rest():
+    pool = _FailingExecutor()
+    try:
+        file_service.read_pdf_parallel(_pdf(), pool, workers=2, chunk_pages=2)
+        assert False, "chunk error swallowed"
+    except RuntimeError as e:
+        assert "corrupt page" in str(e)
+    assert len(pool.futures) == 4 and all(f.cancelled() for f in pool.futures[1:]), pool.futures
+
+
+def test_read_file_content_switches_to_parallel():
+    path = _pdf()
+    expected = old_read_pdf(path)
+    saved = (file_service.PDF_WORKERS, file_service.PDF_PARALLEL_MIN_PAGES, pypdf.PdfReader)
+    opened = []
+
+    class CountingReader(pypdf.PdfReader):
+        def __init__(self, *args, **kwargs):
+            opened.append(args[0])
+            super().__init__(*args, **kwargs)
+
+    try:
+        pypdf.PdfReader = CountingReader  # Pool processes are spawned, so only this process counts
+        file_service.PDF_WORKERS, file_service.PDF_PARALLEL_MIN_PAGES = 2, PAGES
+        assert file_service.read_file_content(path) == expected
+        assert file_service._pdf_pool is not None, "parallel path not taken"
+        assert opened == [path], f"parent parsed the PDF {len(opened)} times"
+
+        file_service.PDF_PARALLEL_MIN_PAGES = PAGES + 1
+        serial = file_service.read_file_content(path, max_chars=300)
+        assert 300 <= len(serial) < len(expected)
+    finally:
+        file_service.PDF_WORKERS, file_service.PDF_PARALLEL_MIN_PAGES, pypdf.PdfReader = saved
+
+
+class _NonSeekable(io.RawIOBase):
+    """A socket-like stream: readable once, no seek"""
+
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._data.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+def test_detect_format():
+    with open(_pdf(1), "rb") as f:
+        assert file_service.detect_format(f.read(64)) == ".pdf"
+    assert file_service.detect_format(b"\x89PNG\r\n\x1a\n....") == ".png"
+    assert file_service.detect_format(b"\xff\xd8\xff\xe0....") == ".jpg"
+    assert file_service.detect_format(b"PK\x03\x04....") is None  # A ZIP needs its directory checked
+    assert file_service.detect_format("Mathematics – Calculus".encode("utf-8")[:-1]) == ".txt"
+    assert file_service.detect_format(b"\x00\x01\x02") is None
+    assert file_service.detect_format(b"") is None
+
+
+def _zip(names) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name in names:
+            archive.writestr(name, "<xml/>")
+    return buffer.getvalue()
+
+
+def test_only_word_zips_are_docx():
+    buffer = io.BytesIO()
+    docx.Document().save(buffer)
+    data = buffer.getvalue()
+    assert file_service.detect_format(data[:64], data) == ".docx"
+    buffer.seek(5)
+    assert file_service.peek_format(buffer) == ".docx" and buffer.tell() == 0
+
+    for names in (["notes.txt"], ["[Content_Types].xml", "xl/workbook.xml"]):  # A plain ZIP, a spreadsheet
+        data = _zip(names)
+        assert file_service.detect_format(data[:64], data) is None, names
+        assert file_service.peek_format(io.BytesIO(data)) is None
+        try:
+            file_service.read_file_content(data)
+            assert False, f"{names} read as a Word file"
+        except ValueError as e:
+            assert "Unsupported file format" in str(e)
+
+    truncated = data[:40]  # ZIP magic, no directory
+    assert file_service.detect_format(truncated, truncated) is None
+
+
+def test_bytes_and_streams():
+    path = _pdf(3)
+    with open(path, "rb") as f:
+        data = f.read()
+    expected = old_read_pdf(path)
+    assert file_service.read_file_content(data) == expected
+    assert file_service.read_file_content(io.BytesIO(data)) == expected
+    assert file_service.read_file_content(_NonSeekable(data)) == expected
+
+    assert file_service.read_file_content("Physics\nOptics\n".encode("utf-8")) == "Physics\nOptics\n"
+
+    buffer = io.BytesIO()
+    document = docx.Document()
+    document.add_paragraph("Chemistry")
+    document.add_paragraph("Organic")
+    document.save(buffer)
+    assert file_service.read_file_content(buffer.getvalue()) == "Chemistry\nOrganic\n"
+
+    try:
+        file_service.read_file_content(b"\x00\x01 not a syllabus")
+        assert False, "unsupported content accepted"
+    except ValueError as e:
+        assert "Unsupported file format" in str(e)
+
+
+def test_size_limit():
+    saved = file_service.MAX_UPLOAD_BYTES
+    file_service.MAX_UPLOAD_BYTES = 100
+    try:
+        for source in (b"x" * 101, io.BytesIO(b"x" * 101), _NonSeekable(b"x" * 101 * 1024), _pdf(1)):
+            try:
+                file_service.read_file_content(source)
+                assert False, f"oversized {type(source).__name__} accepted"
+            except file_service.UploadTooLarge:
+                pass
+        assert file_service.read_file_content(b"x" * 100) == "x" * 100
+    finally:
+        file_service.MAX_UPLOAD_BYTES = saved
+
+
+def main():
+    print("\n" + "="*50)
+    print("FILE SERVICE TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_parallel_matches_serial, test_early_stop, test_first_page_read_in_parent,
+                 test_failed_chunk_cancels_the_rest, test_read_file_content_switches_to_parallel,
+                 test_detect_format, test_only_word_zips_are_docx, test_bytes_and_streams, test_size_limit):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
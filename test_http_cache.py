@@ -0,0 +1,159 @@
+"""
+Test script for conditional requests and response compression
+Tests: ETags from the per-student write counter, 304 answered with one
+primary key read, new ETags after writes (and the same ones in every
+worker), a write by another worker seen at once, gzip/brotli for large
+responses, and 304 for a compressed ETag
+No server needed: python test_http_cache.py
+"""
+import gzip
+import os
+import tempfile
+import time
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "http_cache_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+import app as app_module
+from app import app
+from planner import generate_daily_plan
+from student_cache import get_student_cache
+
+SUBJECTS = [
+    {"name": "Mathematics", "exam_date": "2030-06-01", "difficulty": "hard", "topics": ["Calculus", "Algebra"]},
+    {"name": "Physics", "exam_date": "2030-06-05", "difficulty": "medium", "topics": ["Optics"]},
+    {"name": "Chemistry", "exam_date": "2030-06-09", "difficulty": "easy", "topics": ["Organic"]},
+]
+READ_URLS = ("/api/plan/today", "/api/streak", "/api/progress", "/api/student/profile", "/api/dashboard")
+
+
+def _acquired() -> int:
+    return database.get_pool_stats()["acquired"]
+
+
+def test_not_modified_with_one_read():
+    client = app.test_client()
+    database.create_student("http_304", "Kiran")
+    database.save_study_plan(generate_daily_plan(SUBJECTS, 4.0), "daily", "http_304")
+
+    etags = {}
+    for url in READ_URLS:
+        response = client.get(f"{url}?student_id=http_304")
+        while (response.get_json() or {}).get("ai_pending"):  # Dashboard text still being generated
+            time.sleep(0.05)
+            response = client.get(f"{url}?student_id=http_304")
+        assert response.status_code == 200, url
+        etags[url] = response.headers["ETag"]
+
+    for url in READ_URLS:
+        before = _acquired()
+        response = client.get(f"{url}?student_id=http_304", headers={"If-None-Match": etags[url]})
+        assert response.status_code == 304, url
+        assert response.data == b"" and response.headers["ETag"] == etags[url]
+        assert _acquired() - before == 1, f"{url}: 304 needs only the version read"
+
+
+def test_writes_change_etags():
+    client = app.test_client()
+    database.save_study_plan(generate_daily_plan(SUBJECTS, 4.0), "daily", "http_writes")
+    first = client.get("/api/plan/today?student_id=http_writes")
+    etag = first.headers["ETag"]
+
+    task_id = first.get_json()["today_plan"][0]["task_id"]
+    client.post(f"/api/task/complete/{task_id}?student_id=http_writes")
+    after = client.get("/api/plan/today?student_id=http_writes", headers={"If-None-Match": etag})
+    assert after.status_code == 200 and after.headers["ETag"] != etag
+    assert after.get_json()["completed_tasks"] == 1
+
+    # Another worker (empty read model) computes the same ETag from the stored counter
+    get_student_cache().clear()
+    again = client.get("/api/plan/today?student_id=http_writes", headers={"If-None-Match": after.headers["ETag"]})
+    assert again.status_code == 304
+
+    # Completing the same task again writes nothing, so the ETag stays valid
+    client.post(f"/api/task/complete/{task_id}?student_id=http_writes")
+    assert client.get("/api/plan/today?student_id=http_writes",
+                      headers={"If-None-Match": after.headers["ETag"]}).status_code == 304
+
+
+def test_other_worker_write_seen_at_once():
+    """A write this worker's read model never heard of still changes the ETag and the body"""
+    client = app.test_client()
+    database.create_student("http_other", "Asha")
+    first = client.get("/api/student/profile?student_id=http_other")
+    assert first.get_json()["profile"]["name"] == "Asha"  # Now in this worker's read model
+
+    with database.pooled_connection() as conn:  # What another worker's create_student does
+        conn.execute("UPDATE students SET name='Asha R' WHERE id='http_other'")
+        conn.execute(database.BUMP_VERSION_SQL, ("http_other",))
+        conn.commit()
+
+    after = client.get("/api/student/profile?student_id=http_other", headers={"If-None-Match": first.headers["ETag"]})
+    assert after.status_code == 200 and after.headers["ETag"] != first.headers["ETag"]
+    assert after.get_json()["profile"]["name"] == "Asha R", "stale read model served under the new ETag"
+
+
+def test_large_responses_compressed():
+    client = app.test_client()
+    body = {"subjects": SUBJECTS, "daily_hours": 6.0, "student_id": "http_gzip"}
+    plain = client.post("/api/plan/weekly", json=body)
+    assert "Content-Encoding" not in plain.headers
+
+    zipped = client.post("/api/plan/weekly", json=body, headers={"Accept-Encoding": "gzip, deflate"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in zipped.headers["Vary"]
+    assert gzip.decompress(zipped.data) == plain.data
+    print(f"Weekly plan: {len(plain.data):,} B -> {len(zipped.data):,} B gzip")
+
+    small = client.get("/api/streak?student_id=http_gzip", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers, "tiny response compressed"
+
+    brotli_only = client.post("/api/plan/weekly", json=body, headers={"Accept-Encoding": "br"})
+    if app_module.brotli is None:
+        assert "Content-Encoding" not in brotli_only.headers
+    else:
+        assert brotli_only.headers["Content-Encoding"] == "br"
+        assert app_module.brotli.decompress(brotli_only.data) == plain.data
+
+
+def test_compressed_etag_revalidates():
+    client = app.test_client()
+    saved = app_module.COMPRESS_MIN_BYTES
+    app_module.COMPRESS_MIN_BYTES = 1
+    try:
+        database.save_study_plan(generate_daily_plan(SUBJECTS, 4.0), "daily", "http_gzip_etag")
+        url = "/api/plan/today?student_id=http_gzip_etag"
+        plain_etag = client.get(url).headers["ETag"]
+        zipped = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert zipped.headers["ETag"] == plain_etag[:-1] + '-gzip"', "encodings share a strong ETag"
+        again = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["ETag"]})
+        assert again.status_code == 304
+    finally:
+        app_module.COMPRESS_MIN_BYTES = saved
+
+
+def main():
+    print("\n" + "="*50)
+    print("CONDITIONAL REQUESTS & COMPRESSION TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_not_modified_with_one_read, test_writes_change_etags, test_other_worker_write_seen_at_once,
+                 test_large_responses_compressed, test_compressed_etag_revalidates):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
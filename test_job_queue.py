@@ -0,0 +1,224 @@
+"""
+Test script for the background job queue
+Tests: upload returns a job id at once, the job is processed by the worker
+pool, failures are reported, small uploads stay out of the upload directory,
+size limits, jobs left running by a dead worker are picked up again, a slow
+parse keeps its heartbeat, and a run that lost its claim changes nothing
+No server or API key needed: python test_job_queue.py
+"""
+import io
+import os
+import tempfile
+import time
+import uuid
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "job_queue_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+import ai_service
+import job_queue
+import syllabus_cache
+from app import app
+
+job_queue.JOB_UPLOAD_DIR = tempfile.mkdtemp()
+job_queue.JOB_POLL_INTERVAL = 0.2
+ai_service.LLM_API_KEY = None  # Local fallback parser
+syllabus_cache._cache = syllabus_cache.SyllabusCache(os.path.join(tempfile.mkdtemp(), "syllabus_cache.db"))
+syllabus_cache._cache_pid = os.getpid()
+
+SYLLABUS = "Mathematics\nCalculus\nAlgebra\n\nPhysics\nOptics\n"
+
+
+def _wait_for_job(client, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").get_json()["job"]
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"job {job_id} still {job['status']} after {timeout}s")
+
+
+def _upload(client, data: bytes, filename: str):
+    syllabus_cache.get_syllabus_cache().clear()  # These tests are about the queue, not re-uploads
+    return client.post("/api/plan/upload", data={"file": (io.BytesIO(data), filename)},
+                       content_type="multipart/form-data")
+
+
+def test_upload_returns_job_and_completes():
+    client = app.test_client()
+    start = time.perf_counter()
+    response = _upload(client, SYLLABUS.encode("utf-8"), "syllabus.txt")
+    elapsed = time.perf_counter() - start
+    body = response.get_json()
+    assert response.status_code == 202, body
+    assert body["status_url"] == f"/api/jobs/{body['job_id']}"
+    print(f"Upload answered in {elapsed * 1000:.0f} ms")
+
+    job = _wait_for_job(client, body["job_id"])
+    assert job["status"] == "done", job
+    assert job["progress"] == 100
+    names = [s["name"] for s in job["result"]["extracted_data"]["subjects"]]
+    assert names == ["Mathematics", "Physics"], names
+    assert "input_path" not in job
+    assert os.listdir(job_queue.JOB_UPLOAD_DIR) == [], "upload file not cleaned up"
+
+
+def test_failed_job_reports_error():
+    client = app.test_client()
+    body = _upload(client, b"%PDF-1.4 truncated", "syllabus.pdf").get_json()
+    job = _wait_for_job(client, body["job_id"])
+    assert job["status"] == "failed"
+    assert "Could not extract text" in job["error"]
+
+
+def test_unsupported_upload_rejected():
+    response = _upload(app.test_client(), b"\x00\x01\x02 binary", "syllabus.txt")
+    assert response.status_code == 400
+    assert "Unsupported file format" in response.get_json()["error"]
+
+
+def test_small_upload_stays_in_memory():
+    """Small uploads are stored in the job row; only large ones touch JOB_UPLOAD_DIR"""
+    client = app.test_client()
+    body = _upload(client, SYLLABUS.encode("utf-8"), "syllabus.txt").get_json()
+    assert database.get_job(body["job_id"])["input_path"] is None
+    assert _wait_for_job(client, body["job_id"])["status"] == "done"
+    assert database.get_job_input(body["job_id"]) is None, "input bytes kept after the job finished"
+
+    saved = job_queue.UPLOAD_SPOOL_BYTES
+    job_queue.UPLOAD_SPOOL_BYTES = 16
+    try:
+        body = _upload(client, SYLLABUS.encode("utf-8"), "syllabus.txt").get_json()
+    finally:
+        job_queue.UPLOAD_SPOOL_BYTES = saved
+    assert database.get_job(body["job_id"])["input_path"].startswith(job_queue.JOB_UPLOAD_DIR)
+    job = _wait_for_job(client, body["job_id"])
+    assert [s["name"] for s in job["result"]["extracted_data"]["subjects"]] == ["Mathematics", "Physics"]
+
+
+def test_oversized_upload_rejected():
+    client = app.test_client()
+    saved = app.config["MAX_CONTENT_LENGTH"]
+    app.config["MAX_CONTENT_LENGTH"] = 1024
+    try:
+        response = _upload(client, b"x" * 4096, "syllabus.txt")
+    finally:
+        app.config["MAX_CONTENT_LENGTH"] = saved
+    assert response.status_code == 413
+
+    saved = job_queue.MAX_UPLOAD_BYTES
+    job_queue.MAX_UPLOAD_BYTES = 16
+    try:
+        response = _upload(client, SYLLABUS.encode("utf-8"), "syllabus.txt")
+    finally:
+        job_queue.MAX_UPLOAD_BYTES = saved
+    assert response.status_code == 413
+
+
+def test_unknown_job():
+    response = app.test_client().get("/api/jobs/does-not-exist")
+    assert response.status_code == 404
+
+
+def test_job_claimed_once():
+    job_id = uuid.uuid4().hex
+    database.create_job(job_id, "test", None)
+    first = database.claim_queued_jobs(10)
+    second = database.claim_queued_jobs(10)
+    assert job_id in [job["id"] for job in first]
+    assert job_id not in [job["id"] for job in second]
+    database.update_job(job_id, status="failed", error="test job")
+
+
+def test_stale_running_job_is_resumed():
+    """A job left 'running' by a worker that died is queued again and finishes"""
+    path = os.path.join(job_queue.JOB_UPLOAD_DIR, "left_over.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(SYLLABUS)
+
+    job_id = uuid.uuid4().hex
+    database.create_job(job_id, job_queue.SYLLABUS_UPLOAD, path, "left_over.txt")
+    # Claimed by a worker that then went away an hour ago
+    with database.pooled_connection() as conn:
+        conn.execute("""
+            UPDATE jobs SET status='running', attempts=1, updated_at=datetime('now', '-1 hour')
+            WHERE id=?
+        """, (job_id,))
+        conn.commit()
+
+    job_queue.start_job_queue()
+    job = _wait_for_job(app.test_client(), job_id)
+    assert job["status"] == "done", job
+    assert job["attempts"] == 2
+    assert job_queue.get_job_queue_stats()["requeued"] >= 1
+
+
+def test_slow_parse_keeps_heartbeat():
+    """A long LLM step must not make the job look dead and get it requeued"""
+    saved = job_queue.JOB_HEARTBEAT, job_queue.parse_syllabus
+    job_queue.JOB_HEARTBEAT = 0.2
+
+    def slow_parse(content):
+        time.sleep(3.5)
+        return saved[1](content)
+
+    job_queue.parse_syllabus = slow_parse
+    try:
+        client = app.test_client()
+        job_id = _upload(client, SYLLABUS.encode("utf-8"), "slow.txt").get_json()["job_id"]
+        time.sleep(1.5)
+        for _ in range(3):
+            assert database.requeue_stale_jobs(2, job_queue.JOB_MAX_ATTEMPTS)["requeued"] == 0
+            time.sleep(0.5)
+        job = _wait_for_job(client, job_id)
+        assert job["status"] == "done" and job["attempts"] == 1, job
+    finally:
+        job_queue.JOB_HEARTBEAT, job_queue.parse_syllabus = saved
+
+
+def test_lost_claim_changes_nothing():
+    """Writes from a run whose job was requeued and claimed again are dropped"""
+    job_id = uuid.uuid4().hex
+    database.create_job(job_id, "test", None)
+    with database.pooled_connection() as conn:
+        conn.execute("UPDATE jobs SET status='running', attempts=2 WHERE id=?", (job_id,))
+        conn.commit()
+    assert not database.update_job(job_id, claim=1, status="failed", error="old run")
+    assert database.get_job(job_id)["status"] == "running"
+    assert database.update_job(job_id, claim=2, status="done", stage="done")
+    assert not database.update_job(job_id, claim=2)  # No heartbeat once finished
+
+
+def test_health_reports_queue():
+    stats = app.test_client().get("/api/health").get_json()["job_queue"]
+    assert stats["workers"] == job_queue.JOB_WORKERS
+    assert stats["jobs"].get("done", 0) >= 1
+
+
+def main():
+    print("\n" + "="*50)
+    print("JOB QUEUE TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_upload_returns_job_and_completes, test_failed_job_reports_error,
+                 test_unsupported_upload_rejected, test_small_upload_stays_in_memory,
+                 test_oversized_upload_rejected, test_unknown_job, test_job_claimed_once, test_stale_running_job_is_resumed, test_slow_parse_keeps_heartbeat,
+                 test_lost_claim_changes_nothing, test_health_reports_queue):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Test script for the LLM response cache
+Tests: prompt normalization (case and superscripts kept), TTL, LRU eviction, persistence, and _call_llm cache hits
+No server or API key needed: python test_llm_cache.py
+"""
+import os
+import tempfile
+import time
+
+import ai_service
+import llm_cache
+from llm_cache import LLMResponseCache, make_cache_key, normalize_prompt
+
+
+def _cache_path():
+    return os.path.join(tempfile.mkdtemp(), "llm_cache.db")
+
+
+def test_key_normalization():
+    assert normalize_prompt("  Student Doubt:\n    What is   Probability? ") == "Student Doubt: What is Probability?"
+    assert normalize_prompt("Caf\u0065\u0301") == "Caf\u00e9"  # Canonical forms still match
+    key = make_cache_key("gpt-4o-mini", "sys", "Student Doubt: What is probability?", 0.7)
+    assert make_cache_key("gpt-4o-mini", "sys", "Student Doubt:  What is probability?\n", 0.7) == key
+    assert make_cache_key("gpt-4o", "sys", "Student Doubt: What is probability?", 0.7) != key
+    assert make_cache_key("gpt-4o-mini", "other", "Student Doubt: What is probability?", 0.7) != key
+    assert make_cache_key("gpt-4o-mini", "sys", "Student Doubt: What is probability?", 0.2) != key
+    assert make_cache_key("gpt-4o-mini", "sys", "Student Doubt: What is a probability?", 0.7) != key
+
+
+def test_distinct_doubts_not_merged():
+    """Case and superscripts change the meaning of maths and chemistry doubts"""
+    for a, b in (("What is x² + 2x?", "What is x2 + 2x?"), ("Properties of Co", "Properties of CO")):
+        assert make_cache_key("gpt-4o-mini", "sys", a, 0.7) != make_cache_key("gpt-4o-mini", "sys", b, 0.7), (a, b)
+
+    calls = []
+    saved = (ai_service.LLM_API_KEY, ai_service._request_completion, llm_cache._cache)
+    ai_service.LLM_API_KEY = "test-key"
+    ai_service._request_completion = lambda system_prompt, user_prompt: calls.append(user_prompt) or user_prompt
+    llm_cache._cache = LLMResponseCache(_cache_path(), ttl=60)
+    try:
+        doubts = ["What is x² + 2x?", "What is x2 + 2x?", "Properties of Co", "Properties of CO"]
+        answers = [ai_service.solve_doubt(doubt) for doubt in doubts]
+        assert len(calls) == 4 and len(set(answers)) == 4, answers
+        assert llm_cache._cache.stats()["entries"] == 4
+    finally:
+        ai_service.LLM_API_KEY, ai_service._request_completion, llm_cache._cache = saved
+
+
+def test_hit_miss_and_persistence():
+    path = _cache_path()
+    cache = LLMResponseCache(path, ttl=60, max_entries=10)
+    assert cache.get("k") is None
+    cache.put("k", "answer")
+    assert cache.get("k") == "answer"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["hit_rate"]) == (1, 1, 1, 0.5)
+    # A restarted worker sees the same entries
+    assert LLMResponseCache(path, ttl=60).get("k") == "answer"
+
+
+def test_ttl():
+    cache = LLMResponseCache(_cache_path(), ttl=0.05)
+    cache.put("k", "answer")
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.stats()["expired"] == 1 and cache.stats()["entries"] == 0
+
+
+def test_lru_eviction():
+    cache = LLMResponseCache(_cache_path(), ttl=60, max_entries=20)
+    for i in range(llm_cache._EVICT_EVERY - 1):
+        cache.put(f"k{i}", "answer")
+        time.sleep(0.001)
+    cache.get("k0")  # Recently used, so it survives eviction
+    cache.put("last", "answer")
+    stats = cache.stats()
+    assert stats["entries"] == 20
+    assert stats["evictions"] == llm_cache._EVICT_EVERY - 20
+    assert cache.get("k0") == "answer" and cache.get("last") == "answer"
+    assert cache.get("k1") is None
+
+
+def test_call_llm_uses_cache():
+    calls = []
+
+    def fake_completion(system_prompt, user_prompt):
+        calls.append(user_prompt)
+        return f"answer {len(calls)}"
+
+    saved = (ai_service.LLM_API_KEY, ai_service._request_completion, llm_cache._cache)
+    ai_service.LLM_API_KEY = "test-key"
+    ai_service._request_completion = fake_completion
+    llm_cache._cache = LLMResponseCache(_cache_path(), ttl=60)
+    try:
+        first = ai_service.solve_doubt("What is probability?")
+        start = time.perf_counter()
+        second = ai_service.solve_doubt(" What is  probability?")
+        hit_us = (time.perf_counter() - start) * 1e6
+        assert first == second == "answer 1" and len(calls) == 1
+        print(f"Cache hit answered in {hit_us:.0f} us")
+
+        # Tutor turns always go upstream
+        ai_service.generate_tutor_response("START", {}, "")
+        ai_service.generate_tutor_response("START", {}, "")
+        assert len(calls) == 3
+    finally:
+        ai_service.LLM_API_KEY, ai_service._request_completion, llm_cache._cache = saved
+
+
+def test_failures_not_cached():
+    responses = [None, "real answer"]
+    saved = (ai_service.LLM_API_KEY, ai_service._request_completion, llm_cache._cache)
+    ai_service.LLM_API_KEY = "test-key"
+    ai_service._request_completion = lambda system_prompt, user_prompt: responses.pop(0)
+    llm_cache._cache = LLMResponseCache(_cache_path(), ttl=60)
+    try:
+        assert "Server busy" in ai_service.solve_doubt("Why is the sky blue?")
+        assert ai_service.solve_doubt("Why is the sky blue?") == "real answer"
+    finally:
+        ai_service.LLM_API_KEY, ai_service._request_completion, llm_cache._cache = saved
+
+
+def main():
+    print("\n" + "="*50)
+    print("LLM CACHE TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_key_normalization, test_distinct_doubts_not_merged, test_hit_miss_and_persistence,
+                 test_ttl, test_lru_eviction, test_call_llm_uses_cache, test_failures_not_cached):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
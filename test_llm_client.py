@@ -0,0 +1,134 @@
+"""
+Test script for the pooled LLM HTTP client
+Runs against llm_stub_server.StubLLMServer: keep-alive reuse, retries, circuit breaker
+No server or API key needed: python test_llm_client.py
+"""
+import time
+
+import requests
+
+import ai_service
+import llm_cache
+from llm_client import CircuitOpenError, LLMClient
+from llm_stub_server import StubLLMServer
+
+PAYLOAD = {"messages": [{"role": "user", "content": "What is probability?"}]}
+
+
+def _client(**kwargs):
+    kwargs.setdefault("backoff_base", 0.001)
+    kwargs.setdefault("timeout", 5)
+    return LLMClient(**kwargs)
+
+
+def test_connection_reuse():
+    with StubLLMServer() as stub:
+        client = _client()
+        for _ in range(20):
+            data = client.post_json(f"{stub.url}/chat/completions", PAYLOAD)
+            assert data["choices"][0]["message"]["content"] == "Stub answer to: What is probability?"
+        assert stub.requests == 20
+        assert stub.connections == 1, f"{stub.connections} connections for 20 sequential calls"
+
+
+def test_retries_on_5xx_and_429():
+    with StubLLMServer() as stub:
+        client = _client(max_retries=3)
+        stub.queue_statuses([503, 429, 502])
+        client.post_json(f"{stub.url}/chat/completions", PAYLOAD)
+        assert stub.requests == 4
+        assert client.stats()["retries"] == 3
+
+        stub.queue_statuses([500] * 4)
+        try:
+            client.post_json(f"{stub.url}/chat/completions", PAYLOAD)
+            assert False, "expected HTTPError"
+        except requests.HTTPError as e:
+            assert e.response.status_code == 500
+        assert client.stats()["failures"] == 1
+
+
+def test_no_retry_on_4xx():
+    with StubLLMServer() as stub:
+        client = _client(max_retries=3)
+        stub.queue_statuses([401])
+        try:
+            client.post_json(f"{stub.url}/chat/completions", PAYLOAD)
+            assert False, "expected HTTPError"
+        except requests.HTTPError:
+            pass
+        assert stub.requests == 1
+
+
+def test_retry_after_header():
+    with StubLLMServer() as stub:
+        stub.error_headers = {"Retry-After": "0.2"}
+        stub.queue_statuses([429])
+        start = time.perf_counter()
+        _client(max_retries=1).post_json(f"{stub.url}/chat/completions", PAYLOAD)
+        assert time.perf_counter() - start >= 0.2
+
+
+def test_circuit_breaker():
+    with StubLLMServer() as stub:
+        client = _client(max_retries=0)
+        url = f"{stub.url}/chat/completions"
+        breaker = client.breaker(url)
+        breaker.threshold, breaker.cooldown = 3, 0.2
+        stub.queue_statuses([503] * 3)
+        for _ in range(3):
+            try:
+                client.post_json(url, PAYLOAD)
+            except requests.HTTPError:
+                pass
+        assert breaker.state == "open"
+
+        # Open: fail fast without touching the server
+        try:
+            client.post_json(url, PAYLOAD)
+            assert False, "expected CircuitOpenError"
+        except CircuitOpenError:
+            pass
+        assert stub.requests == 3 and client.stats()["short_circuited"] == 1
+
+        # After the cooldown one trial call goes through and closes it
+        time.sleep(0.25)
+        client.post_json(url, PAYLOAD)
+        assert breaker.state == "closed" and stub.requests == 4
+
+
+def test_ai_service_against_stub():
+    with StubLLMServer() as stub:
+        saved = (ai_service.LLM_API_KEY, ai_service.LLM_BASE_URL, llm_cache.LLM_CACHE_ENABLED)
+        ai_service.LLM_API_KEY, ai_service.LLM_BASE_URL = "stub-key", stub.url
+        llm_cache.LLM_CACHE_ENABLED = False
+        try:
+            assert ai_service.solve_doubt("Why is the sky blue?") == "Stub answer to: Student Doubt: Why is the sky blue?"
+            stub.queue_statuses([400])
+            assert "Server busy" in ai_service.solve_doubt("Why is the sky blue?")
+        finally:
+            ai_service.LLM_API_KEY, ai_service.LLM_BASE_URL, llm_cache.LLM_CACHE_ENABLED = saved
+
+
+def main():
+    print("\n" + "="*50)
+    print("LLM CLIENT TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_connection_reuse, test_retries_on_5xx_and_429, test_no_retry_on_4xx,
+                 test_retry_after_header, test_circuit_breaker, test_ai_service_against_stub):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
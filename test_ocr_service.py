@@ -0,0 +1,155 @@
+"""
+Test script for syllabus OCR
+Tests: tesseract discovery (TESSERACT_CMD, missing binary), Otsu
+binarization and downscaling, tall images cut into strips at blank rows,
+OCR of a generated image (skipped without tesseract), and several photos
+uploaded as one job
+No server or API key needed: python test_ocr_service.py
+"""
+import io
+import os
+import stat
+import tempfile
+import time
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "ocr_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+from PIL import Image, ImageDraw
+
+import ai_service
+import job_queue
+import ocr_service
+import syllabus_cache
+from app import app
+
+job_queue.JOB_UPLOAD_DIR = tempfile.mkdtemp()
+job_queue.JOB_POLL_INTERVAL = 0.2
+ai_service.LLM_API_KEY = None  # Local fallback parser
+
+
+def make_text_image(lines, width=1200, line_height=60, fmt="PNG") -> bytes:
+    """A white page with black text lines, as PNG or JPEG bytes"""
+    image = Image.new("RGB", (width, line_height * (len(lines) + 2)), "white")
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((40, line_height * (i + 1)), line, fill="black", font_size=line_height // 2)
+    buffer = io.BytesIO()
+    image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def _with_tesseract_cmd(value):
+    saved = ocr_service.TESSERACT_CMD
+    ocr_service.TESSERACT_CMD = value
+    try:
+        return ocr_service.find_tesseract(refresh=True)
+    finally:
+        ocr_service.TESSERACT_CMD = saved
+
+
+def test_find_tesseract():
+    fake = os.path.join(tempfile.mkdtemp(), "tesseract")
+    with open(fake, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(fake, os.stat(fake).st_mode | stat.S_IXUSR)
+    try:
+        assert _with_tesseract_cmd(fake) == fake
+        assert _with_tesseract_cmd(fake + "-missing") is None
+    finally:
+        ocr_service.find_tesseract(refresh=True)
+
+
+def test_preprocess():
+    # Gray text on a light gray photo background, larger than OCR_MAX_DIM
+    image = Image.new("RGB", (4000, 1000), (200, 200, 190))
+    ImageDraw.Draw(image).rectangle((100, 100, 3900, 300), fill=(60, 60, 70))
+    cleaned = ocr_service.preprocess(image, max_dim=2000)
+    assert cleaned.mode == "L"
+    assert cleaned.size == (2000, 500), cleaned.size
+    assert [level for level, count in enumerate(cleaned.histogram()) if count] == [0, 255]
+    assert cleaned.getpixel((1000, 100)) == 0 and cleaned.getpixel((1000, 400)) == 255
+
+    assert 50 <= ocr_service.otsu_threshold([0] * 50 + [100] + [0] * 149 + [100] + [0] * 55) < 200
+
+
+def test_split_tiles_cut_at_blank_rows():
+    # Bands of "text" 80 px high with 20 px gaps
+    image = Image.new("L", (400, 5000), 255)
+    draw = ImageDraw.Draw(image)
+    for top in range(0, 5000, 100):
+        draw.rectangle((0, top, 399, top + 79), fill=0)
+    tiles = ocr_service.split_tiles(image, tile_height=1000)
+    assert 4 <= len(tiles) <= 6, len(tiles)
+    assert sum(tile.height for tile in tiles) == 5000
+    top = 0
+    for tile in tiles[:-1]:
+        top += tile.height
+        assert top % 100 >= 80, f"cut at row {top} goes through text"
+    assert ocr_service.split_tiles(image.crop((0, 0, 400, 1200)), tile_height=1000)[0].height == 1200
+
+
+def test_ocr_image():
+    if ocr_service.find_tesseract() is None:
+        print("[SKIP] tesseract not installed")
+        return
+    text = ocr_service.ocr_images([make_text_image(["Mathematics", "Physics"])])
+    assert "Mathematics" in text and "Physics" in text, text
+
+
+def _upload(client, files):
+    syllabus_cache.get_syllabus_cache().clear()
+    return client.post("/api/plan/upload", data={"file": [(io.BytesIO(data), name) for data, name in files]},
+                       content_type="multipart/form-data")
+
+
+def test_multi_image_upload_is_one_job():
+    client = app.test_client()
+    pages = [(make_text_image(["Mathematics", "Calculus"]), "page1.png"),
+             (make_text_image(["Physics", "Optics"], fmt="JPEG"), "page2.jpg")]
+    response = _upload(client, pages)
+    body = response.get_json()
+    assert response.status_code == 202, body
+
+    deadline = time.time() + 60
+    while (job := client.get(body["status_url"]).get_json()["job"])["status"] not in ("done", "failed"):
+        assert time.time() < deadline, "job never finished"
+        time.sleep(0.1)
+    if ocr_service.find_tesseract() is None:
+        assert job["status"] == "failed" and "Tesseract OCR not found" in job["error"], job
+    else:
+        assert job["status"] == "done", job
+    assert os.listdir(job_queue.JOB_UPLOAD_DIR) == [], "image directory not cleaned up"
+
+
+def test_multi_file_upload_must_be_images():
+    client = app.test_client()
+    response = _upload(client, [(make_text_image(["Mathematics"]), "page1.png"), (b"Physics\nOptics\n", "notes.txt")])
+    assert response.status_code == 400
+    assert "JPG or PNG" in response.get_json()["error"]
+
+
+def main():
+    print("\n" + "="*50)
+    print("OCR SERVICE TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_find_tesseract, test_preprocess, test_split_tiles_cut_at_blank_rows, test_ocr_image,
+                 test_multi_image_upload_is_one_job, test_multi_file_upload_must_be_images):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Test script for the plan cache
+Tests: input-hash keys, LRU/TTL, the shared SQLite tier, and skipping unchanged plan saves
+No server needed: python test_plan_cache.py
+"""
+import os
+import sqlite3
+import tempfile
+import time
+
+import database
+from plan_cache import PlanCache, plan_cache_key
+from planner import DEFAULT_TIME_SLOTS, generate_daily_plan
+
+SUBJECTS = [
+    {"name": "Mathematics", "exam_date": "2024-12-20", "difficulty": "hard", "topics": ["Calculus"]},
+    {"name": "Physics", "exam_date": "2024-12-18", "difficulty": "medium"}
+]
+
+
+def test_key_normalization():
+    key = plan_cache_key("daily", SUBJECTS, 6, None, None)
+    # Explicit defaults, float hours and reordered dict keys give the same key
+    reordered = [dict(reversed(list(s.items()))) for s in SUBJECTS]
+    assert plan_cache_key("daily", reordered, 6.0, DEFAULT_TIME_SLOTS, time.strftime("%Y-%m-%d")) == key
+    assert plan_cache_key("daily", SUBJECTS, 5.0, None, None) != key
+    assert plan_cache_key("weekly", SUBJECTS, 6, None, None) != key
+    assert plan_cache_key("daily", SUBJECTS[:1], 6, None, None) != key
+
+
+def test_hits_misses_and_copies():
+    cache = PlanCache(size=8, ttl=60, db_path="")
+    calls = []
+
+    def generate():
+        calls.append(1)
+        return generate_daily_plan(SUBJECTS, 6.0, date="2024-12-01")
+
+    first, first_hash = cache.get_or_create("k", generate)
+    first["schedule"].clear()  # Mutating a returned plan must not touch the cache
+    second, second_hash = cache.get_or_create("k", generate)
+    assert len(calls) == 1
+    assert second == generate_daily_plan(SUBJECTS, 6.0, date="2024-12-01")
+    assert first_hash == second_hash
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_lru_and_ttl():
+    cache = PlanCache(size=2, ttl=60, db_path="")
+    for key in ("a", "b", "a", "c"):  # "b" is least recently used when "c" arrives
+        cache.get_or_create(key, lambda: {"key": key})
+    assert cache.stats()["evictions"] == 1
+    cache.get_or_create("a", lambda: {})
+    cache.get_or_create("b", lambda: {})
+    assert cache.stats()["misses"] == 4
+
+    expiring = PlanCache(size=2, ttl=0.05, db_path="")
+    expiring.get_or_create("a", lambda: {})
+    time.sleep(0.1)
+    expiring.get_or_create("a", lambda: {})
+    assert expiring.stats()["expired"] == 1
+    assert expiring.stats()["misses"] == 2
+
+
+def test_shared_disk_tier():
+    path = os.path.join(tempfile.mkdtemp(), "plan_cache.db")
+    writer = PlanCache(size=4, ttl=60, db_path=path)
+    reader = PlanCache(size=4, ttl=60, db_path=path)  # e.g. another gunicorn worker
+    plan, plan_hash = writer.get_or_create("k", lambda: {"plan": 1})
+    assert reader.get_or_create("k", lambda: {"plan": 2}) == (plan, plan_hash)
+    assert reader.stats()["disk_hits"] == 1 and reader.stats()["misses"] == 0
+
+
+def test_unchanged_plan_not_rewritten():
+    database.DB_NAME = os.path.join(tempfile.mkdtemp(), "plan_cache_test.db")
+    database.init_db()
+    cache = PlanCache(size=4, ttl=60, db_path="")
+    date = time.strftime("%Y-%m-%d")
+    plan, plan_hash = cache.get_or_create("k", lambda: generate_daily_plan(SUBJECTS, 6.0, date=date))
+
+    plan_id = database.save_study_plan(plan, "daily", "cache_student", plan_hash=plan_hash)
+    task_id = database.get_today_plan("cache_student")[0]["task_id"]
+    database.complete_task(task_id, "cache_student")
+
+    plan, plan_hash = cache.get_or_create("k", lambda: generate_daily_plan(SUBJECTS, 6.0, date=date))
+    assert database.save_study_plan(plan, "daily", "cache_student", plan_hash=plan_hash) == plan_id
+    tasks = database.get_today_plan("cache_student")
+    assert tasks[0]["task_id"] == task_id and tasks[0]["completed"]
+
+    # A changed plan is still written
+    changed = generate_daily_plan(SUBJECTS[:1], 6.0, date=date)
+    assert database.save_study_plan(changed, "daily", "cache_student", plan_hash="other") != plan_id
+
+
+def test_migration_adds_plan_hash():
+    path = os.path.join(tempfile.mkdtemp(), "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE study_plans (id INTEGER PRIMARY KEY AUTOINCREMENT, student_id TEXT DEFAULT 'default',
+                    plan_date TEXT NOT NULL, plan_type TEXT NOT NULL, total_hours REAL, subjects_count INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, UNIQUE(student_id, plan_date, plan_type))""")
+    conn.execute("PRAGMA user_version=1")
+    conn.commit()
+    conn.close()
+    database.DB_NAME = path
+    database.init_db()
+    with database.pooled_connection() as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(study_plans)")]
+        assert "plan_hash" in columns
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == database.SCHEMA_VERSION
+
+
+def main():
+    print("\n" + "="*50)
+    print("PLAN CACHE TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_key_normalization, test_hits_misses_and_copies, test_lru_and_ttl,
+                 test_shared_disk_tier, test_unchanged_plan_not_rewritten, test_migration_adds_plan_hash):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Query plan audit for the database layer
+Runs EXPLAIN QUERY PLAN on every hot query (database.HOT_QUERIES)
+and fails if any of them falls back to a full table scan.
+No server needed: python test_query_plans.py
+"""
+import os
+import tempfile
+
+import database
+
+
+def _fresh_db():
+    database.DB_NAME = os.path.join(tempfile.mkdtemp(), "query_plans.db")
+    database.init_db()
+
+
+def test_hot_queries_use_indexes():
+    """Every hot query must be answered with an index search"""
+    _fresh_db()
+    scans = database.find_table_scans()
+    for name, plan in scans.items():
+        print(f"[SCAN] {name}:")
+        for line in plan:
+            print(f"    {line}")
+    assert not scans, f"Table scans in hot queries: {', '.join(scans)}"
+
+
+def test_audit_detects_missing_index():
+    """Sanity check: dropping an index must make the audit fail"""
+    _fresh_db()
+    with database.pooled_connection() as conn:
+        conn.execute("DROP INDEX idx_study_tasks_plan_start")
+        conn.execute("DROP INDEX idx_study_tasks_plan_completed")
+        conn.commit()
+    assert "plan_tasks" in database.find_table_scans()
+
+
+def main():
+    print("\n" + "="*50)
+    print("QUERY PLAN AUDIT")
+    print("="*50)
+
+    results = []
+    for test in (test_hot_queries_use_indexes, test_audit_detects_missing_index):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Test script for the integer-time slot scheduler
+Checks generate_daily_plan against the previous datetime/timedelta implementation
+No server needed: python test_scheduler.py
+"""
+import copy
+import random
+from datetime import datetime, timedelta
+
+from planner import allocate_time_slots, generate_daily_plan, DEFAULT_TIME_SLOTS
+
+
+def legacy_generate_daily_plan(subjects, daily_hours, free_time_slots=None, date=None):
+    """The previous scheduler: datetime objects, strftime per activity, list.pop(0)"""
+    if date is None:
+        date = datetime.today().strftime("%Y-%m-%d")
+    if free_time_slots is None:
+        free_time_slots = DEFAULT_TIME_SLOTS
+
+    allocated_plan = allocate_time_slots(subjects, daily_hours)
+    daily_schedule = []
+    remaining_subjects = allocated_plan.copy()
+    BREAK_DURATION_MINS = 10
+
+    for slot in free_time_slots:
+        slot_start = datetime.strptime(slot["start"], "%H:%M")
+        slot_end = datetime.strptime(slot["end"], "%H:%M")
+        slot_duration_mins = (slot_end - slot_start).total_seconds() / 60
+        current_time_mins = 0
+        slot_activities = []
+
+        while current_time_mins < slot_duration_mins and remaining_subjects:
+            subject = remaining_subjects[0]
+            if subject["study_hours"] <= 0.1:
+                remaining_subjects.pop(0)
+                continue
+            SESSION_MAX_MINS = 60
+            time_available_mins = slot_duration_mins - current_time_mins
+            needed_mins = subject["study_hours"] * 60
+            actual_session_mins = min(needed_mins, SESSION_MAX_MINS, time_available_mins)
+            if actual_session_mins < 10:
+                break
+            start_ts = slot_start + timedelta(minutes=current_time_mins)
+            end_ts = start_ts + timedelta(minutes=actual_session_mins)
+            slot_activities.append({
+                "subject": subject["subject"],
+                "subject_id": subject["subject_id"],
+                "type": "study",
+                "duration_minutes": int(actual_session_mins),
+                "start_time": start_ts.strftime("%H:%M"),
+                "end_time": end_ts.strftime("%H:%M"),
+                "difficulty": subject["difficulty"],
+                "topics": subject.get("topics", [])
+            })
+            subject["study_hours"] -= (actual_session_mins / 60)
+            current_time_mins += actual_session_mins
+            if subject["study_hours"] <= 0.1:
+                if subject in remaining_subjects:
+                    remaining_subjects.remove(subject)
+            if current_time_mins + BREAK_DURATION_MINS <= slot_duration_mins and subject["study_hours"] > 0:
+                b_start = end_ts
+                b_end = b_start + timedelta(minutes=BREAK_DURATION_MINS)
+                slot_activities.append({
+                    "subject": "Break",
+                    "subject_id": "break",
+                    "type": "break",
+                    "duration_minutes": BREAK_DURATION_MINS,
+                    "start_time": b_start.strftime("%H:%M"),
+                    "end_time": b_end.strftime("%H:%M"),
+                    "details": "Relax, stretch, drink water!"
+                })
+                current_time_mins += BREAK_DURATION_MINS
+
+        if slot_activities:
+            daily_schedule.append({
+                "time_slot": slot["label"],
+                "slot_start": slot["start"],
+                "slot_end": slot["end"],
+                "activities": slot_activities
+            })
+
+    unallocated = [s for s in remaining_subjects if s["study_hours"] > 0.1]
+    return {
+        "date": date,
+        "total_study_hours": daily_hours,
+        "schedule": daily_schedule,
+        "summary": {
+            "subjects_count": len(allocated_plan),
+            "time_slots_used": len(daily_schedule),
+            "unallocated_subjects": len(unallocated)
+        },
+        "subject_priorities": allocated_plan
+    }
+
+
+def make_case(rng, subject_count, slot_count):
+    today = datetime.today()
+    subjects = [
+        {
+            "name": f"Subject {i}",
+            "exam_date": (today + timedelta(days=rng.randint(1, 90))).strftime("%Y-%m-%d"),
+            "difficulty": rng.choice(["easy", "medium", "hard"]),
+            "topics": [f"Topic {i}"]
+        }
+        for i in range(subject_count)
+    ]
+    slots = []
+    for s in range(slot_count):
+        start = rng.randint(0, 23 * 60)
+        end = start + rng.choice([0, 15, 45, 60, 95, 120, 180, 300]) - (30 if rng.random() < 0.05 else 0)
+        end = min(max(end, 0), 23 * 60 + 59)
+        fmt = "{:d}:{:02d}" if rng.random() < 0.2 else "{:02d}:{:02d}"
+        slots.append({"start": fmt.format(start // 60, start % 60),
+                      "end": fmt.format(end // 60, end % 60),
+                      "label": f"Slot {s}"})
+    daily_hours = rng.choice([1, 2.5, 4, 6, 7.3, 10, 13.37])
+    return subjects, daily_hours, slots
+
+
+def test_scheduler_matches_legacy():
+    """Same inputs must give byte-identical plans"""
+    rng = random.Random(42)
+    cases = 0
+    for subject_count in (1, 2, 3, 5, 8, 13, 21, 50):
+        for slot_count in (1, 2, 5, 10, 20):
+            for _ in range(10):
+                subjects, hours, slots = make_case(rng, subject_count, slot_count)
+                expected = legacy_generate_daily_plan(copy.deepcopy(subjects), hours, slots, "2024-12-01")
+                actual = generate_daily_plan(copy.deepcopy(subjects), hours, slots, "2024-12-01")
+                assert actual == expected, f"{subject_count} subjects, {slot_count} slots: {slots}"
+                cases += 1
+    print(f"Cases compared: {cases}")
+
+
+def test_default_slots_match_legacy():
+    subjects, hours, _ = make_case(random.Random(1), 6, 1)
+    assert generate_daily_plan(subjects, hours) == legacy_generate_daily_plan(subjects, hours)
+
+
+def main():
+    print("\n" + "="*50)
+    print("SCHEDULER TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_scheduler_matches_legacy, test_default_slots_match_legacy):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Test script for single-flight coalescing of identical LLM prompts
+Many threads (and worker processes) asking the same question must produce
+one upstream request, checked against the local stub LLM server; each key
+has its own lock file (removed after use), different keys never wait on each
+other, and a held lock is only waited on until a deadline
+No server or API key needed: python test_single_flight.py
+"""
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+import ai_service
+import llm_cache
+from llm_cache import LLMResponseCache
+from llm_stub_server import StubLLMServer
+from single_flight import SingleFlight
+
+STUB_DELAY = 0.3
+PLAN = {"date": "2024-12-01", "total_study_hours": 2,
+        "schedule": [{"time_slot": "Morning", "activities": [{"subject": "Calculus", "difficulty": "hard"}]}]}
+
+
+def _point_at(stub_url, cache_path, lock_dir=""):
+    """What each forked worker does: share the parent's stub, cache file and lock directory"""
+    ai_service.LLM_API_KEY, ai_service.LLM_BASE_URL = "stub-key", stub_url
+    llm_cache._cache = LLMResponseCache(cache_path) if cache_path else None
+    llm_cache._cache_pid = os.getpid()  # Else a worker would reopen the default cache file
+    llm_cache.LLM_CACHE_ENABLED = bool(cache_path)
+    ai_service._llm_flight = SingleFlight(lock_dir)
+
+
+def run_threads(count, fn):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = fn(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_threads_share_one_request():
+    for cache in (True, False):  # Coalescing doesn't depend on the response cache
+        with StubLLMServer.patched(cache=cache, delay=STUB_DELAY) as stub:
+            answers = run_threads(20, lambda i: ai_service.generate_plan_explanation(PLAN))
+            stats = ai_service.get_single_flight_stats()
+            print(f"cache={cache}: 20 callers -> {stub.requests} upstream request(s), "
+                  f"{stats['coalesced']} coalesced")
+            assert stub.requests == 1
+            assert len(set(answers)) == 1 and answers[0].startswith("Stub answer to:")
+            assert stats["executed"] == 1 and stats["coalesced"] == 19 and stats["in_flight"] == 0
+
+
+def test_different_prompts_not_coalesced():
+    with StubLLMServer.patched(cache=True, delay=STUB_DELAY) as stub:
+        answers = run_threads(4, lambda i: ai_service.solve_doubt(f"Doubt {i}"))
+        assert stub.requests == 4
+        assert answers == [f"Stub answer to: Student Doubt: Doubt {i}" for i in range(4)]
+
+
+def test_errors_shared_with_waiters():
+    flight = SingleFlight()
+
+    def fail():
+        time.sleep(0.2)
+        raise ValueError("upstream broke")
+
+    def call(i):
+        try:
+            flight.do("key", fail)
+        except ValueError as e:
+            return str(e)
+
+    assert run_threads(5, call) == ["upstream broke"] * 5
+    assert flight.stats()["executed"] == 1
+    flight.do("key", lambda: "recovered")  # Nothing sticks after the call finishes
+
+
+def _hold(flight, key):
+    """Take key's worker lock on a thread; returns (release, thread)"""
+    held, release = threading.Event(), threading.Event()
+
+    def holder():
+        with flight.worker_lock(key):
+            held.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    held.wait(5)
+    return release, thread
+
+
+def test_one_key_one_holder():
+    """Holders of the same key take turns, and their lock file is gone afterwards"""
+    lock_dir = tempfile.mkdtemp()
+    flight = SingleFlight(lock_dir)
+    holders, most = [0], [0]
+    guard = threading.Lock()
+
+    def take(i):
+        for _ in range(5):
+            with flight.worker_lock("same prompt"):
+                with guard:
+                    holders[0] += 1
+                    most[0] = max(most[0], holders[0])
+                time.sleep(0.002)
+                with guard:
+                    holders[0] -= 1
+
+    run_threads(6, take)
+    assert most[0] == 1, f"{most[0]} holders of one key at once"
+    assert os.listdir(lock_dir) == [], os.listdir(lock_dir)
+
+
+def test_different_keys_never_wait():
+    flight = SingleFlight(tempfile.mkdtemp(), lock_wait=5)
+    release, thread = _hold(flight, "slow prompt")
+    try:
+        for i in range(50):
+            start = time.perf_counter()
+            with flight.worker_lock(f"prompt {i}") as waited:
+                assert not waited and time.perf_counter() - start < 0.05, f"prompt {i} waited"
+    finally:
+        release.set()
+        thread.join()
+    assert flight.stats()["worker_lock_waits"] == 0
+
+
+def test_lock_wait_has_deadline():
+    """A worker holding a key too long doesn't hold up the others asking for it"""
+    flight = SingleFlight(tempfile.mkdtemp(), lock_wait=0.3)
+    release, thread = _hold(flight, "slow prompt")
+    start = time.perf_counter()
+    try:
+        with flight.worker_lock("slow prompt") as waited:
+            elapsed = time.perf_counter() - start
+    finally:
+        release.set()
+        thread.join()
+    assert waited and 0.3 <= elapsed < 2, elapsed
+    assert flight.stats()["worker_lock_timeouts"] == 1
+
+    with flight.worker_lock("slow prompt") as waited:  # Free again
+        assert not waited
+
+
+def _worker_process(stub_url, cache_path, lock_dir, barrier, results):
+    _point_at(stub_url, cache_path, lock_dir)
+    barrier.wait()
+    results.put((ai_service.generate_plan_explanation(PLAN), ai_service.get_single_flight_stats()))
+
+
+def test_workers_share_one_request():
+    if not hasattr(os, "fork"):
+        print("[SKIP] cross-worker test needs fork")
+        return
+    with StubLLMServer.patched(cache=True, delay=STUB_DELAY) as stub:
+        ctx = multiprocessing.get_context("fork")
+        lock_dir = tempfile.mkdtemp()
+        cache_path = os.path.join(tempfile.mkdtemp(), "shared_llm_cache.db")  # One file for all workers
+        barrier, results = ctx.Barrier(4), ctx.Queue()
+        workers = [ctx.Process(target=_worker_process, args=(stub.url, cache_path, lock_dir, barrier, results))
+                   for _ in range(4)]
+        for w in workers:
+            w.start()
+        outcomes = [results.get(timeout=30) for _ in workers]
+        for w in workers:
+            w.join()
+        answers = {answer for answer, _ in outcomes}
+        coalesced = sum(stats["worker_coalesced"] for _, stats in outcomes)
+        print(f"4 workers -> {stub.requests} upstream request(s), {coalesced} answered from another worker")
+        assert stub.requests == 1 and len(answers) == 1
+        assert coalesced == 3
+
+
+def main():
+    print("\n" + "="*50)
+    print("SINGLE-FLIGHT TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_threads_share_one_request, test_different_prompts_not_coalesced,
+                 test_errors_shared_with_waiters, test_one_key_one_holder, test_different_keys_never_wait,
+                 test_lock_wait_has_deadline,
+                 test_workers_share_one_request):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Test script for streaming (SSE) doubt and tutor answers
+Runs the Flask app in-process against the local stub LLM server's streaming mode
+No server or API key needed: python test_streaming.py
+"""
+import json
+import os
+import tempfile
+import time
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "streaming_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+import ai_service
+import llm_cache
+from app import app
+from llm_stub_server import StubLLMServer
+
+CHUNK_DELAY = 0.05
+
+
+def read_events(response):
+    """[(event, data, seconds since request)] from a streamed SSE response"""
+    events, buffer, start = [], "", time.perf_counter()
+    for chunk in response.response:
+        buffer += chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+        while "\n\n" in buffer:
+            raw, buffer = buffer.split("\n\n", 1)
+            name, data = "message", ""
+            for line in raw.split("\n"):
+                if line.startswith("event:"):
+                    name = line[6:].strip()
+                elif line.startswith("data:"):
+                    data += line[5:].strip()
+            events.append((name, json.loads(data), time.perf_counter() - start))
+    return events
+
+
+def test_solve_doubt_streams():
+    with StubLLMServer.patched(cache=True, chunk_delay=CHUNK_DELAY) as stub:
+        client = app.test_client()
+        response = client.post("/api/ai/solve-doubt", json={"doubt": "What is a vector?", "stream": True},
+                               buffered=False)
+        assert response.mimetype == "text/event-stream"
+        events = read_events(response)
+        deltas = [data["delta"] for name, data, _ in events if name == "message"]
+        name, done, total = events[-1]
+        assert name == "done" and done["success"]
+        assert done["answer"] == "".join(deltas) == "Stub answer to: Student Doubt: What is a vector?"
+        assert len(deltas) > 3
+        first_chunk = events[0][2]
+        print(f"First chunk after {first_chunk * 1000:.0f} ms, full answer after {total * 1000:.0f} ms")
+        assert first_chunk < total / 2
+
+        # The complete answer was cached: the same doubt without streaming skips the LLM
+        requests_before = stub.requests
+        plain = client.post("/api/ai/solve-doubt", json={"doubt": "What is a vector?"})
+        assert plain.get_json()["answer"] == done["answer"] and stub.requests == requests_before
+
+
+def test_accept_header_selects_stream():
+    with StubLLMServer.patched(cache=True, chunk_delay=CHUNK_DELAY):
+        response = app.test_client().post("/api/ai/solve-doubt", json={"doubt": "Why?"},
+                                          headers={"Accept": "text/event-stream"}, buffered=False)
+        assert response.mimetype == "text/event-stream"
+        assert read_events(response)[-1][0] == "done"
+
+
+def test_tutor_streams_with_state():
+    with StubLLMServer.patched(cache=True, chunk_delay=CHUNK_DELAY):
+        response = app.test_client().post("/api/ai/tutor", buffered=False, json={
+            "state": "TOPIC_SELECTED", "context": {"topic": "Vectors"}, "user_input": "", "stream": True
+        })
+        events = read_events(response)
+        name, done, _ = events[-1]
+        text = "".join(data["delta"] for event, data, _ in events if event == "message")
+        assert name == "done"
+        assert done["response"] == {"text": text, "state": "TOPIC_SELECTED"}
+
+
+def test_fallbacks():
+    with StubLLMServer.patched(cache=True, chunk_delay=CHUNK_DELAY) as stub:
+        # Upstream refuses before the first chunk: the fallback text is streamed instead
+        stub.queue_statuses([400])
+        events = read_events(app.test_client().post(
+            "/api/ai/solve-doubt", json={"doubt": "Why?", "mode": "english", "stream": True}, buffered=False))
+        assert "Server busy" in events[-1][1]["answer"]
+
+        stub.queue_statuses([400])
+        events = read_events(app.test_client().post(
+            "/api/ai/tutor", json={"state": "START", "stream": True}, buffered=False))
+        assert events[-1][1]["response"]["state"] == "SUBJECT_SELECTED"
+
+        # Connection dropped mid-answer: keep what arrived, don't cache the partial answer
+        stub.fail_stream_after = 3
+        events = read_events(app.test_client().post(
+            "/api/ai/solve-doubt", json={"doubt": "Partial?", "stream": True}, buffered=False))
+        assert events[-1][1]["answer"] == "Stub answer to:"
+        assert llm_cache._cache.stats()["entries"] == 0
+
+
+def test_demo_mode_streams_words():
+    saved = ai_service.LLM_API_KEY
+    ai_service.LLM_API_KEY = None
+    try:
+        chunks = list(ai_service.solve_doubt_stream("Why?"))
+        assert len(chunks) > 1 and "".join(chunks) == ai_service.solve_doubt("Why?")
+    finally:
+        ai_service.LLM_API_KEY = saved
+
+
+def main():
+    print("\n" + "="*50)
+    print("STREAMING TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_solve_doubt_streams, test_accept_header_selects_stream, test_tutor_streams_with_state,
+                 test_fallbacks, test_demo_mode_streams_words):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Test script for the per-student read model cache
+Tests: streak, progress and profile loaded in one query, repeat reads served
+from the cache (only the version lookup touches SQLite), invalidation by complete_task / create_student /
+save_study_plan, a load racing a write (or a clear) not caching the old state,
+and no per-student generations kept once loads finish
+No server needed: python test_student_cache.py
+"""
+import os
+import tempfile
+import threading
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "student_cache_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+from app import app
+from planner import generate_daily_plan
+from student_cache import StudentCache, get_student_cache
+
+SUBJECTS = [
+    {"name": "Mathematics", "exam_date": "2030-06-01", "difficulty": "hard"},
+    {"name": "Physics", "exam_date": "2030-06-05", "difficulty": "medium"},
+]
+
+
+def _acquired() -> int:
+    return database.get_pool_stats()["acquired"]
+
+
+def test_one_query_matches_separate_reads():
+    database.create_student("rm_one", "Asha")
+    database.save_study_plan(generate_daily_plan(SUBJECTS, 4.0), "daily", "rm_one")
+    task_id = database.get_today_plan("rm_one")[0]["task_id"]
+    database.complete_task(task_id, "rm_one")
+
+    before = _acquired()
+    context = database.load_student_context("rm_one")
+    assert _acquired() - before == 1, "read model took more than one connection checkout"
+    assert context["streak"] == database.get_streak("rm_one")
+    assert context["progress"] == database.get_daily_progress("rm_one")
+    assert context["profile"] == database.get_student("rm_one")
+    assert context["name"] == "Asha"
+    assert context["progress"]["completed_tasks"] == 1
+
+    empty = database.load_student_context("rm_nobody")
+    assert empty["profile"] is None and empty["name"] is None
+    assert empty["streak"]["current_streak"] == 0 and empty["progress"]["total_tasks"] == 0
+
+
+def test_repeat_reads_skip_sqlite():
+    client = app.test_client()
+    database.create_student("rm_cached", "Ravi")
+    client.get("/api/streak?student_id=rm_cached")
+
+    before, misses = _acquired(), get_student_cache().stats()["misses"]
+    for _ in range(5):
+        assert client.get("/api/streak?student_id=rm_cached").get_json()["streak"]["current_streak"] == 0
+        assert client.get("/api/progress?student_id=rm_cached").status_code == 200
+        assert client.get("/api/student/profile?student_id=rm_cached").get_json()["profile"]["name"] == "Ravi"
+    assert _acquired() - before == 15, "cached reads did more than the one version lookup each"
+    assert get_student_cache().stats()["misses"] == misses
+
+
+def test_writes_invalidate():
+    client = app.test_client()
+    database.create_student("rm_writes", "Old Name")
+    assert database.get_student_context("rm_writes")["name"] == "Old Name"
+
+    database.create_student("rm_writes", "New Name")
+    assert database.get_student_context("rm_writes")["name"] == "New Name"
+
+    database.save_study_plan(generate_daily_plan(SUBJECTS, 4.0), "daily", "rm_writes")
+    progress = client.get("/api/progress?student_id=rm_writes").get_json()["progress"]
+    assert progress["total_tasks"] > 0 and progress["completed_tasks"] == 0
+
+    task_id = database.get_today_plan("rm_writes")[0]["task_id"]
+    assert client.post(f"/api/task/complete/{task_id}?student_id=rm_writes").status_code == 200
+    assert client.get("/api/progress?student_id=rm_writes").get_json()["progress"]["completed_tasks"] == 1
+    assert client.get("/api/streak?student_id=rm_writes").get_json()["streak"]["current_streak"] == 1
+
+
+def test_load_racing_a_write_is_not_cached():
+    cache = StudentCache()
+    loading, written = threading.Event(), threading.Event()
+
+    def slow_load():
+        loading.set()
+        written.wait(5)
+        return {"name": "before write"}
+
+    reader = threading.Thread(target=lambda: cache.get_or_load("s", "2030-01-01", slow_load))
+    reader.start()
+    loading.wait(5)
+    cache.invalidate("s")  # The write commits while the reader is loading
+    written.set()
+    reader.join()
+
+    assert cache.get_or_load("s", "2030-01-01", lambda: {"name": "after write"})["name"] == "after write"
+    assert cache.get_or_load("s", "2030-01-02", lambda: {"name": "next day"})["name"] == "next day"
+    assert get_student_cache().stats()["invalidations"] > 0
+    assert cache._loads == {}, "generations kept after the loads finished"
+
+
+def test_generations_not_kept():
+    """Invalidations and finished loads leave nothing behind per student"""
+    cache = StudentCache(size=2)
+    for i in range(50):
+        cache.get_or_load(f"s{i}", "2030-01-01", lambda: {"name": "x"})
+        cache.invalidate(f"s{i}")
+    try:
+        cache.get_or_load("broken", "2030-01-01", lambda: 1 / 0)
+    except ZeroDivisionError:
+        pass
+    assert cache._loads == {}, f"{len(cache._loads)} generations kept"
+
+    loading, release = threading.Event(), threading.Event()
+
+    def slow_load():
+        loading.set()
+        release.wait(5)
+        return {"name": "old database"}
+
+    reader = threading.Thread(target=lambda: cache.get_or_load("s", "2030-01-01", slow_load))
+    reader.start()
+    loading.wait(5)
+    cache.clear()  # e.g. init_db() switched databases mid-load
+    release.set()
+    reader.join()
+    assert cache.get_or_load("s", "2030-01-01", lambda: {"name": "new database"})["name"] == "new database"
+    assert cache._loads == {}
+
+
+def main():
+    print("\n" + "="*50)
+    print("STUDENT READ MODEL TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_one_query_matches_separate_reads, test_repeat_reads_skip_sqlite, test_writes_invalidate,
+                 test_load_racing_a_write_is_not_cached, test_generations_not_kept):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Test script for the syllabus content-hash cache
+Tests: text and parse lookups, separate entries per early-stop limit and
+parser, size-bounded eviction, and a re-upload answered from the cache
+No server or API key needed: python test_syllabus_cache.py
+"""
+import io
+import os
+import tempfile
+import time
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "syllabus_cache_test.db")
+database.init_db()  # app may already be imported (and initialized) by another test module
+
+import ai_service
+import job_queue
+import syllabus_cache
+from app import app
+from syllabus_cache import SyllabusCache, content_hash
+
+SYLLABUS = "Mathematics\nCalculus\nAlgebra\n\nChemistry\nOrganic\n"
+PARSED = {"subjects": [{"name": "Mathematics", "topics": ["Calculus"]}]}
+
+
+def _cache(**kwargs) -> SyllabusCache:
+    return SyllabusCache(os.path.join(tempfile.mkdtemp(), "syllabus_cache.db"), **kwargs)
+
+
+def _use_cache(cache: SyllabusCache):
+    syllabus_cache._cache, syllabus_cache._cache_pid = cache, os.getpid()
+
+
+def test_text_and_parsed_lookups():
+    cache = _cache()
+    upload_hash = content_hash(b"the uploaded file")
+    assert cache.lookup_upload(upload_hash, None, "fallback") is None
+
+    cache.put_text(upload_hash, SYLLABUS)
+    assert cache.get_text(upload_hash) == SYLLABUS
+    assert cache.get_text(upload_hash, max_chars=2000) is None, "partial and full text share an entry"
+    assert cache.lookup_upload(upload_hash, None, "fallback") is None
+
+    cache.put_parsed(SYLLABUS, "fallback", PARSED)
+    assert cache.lookup_upload(upload_hash, None, "fallback") == PARSED
+    assert cache.get_parsed(SYLLABUS, "llm:some-model") is None, "parsers share an entry"
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["parsed_hits"] == 1
+
+
+def test_size_bounded_eviction():
+    cache = _cache(max_bytes=10_000)
+    for i in range(syllabus_cache._EVICT_EVERY * 2):
+        cache.put_text(content_hash(str(i).encode()), "x" * 1000)
+        time.sleep(0.001)  # Distinct last_used values
+    stats = cache.stats()
+    assert stats["bytes"] <= 10_000, stats
+    assert stats["evictions"] > 0
+    # Least recently used went first
+    assert cache.get_text(content_hash(b"0")) is None
+    assert cache.get_text(content_hash(str(syllabus_cache._EVICT_EVERY * 2 - 1).encode())) is not None
+
+
+def test_reupload_answered_from_cache():
+    _use_cache(_cache())
+    job_queue.JOB_POLL_INTERVAL = 0.2
+    ai_service.LLM_API_KEY = None
+    client = app.test_client()
+
+    def upload():
+        return client.post("/api/plan/upload", data={"file": (io.BytesIO(SYLLABUS.encode("utf-8")), "s.txt")},
+                           content_type="multipart/form-data")
+
+    first = upload()
+    assert first.status_code == 202
+    deadline = time.time() + 30
+    while client.get(first.get_json()["status_url"]).get_json()["job"]["status"] != "done":
+        assert time.time() < deadline, "first upload never finished"
+        time.sleep(0.05)
+
+    start = time.perf_counter()
+    second = upload()
+    elapsed = time.perf_counter() - start
+    body = second.get_json()
+    print(f"Re-upload answered in {elapsed * 1000:.1f} ms")
+    assert second.status_code == 200, body
+    assert body["status"] == "done"
+    assert [s["name"] for s in body["extracted_data"]["subjects"]] == ["Mathematics", "Chemistry"]
+    assert client.get(body["status_url"]).get_json()["job"]["status"] == "done"
+
+
+def test_fallback_after_llm_failure_not_cached():
+    cache = _cache()
+    _use_cache(cache)
+    saved = job_queue.parse_syllabus
+    job_queue.parse_syllabus = lambda text: ({"subjects": []}, False)  # LLM failed, fallback answered
+    try:
+        job_id = job_queue.submit_syllabus_upload(io.BytesIO(b"Physics\nOptics\n"))
+        deadline = time.time() + 30
+        while database.get_job(job_id)["status"] != "done":
+            assert time.time() < deadline, "job never finished"
+            time.sleep(0.05)
+    finally:
+        job_queue.parse_syllabus = saved
+    assert cache.get_text(content_hash(b"Physics\nOptics\n")) is not None
+    assert cache.stats()["entries"] == 1, "fallback parse was cached"
+
+
+def main():
+    print("\n" + "="*50)
+    print("SYLLABUS CACHE TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_text_and_parsed_lookups, test_size_bounded_eviction, test_reupload_answered_from_cache,
+                 test_fallback_after_llm_failure_not_cached):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Test script for the incremental weekly/horizon planner
+Checks each planned day against generate_daily_plan run for that day
+No server needed: python test_weekly_planner.py
+"""
+import copy
+import random
+from datetime import date, timedelta
+
+from planner import generate_daily_plan, generate_weekly_plan, generate_horizon_plan, MAX_HORIZON_DAYS
+from test_scheduler import make_case
+
+
+def shift_exams(subjects, days):
+    """Move every exam `days` earlier, so 'days until exam' from today matches a later plan day"""
+    shifted = copy.deepcopy(subjects)
+    for subject in shifted:
+        exam = date.fromisoformat(subject["exam_date"])
+        subject["exam_date"] = (exam - timedelta(days=days)).isoformat()
+    return shifted
+
+
+def make_near_case(rng, subject_count, slot_count):
+    """make_case, with exam dates moved close to today so days-left changes across the week"""
+    subjects, hours, slots = make_case(rng, subject_count, slot_count)
+    today = date.today()
+    for subject in subjects:
+        subject["exam_date"] = (today + timedelta(days=rng.randint(0, 20))).isoformat()
+    return subjects, hours, slots
+
+
+def test_weekly_days_match_daily_plan():
+    """Day k of the week must equal a daily plan made on day k"""
+    rng = random.Random(8)
+    today = date.today()
+    for subject_count in (1, 3, 8, 21):
+        for slot_count in (1, 5, 10):
+            subjects, hours, slots = make_near_case(rng, subject_count, slot_count)
+            week = generate_weekly_plan(copy.deepcopy(subjects), hours, slots, today.isoformat())
+            assert len(week["days"]) == 7
+            for offset, day in enumerate(week["days"]):
+                plan_date = (today + timedelta(days=offset)).isoformat()
+                expected = generate_daily_plan(shift_exams(subjects, offset), hours, slots, plan_date)
+                for item in expected["subject_priorities"]:
+                    item["exam_date"] = next(s["exam_date"] for s in subjects if s["name"] == item["subject"])
+                assert day == expected, f"day {offset}, {subject_count} subjects, {slot_count} slots"
+
+
+def test_invalid_exam_date_uses_default():
+    subjects = [{"name": "Math", "exam_date": "not-a-date", "difficulty": "hard"}]
+    week = generate_weekly_plan(subjects, 2.0, start_date="2024-12-01")
+    assert all(day["subject_priorities"][0]["days_until_exam"] == 30 for day in week["days"])
+
+
+def test_horizon_until_last_exam():
+    subjects = [
+        {"name": "Math", "exam_date": "2024-12-05", "difficulty": "hard"},
+        {"name": "Physics", "exam_date": "2024-12-20", "difficulty": "medium"}
+    ]
+    plan = generate_horizon_plan(subjects, 4.0, start_date="2024-12-01")
+    assert plan["horizon_days"] == 20
+    assert plan["end_date"] == "2024-12-20"
+    by_date = {day["date"]: [s["subject"] for s in day["subject_priorities"]] for day in plan["days"]}
+    assert by_date["2024-12-05"] == ["Math", "Physics"]  # Exam day still planned
+    assert by_date["2024-12-06"] == ["Physics"]  # Dropped after the exam
+    assert by_date["2024-12-20"] == ["Physics"]
+
+
+def test_horizon_fixed_length_and_cap():
+    subjects = [{"name": "Math", "exam_date": "2024-12-05", "difficulty": "hard"}]
+    for days in (14, 30, 90):
+        plan = generate_horizon_plan(subjects, 2.0, start_date="2024-12-01", days=days)
+        assert len(plan["days"]) == days
+        assert plan["days"][-1]["date"] == (date(2024, 12, 1) + timedelta(days=days - 1)).isoformat()
+        assert plan["days"][-1]["schedule"] == []
+    plan = generate_horizon_plan(subjects, 2.0, start_date="2024-12-01", days=5000)
+    assert plan["horizon_days"] == MAX_HORIZON_DAYS
+
+
+def main():
+    print("\n" + "="*50)
+    print("WEEKLY / HORIZON PLANNER TEST")
+    print("="*50)
+
+    results = []
+    for test in (test_weekly_days_match_daily_plan, test_invalid_exam_date_uses_default,
+                 test_horizon_until_last_exam, test_horizon_fixed_length_and_cap):
+        try:
+            test()
+            results.append((test.__name__, True))
+        except AssertionError as e:
+            print(f"[ERROR] {e}")
+            results.append((test.__name__, False))
+
+    for test_name, result in results:
+        status = "[PASS]" if result else "[FAIL]"
+        print(f"{status}: {test_name}")
+
+
+if __name__ == "__main__":
+    main()